@@ -0,0 +1,59 @@
+# Measures lexing throughput, in tokens per second, of the PLY lexer and the hand-written
+# scanner on a generated program mixing every kind of token, and the whole parse with each.
+#
+# usage: python3 lexer.py [statements] [runs]
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import sbml
+
+def program(statements):
+    lines = ['{']
+    for i in range(statements):
+        lines.append('    b{0} = True; x{0} = {0} :: [{0}.5e-3, "s\\t{0}"]; if (x{0} <= {0} andalso not (#1 (1, 2) <> 2)) {{ print(x{0} ** 2 mod 7); }}'.format(i))
+    lines.append('}')
+    return '\n'.join(lines)
+
+def lex(make, source):
+    tokenizer = make()
+    tokenizer.lineno = 1
+    tokenizer.input(source)
+    count = 0
+    for _ in iter(tokenizer.token, None):
+        count += 1
+    return count
+
+def best(function, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(args):
+    statements = int(args[1]) if len(args) > 1 else 5000
+    runs = int(args[2]) if len(args) > 2 else 5
+    source = program(statements)
+    report = {'characters': len(source)}
+
+    for name, make in sorted(sbml.lexers.items()):
+        count = lex(make, source)
+        seconds = best(lambda: lex(make, source), runs)
+        report[name] = {
+            'tokens': count,
+            'lex_seconds': seconds,
+            'tokens_per_second': count / seconds,
+            'parse_seconds': best(lambda: sbml.Parser(name).parse(source), runs)
+        }
+
+    report['speedup'] = report['scanner']['tokens_per_second'] / report['ply']['tokens_per_second']
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    main(sys.argv)
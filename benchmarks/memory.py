@@ -0,0 +1,67 @@
+# Measures how much memory parsed programs take: the bytes tracemalloc sees allocated for
+# the AST that stay alive after parsing, per node and per character of source, for a
+# statement-heavy program and for one made of large list literals.
+#
+# usage: python3 memory.py [size]
+
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import sbml
+
+def statements(size):
+    body = ['x{0} = {0}; if (x{0} < y) {{ y = y + x{0} * 2; print(y); }}'.format(i) for i in range(size)]
+    return '{ y = 0; ' + ' '.join(body) + ' }'
+
+def literals(size):
+    rows = ['l{0} = [{1}];'.format(i, ', '.join(str(i * 100 + j) for j in range(100))) for i in range(size // 10)]
+    return '{ ' + ' '.join(rows) + ' }'
+
+def fields(node):
+    # works with nodes that have an instance dict as well as with slotted ones
+    if hasattr(node, '__dict__'):
+        return list(vars(node).values())
+    return [getattr(node, name) for name in type(node).__slots__ if hasattr(node, name)]
+
+def count(node):
+    nodes = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        for value in fields(node):
+            for child in (value if type(value) in [list, tuple] else [value]):
+                if isinstance(child, sbml.Node):
+                    stack.append(child)
+    return nodes
+
+def measure(source):
+    sbml.parser.parse('{ x = 1; }')
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    program = sbml.parser.parse(source)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = count(program.block)
+    retained -= before
+    return {
+        'characters': len(source),
+        'nodes': nodes,
+        'retained_bytes': retained,
+        'peak_bytes': peak - before,
+        'bytes_per_node': retained / nodes,
+        'bytes_per_character': retained / len(source)
+    }
+
+def main(args):
+    size = int(args[1]) if len(args) > 1 else 20000
+    report = {'statements': measure(statements(size)), 'literals': measure(literals(size))}
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,54 @@
+# Measures interpreter start-up: importing sbml, the first parse (which builds the lexer
+# and parser from the shipped tables), and whole runs of a short script with a cold and a
+# warm program cache. Every sample is a fresh python process.
+#
+# usage: python3 startup.py [runs]
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data', 'example1.txt')
+
+phases = '''
+import time
+start = time.perf_counter()
+import sbml
+imported = time.perf_counter()
+sbml.parser.parse('{ x = 1; }')
+parsed = time.perf_counter()
+print(imported - start, parsed - imported)
+'''
+
+def sample(args, env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, cwd=src, env=env, stdout=subprocess.PIPE, check=True)
+    return time.perf_counter() - start, result.stdout.decode()
+
+def main(args):
+    runs = int(args[1]) if len(args) > 1 else 10
+    results = {'import': [], 'first_parse': [], 'run_cold_cache': [], 'run_warm_cache': []}
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, SBML_CACHE_DIR=directory)
+
+        for _ in range(runs):
+            _, output = sample(['-c', phases], env)
+            imported, parsed = output.split()
+            results['import'].append(float(imported))
+            results['first_parse'].append(float(parsed))
+
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            results['run_cold_cache'].append(sample(['sbml.py', script], env)[0])
+            results['run_warm_cache'].append(sample(['sbml.py', script], env)[0])
+
+    report = {name: {'min': min(times), 'median': sorted(times)[len(times) // 2]} for name, times in results.items()}
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,204 @@
+# Times lexing, parsing and execution separately, and measures their peak memory with
+# tracemalloc, on workloads scaled up from the examples in tests/data:
+#
+#   insertion_sort       example4.txt sorting 10000 elements
+#   nested_conditionals  a loop through if/else statements nested 60 deep
+#   large_literals       list, tuple and string list literals of 100000 elements
+#   string_concat        a string grown by concatenation 20000 times
+#   cons_lists           a list built with :: one element at a time, 5000 times
+#
+# --save=<file> stores the results as a JSON baseline. --baseline=<file> compares against
+# one, and the run fails when any measurement is more than --threshold (0.25 by default,
+# 25%) above the baseline. --scale=<factor> multiplies every workload size, --runs=N keeps
+# the best of N timings, --only=<name,...> picks workloads.
+#
+# usage: python3 suite.py [--engine=closure|tree|vm|python] [--scale=1] [--runs=3] [--only=<names>]
+#                         [--save=<file>] [--baseline=<file>] [--threshold=0.25]
+
+import contextlib
+import functools
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import sbml
+
+data = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+
+### Workloads ###
+
+def insertion_sort(scale):
+    size = max(2, int(10000 * scale))
+    random.seed(0)
+    array = ', '.join(str(random.randint(-1000, 1000)) for _ in range(size))
+    with open(os.path.join(data, 'example4.txt')) as fd:
+        source = fd.read()
+    source = re.sub(r'array = \[[^\]]*\];', 'array = [{}];'.format(array), source)
+    return re.sub(r'size = \d+;', 'size = {};'.format(size), source)
+
+def nested_conditionals(scale):
+    depth = 60
+    body = 'hits = hits + 1;'
+    for level in range(depth):
+        body = 'if (i mod {0} >= 0) {{ {1} }} else {{ misses = misses + 1; }}'.format(level + 2, body)
+    return '{{ i = 0; hits = 0; misses = 0; while (i < {}) {{ {} i = i + 1; }} print(hits); print(misses); }}'.format(max(1, int(2000 * scale)), body)
+
+def large_literals(scale):
+    size = max(2, int(100000 * scale))
+    numbers = ', '.join(str(i) for i in range(size))
+    strings = ', '.join('"s{}"'.format(i) for i in range(size))
+    return '{{ l = [{0}]; t = ({0}); s = [{1}]; print(l[{2}]); print(#2 t); print(s[{2}]); }}'.format(numbers, strings, size - 1)
+
+def string_concat(scale):
+    size = max(1, int(20000 * scale))
+    return '{{ s = ""; i = 0; while (i < {0}) {{ s = s + "ab" + "cd"; i = i + 1; }} print(s[{1}]); }}'.format(size, size * 4 - 1)
+
+def cons_lists(scale):
+    size = max(1, int(5000 * scale))
+    return '{{ l = []; i = 0; while (i < {0}) {{ l = i :: l; i = i + 1; }} print(l[0]); print(l[{1}]); }}'.format(size, size - 1)
+
+workloads = {
+    'insertion_sort': insertion_sort,
+    'nested_conditionals': nested_conditionals,
+    'large_literals': large_literals,
+    'string_concat': string_concat,
+    'cons_lists': cons_lists
+}
+
+### Phases ###
+
+def lex(source):
+    tokenizer = sbml.lexers['scanner']()
+    tokenizer.lineno = 1
+    tokenizer.input(source)
+    return list(iter(tokenizer.token, None))
+
+def parse(tokens):
+    # the parser is fed tokens lexed ahead of time, so this is the parse alone, with the check
+    # sbml.parser runs after it
+    return sbml.parser.checked(sbml.build().parse(lexer=sbml.lexers['scanner'](), tokenfunc=functools.partial(next, iter(tokens), None)))
+
+def execute(program, engine):
+    with contextlib.redirect_stdout(io.StringIO()):
+        program.run(engine=engine)
+
+def best(function, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def peak(function):
+    tracemalloc.start()
+    try:
+        result = function()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(source, engine, runs):
+    tokens = lex(source)
+    program = parse(tokens)
+    # compiling for the engine is part of the first run, it is left out of every timing
+    execute(program, engine)
+
+    result = {
+        'characters': len(source),
+        'tokens': len(tokens),
+        'lex_seconds': best(lambda: lex(source), runs),
+        'parse_seconds': best(lambda: parse(tokens), runs),
+        'execute_seconds': best(lambda: execute(program, engine), runs)
+    }
+    _, result['lex_peak_bytes'] = peak(lambda: lex(source))
+    _, result['parse_peak_bytes'] = peak(lambda: parse(tokens))
+    _, result['execute_peak_bytes'] = peak(lambda: execute(program, engine))
+    return result
+
+### Baselines ###
+
+def regressions(results, baseline, threshold):
+    # measurements more than threshold above the baseline, for the workloads both have
+    found = []
+    for name, measurements in sorted(results['workloads'].items()):
+        expected = baseline['workloads'].get(name, {})
+        for metric, value in sorted(measurements.items()):
+            if not (metric.endswith('_seconds') or metric.endswith('_bytes')) or metric not in expected:
+                continue
+            if value > expected[metric] * (1 + threshold):
+                found.append('{} {}: {:.6g} against a baseline of {:.6g} (+{:.0%})'.format(
+                    name, metric, value, expected[metric], value / expected[metric] - 1 if expected[metric] else float('inf')))
+    return found
+
+usage = "Invalid arguments. Proper usage: python3 suite.py [--engine=closure|tree|vm|python] [--scale=1] [--runs=3] [--only=<names>] [--save=<file>] [--baseline=<file>] [--threshold=0.25]"
+
+def main(args):
+    engine = sbml.default_engine
+    scale = 1.0
+    runs = 3
+    names = sorted(workloads)
+    save = None
+    baseline = None
+    threshold = 0.25
+
+    for arg in args[1:]:
+        name, _, value = arg.partition('=')
+        if name == '--engine':
+            engine = value
+        elif name == '--scale':
+            scale = float(value)
+        elif name == '--runs':
+            runs = int(value)
+        elif name == '--only':
+            names = value.split(',')
+        elif name == '--save':
+            save = value
+        elif name == '--baseline':
+            baseline = value
+        elif name == '--threshold':
+            threshold = float(value)
+        else:
+            print(usage)
+            exit(1)
+
+    if engine not in sbml.engines or any(name not in workloads for name in names):
+        print(usage)
+        exit(1)
+
+    if baseline:
+        # checked before the workloads run, they can take minutes
+        with open(baseline) as fd:
+            expected = json.load(fd)
+        if (expected['engine'], expected['scale']) != (engine, scale):
+            print('{} was measured on the {} engine at scale {}, it cannot be compared with this run'.format(baseline, expected['engine'], expected['scale']), file=sys.stderr)
+            exit(1)
+
+    results = {
+        'engine': engine,
+        'scale': scale,
+        'python': '{}.{}.{}'.format(*sys.version_info[:3]),
+        'workloads': {name: measure(workloads[name](scale), engine, runs) for name in names}
+    }
+    print(json.dumps(results, indent=4))
+
+    if save:
+        with open(save, 'w') as out:
+            json.dump(results, out, indent=4)
+
+    if baseline:
+        found = regressions(results, expected, threshold)
+        for regression in found:
+            print('REGRESSION ' + regression, file=sys.stderr)
+        if found:
+            exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -1,353 +1,585 @@
+# system imports
+import operator
+
 # internal imports
 from utils import *
-
-# dictionary of names
-names = {}
+from limits import power
+from packed import pack, cons, PackedList
+from indexes import Indexes, min_size
+
+class Undefined():
+    def __repr__(self):
+        return 'undefined'
+
+# marks the slots of variables that have no value yet
+undefined = Undefined()
+
+# the errors of Python operations on operands the program got wrong, each is a SEMANTIC ERROR
+errors = (TypeError, ValueError, IndexError, KeyError, ZeroDivisionError, OverflowError)
+
+class Frame():
+    # the state of one run of a program: its variables, each in the slot the resolver gave it,
+    # the budget of the run, None when it has no limits, the sink its prints go to, and the
+    # indexes of the lists it tests membership in. engines get the frame passed in, so any
+    # number of runs can be in flight at once. the frame is also the last entry of values, for
+    # the closures, which are only handed that list
+    def __init__(self, slots, env = None, budget = None, output = None):
+        env = env or {}
+        self.slots = slots
+        self.budget = budget
+        self.output = output
+        self.indexes = Indexes()
+        self.values = [env.get(name, undefined) for name in slots] + [self]
+
+    def bindings(self):
+        # slots named with a $ hold the values of loop invariants, see hoister.py
+        return {name: value for name, value in zip(self.slots, self.values) if value is not undefined and not name.startswith('$')}
+
+class Turn():
+    # how a run of run_async shares its thread with the other tasks of its event loop: it hands
+    # the loop back to them after every `every` statements run or loop iterations made. looping
+    # has the ids of the statements with a while loop in them, see looping()
+    def __init__(self, every, looping):
+        self.every = every
+        self.left = every
+        self.looping = looping
+
+    def __await__(self):
+        # a bare yield lets the event loop run its other tasks, the way asyncio.sleep(0) does.
+        # a task cancelled meanwhile stops here
+        self.left = self.every
+        yield
 
 class Node():
-    def __init__(self, parent = None, children = []):
-        self.parent = parent
-        self.children = children
+    # nodes keep their fields in __slots__, without an instance dict, and hold no links back to
+    # their parent, large programs are mostly AST. every node also gets the line and offset in
+    # the source of its first token, from the parser
+    __slots__ = ['lineno', 'lexpos']
+
+# slots a node fills in while it runs, which are not part of the program
+runtime_slots = ['site']
+
+def fields(node):
+    # the names of the attributes set on a node, including its position
+    return [name for cls in type(node).__mro__ for name in getattr(cls, '__slots__', ()) if name not in runtime_slots and hasattr(node, name)]
+
+### Operators ###
+
+# the functions behind the operators. a BinaryOperation or Comparison looks its operator up
+# here the first time it runs and keeps the function in its site slot, instead of going
+# through an if/elif chain on every evaluation. they are called on the operand values as they
+# are, CPython dispatches on the operand types itself
+binary_operators = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    'div': operator.floordiv,
+    'mod': operator.mod,
+    '**': power
+}
+
+comparison_operators = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '<>': operator.ne
+}
 
 class Block(Node):
-    def __init__(self, parent = None, children = [], statements = []):
-        self.parent = parent
-        self.children = children
+    __slots__ = ['statements']
+
+    def __init__(self, statements = []):
         self.statements = statements
     
-    def parse(self):
+    def parse(self, frame):
         if self.statements:
             for statement in self.statements:
-                statement.parse()
+                statement.parse(frame)
+
+    async def run_async(self, frame, turn):
+        # the tree walker for the statements, with room to hand the event loop back between any
+        # two of them. a statement without a loop in it takes a bounded time, it runs as it is
+        looping = turn.looping
+        for statement in self.statements or []:
+            if id(statement) in looping:
+                await statement.run_async(frame, turn)
+            else:
+                statement.parse(frame)
+
+            turn.left -= 1
+            if turn.left <= 0:
+                await turn
 
 class WhileStatement(Node):
-    def __init__(self, parent = None, children = [], condition = None, block = None):
-        self.parent = parent
-        self.children = children
+    # invariants names the Invariant nodes the loop owns, the hoister fills it in, and
+    # invariant_slots has their slots, from the resolver. they are forgotten whenever the loop starts
+    __slots__ = ['condition', 'block', 'invariants', 'invariant_slots']
+
+    def __init__(self, condition = None, block = None):
         self.condition = condition
         self.block = block
+        self.invariants = []
+        self.invariant_slots = []
     
-    def parse(self):
-        while self.condition.parse():
-            self.block.parse()
-            
+    def parse(self, frame):
+        for slot in self.invariant_slots:
+            frame.values[slot] = undefined
+
+        if frame.budget is None:
+            while self.condition.parse(frame):
+                self.block.parse(frame)
+        else:
+            tick = frame.budget.tick
+            while self.condition.parse(frame):
+                self.block.parse(frame)
+                tick()
+
+    async def run_async(self, frame, turn):
+        for slot in self.invariant_slots:
+            frame.values[slot] = undefined
+
+        # a body without loops runs whole, as one step per statement
+        simple = id(self.block) not in turn.looping
+        steps = len(self.block.statements or []) + 1
+
+        budget = frame.budget
+        while self.condition.parse(frame):
+            if simple:
+                self.block.parse(frame)
+                turn.left -= steps
+            else:
+                await self.block.run_async(frame, turn)
+                turn.left -= 1
+
+            if budget is not None:
+                budget.tick()
+            if turn.left <= 0:
+                await turn
+
     def __str__(self):
         return "while {}".format(self.condition)
 
+def looping(node, found = None):
+    # the ids of the statements under node, node included, with a while loop in them
+    found = set() if found is None else found
+    kind = type(node).__name__
+    if kind == 'Block':
+        children = node.statements or []
+    elif kind == 'IfElseStatement':
+        children = [node.if_block, node.else_block]
+    elif kind in ['IfStatement', 'WhileStatement']:
+        children = [node.block]
+    else:
+        return found
+
+    for child in children:
+        looping(child, found)
+    if kind == 'WhileStatement' or any(id(child) in found for child in children):
+        found.add(id(node))
+    return found
+
 class IfStatement(Node):
-    def __init__(self, parent = None, children = [], condition = None, block = None):
-        self.parent = parent
-        self.children = children
+    __slots__ = ['condition', 'block']
+
+    def __init__(self, condition = None, block = None):
         self.condition = condition
         self.block = block
     
-    def parse(self):
-        if self.condition.parse():
-            return self.block.parse()
+    def parse(self, frame):
+        if self.condition.parse(frame):
+            return self.block.parse(frame)
+
+    async def run_async(self, frame, turn):
+        if self.condition.parse(frame):
+            await self.block.run_async(frame, turn)
 
 class IfElseStatement(Node):
-    def __init__(self, parent = None, children = [], condition = None, if_block = None, else_block = None):
-        self.parent = parent
-        self.children = children
+    __slots__ = ['condition', 'if_block', 'else_block']
+
+    def __init__(self, condition = None, if_block = None, else_block = None):
         self.condition = condition
         self.if_block = if_block
         self.else_block = else_block
     
-    def parse(self):
-        if self.condition.parse():
-            return self.if_block.parse()
+    def parse(self, frame):
+        if self.condition.parse(frame):
+            return self.if_block.parse(frame)
         else:
-            return self.else_block.parse()
+            return self.else_block.parse(frame)
+
+    async def run_async(self, frame, turn):
+        if self.condition.parse(frame):
+            await self.if_block.run_async(frame, turn)
+        else:
+            await self.else_block.run_async(frame, turn)
     
     def __str__(self):
         return 'if {}'.format(self.condition)
 
 class AssignStatement(Node):
-    def __init__(self, parent = None, children = [], lvalue = None, rvalue = None):
-        self.parent = parent
-        self.children = children
+    __slots__ = ['lvalue', 'rvalue']
+
+    def __init__(self, lvalue = None, rvalue = None):
         self.lvalue = lvalue
         self.rvalue = rvalue
 
-        self.parse()
-
-    def parse(self):
+    def parse(self, frame):
         if type(self.lvalue).__name__ == 'ListStringIndexing':
-            self.lvalue.expr.parse()[self.lvalue.index.parse()] = self.rvalue.parse()
+            sequence = self.lvalue.expr.parse(frame)
+            index = self.lvalue.index.parse(frame)
+            value = self.rvalue.parse(frame)
+            try:
+                if frame.indexes.lists:
+                    frame.indexes.store(sequence, index, value)
+                else:
+                    sequence[index] = value
+            except errors:
+                raise SbmlSemanticError()
         if type(self.lvalue).__name__ == 'Variable':
-            names[self.lvalue.name] = self.rvalue.parse()
+            frame.values[self.lvalue.slot] = self.rvalue.parse(frame)
 
     def __str__(self):
         return 'Assign: {}={}'.format(self.lvalue, self.rvalue)
 
 class PrintStatement(Node):
-    def __init__(self, parent = None, children = [], expr = None):
-        self.parent = parent
-        self.children = children
+    __slots__ = ['expr']
+
+    def __init__(self, expr = None):
         self.expr = expr
     
-    def parse(self):
-        print(self.expr.parse())
+    def parse(self, frame):
+        frame.output.line(str(self.expr.parse(frame)))
     
     def __str__(self):
         return 'print({})'.format(self.expr)
         
 
 class Variable(Node):
-    def __init__(self, parent = None, children = [], name = None):
-        super().__init__(parent, children)
+    # slot is filled in by the resolver, and bound for the variables that are read
+    __slots__ = ['name', 'slot', 'bound']
+
+    def __init__(self, name = None):
         self.name = name
     
-    def parse(self):
-        return names[self.name]
+    def parse(self, frame):
+        value = frame.values[self.slot]
+        if value is undefined:
+            raise SbmlSemanticError()
+        return value
 
     def __str__(self):
         return '(Variable: {})'.format(self.name)
 
+class Invariant(Node):
+    # an expression of a while loop that nothing in the loop can change. it runs where it is
+    # first reached after the loop starts, so it fails there if it fails at all, and its value is
+    # kept in slot for the rest of the loop, unless a list can be reached from it
+    __slots__ = ['expr', 'name', 'slot']
+
+    def __init__(self, expr = None, name = None):
+        self.expr = expr
+        self.name = name
+
+    def parse(self, frame):
+        value = frame.values[self.slot]
+        if value is undefined:
+            value = self.expr.parse(frame)
+            if immutable(value):
+                frame.values[self.slot] = value
+        return value
+
+    def __str__(self):
+        return str(self.expr)
+
+def immutable(value):
+    # whether every evaluation may share value, lists are mutable and each evaluation builds its own
+    if type(value) is tuple:
+        return all(immutable(element) for element in value)
+    return type(value) is not list and type(value) is not PackedList
+
 class BooleanExpression(Node):
-    def __init__(self, parent = None, children = [], expr = None):
-        super().__init__(parent, children)
+    __slots__ = ['expr']
+
+    def __init__(self, expr = None):
         self.expr = expr
 
-    def parse(self):
-        return self.expr.parse()
+    def parse(self, frame):
+        return self.expr.parse(frame)
 
 class Negation(Node):
-    def __init__(self, parent = None, children = [], expr = None):
-        super().__init__(parent, children)
+    __slots__ = ['expr']
+
+    def __init__(self, expr = None):
         self.expr = expr
     
-    def parse(self):
-        return not self.expr.parse()
+    def parse(self, frame):
+        return not self.expr.parse(frame)
     
     def __str__(self):
         return 'Negation: not expr={}'.format(self.expr)
 
 class Conjunction(Node):
-    def __init__(self, parent = None, children = [], left = None, right = None):
-        super().__init__(parent, children)
+    __slots__ = ['left', 'right']
+
+    def __init__(self, left = None, right = None):
         self.left = left
         self.right = right
 
-    def parse(self):
-        return self.left.parse() and self.right.parse()
+    def parse(self, frame):
+        return self.left.parse(frame) and self.right.parse(frame)
     
     def __str__(self):
         return 'Conjunction: left={} andalso right={}'.format(self.left, self.right)
 
 class Disjunction(Node):
-    def __init__(self, parent = None, children = [], left = None, right = None):
-        super().__init__(parent, children)
+    __slots__ = ['left', 'right']
+
+    def __init__(self, left = None, right = None):
         self.left = left
         self.right = right
     
-    def parse(self):
-        return self.left.parse() or self.right.parse()
+    def parse(self, frame):
+        return self.left.parse(frame) or self.right.parse(frame)
     
     def __str__(self):
         return 'Disjunction: left={} orelse right={}'.format(self.left, self.right)
 
 class Comparison(Node):
-    def __init__(self, parent = None, children = [], left = None, right = None, operation = None):
-        super().__init__(parent, children)
+    __slots__ = ['left', 'right', 'operation', 'site']
+
+    def __init__(self, left = None, right = None, operation = None):
         self.left = left
         self.right = right
         self.operation = operation
+        self.site = None
     
-    def parse(self):
-        result = None
-
-        try: 
-            if self.operation == '<':
-                result = self.left.parse() < self.right.parse()
-            elif self.operation == '<=':
-                result = self.left.parse() <= self.right.parse()
-            elif self.operation == '>':
-                result = self.left.parse() > self.right.parse()
-            elif self.operation == '>=':
-                result = self.left.parse() >= self.right.parse()
-            elif self.operation == '==':
-                result = self.left.parse() == self.right.parse()
-            elif self.operation == '<>':
-                result = self.left.parse() != self.right.parse()
-        except TypeError:
-            print_semantic_err()
-            exit(1)
-        
-        return result
+    def parse(self, frame):
+        left = self.left.parse(frame)
+        right = self.right.parse(frame)
+
+        site = self.site
+        if site is None:
+            site = self.site = comparison_operators[self.operation]
+
+        try:
+            return site(left, right)
+        except errors:
+            raise SbmlSemanticError()
     
     def __str__(self):
         return 'Comparison: left={}, operation={}, right={}'.format(self.left, self.operation, self.right)
 
 
 class Boolean(Node):
-    def __init__(self, parent = None, children = [], value = None):
-        super().__init__(parent, children)
+    __slots__ = ['value']
+
+    def __init__(self, value = None):
         self.value = value
     
-    def parse(self):
+    def parse(self, frame = None):
         if type(self.value).__name__ == 'Boolean':
-            return self.value.parse()
-        return eval(self.value)
+            return self.value.parse(frame)
+        return self.value
 
 class BinaryOperation(Node):
-    def __init__(self, parent = None, children = [], left = None, right = None, operation = None):
-        super().__init__(parent, children)
+    __slots__ = ['left', 'right', 'operation', 'site']
+
+    def __init__(self, left = None, right = None, operation = None):
         self.left = left
         self.right = right
         self.operation = operation
+        self.site = None
     
-    def parse(self):
-        result = None
+    def parse(self, frame):
+        left = self.left.parse(frame)
+        right = self.right.parse(frame)
+
+        site = self.site
+        if site is None:
+            site = self.site = binary_operators[self.operation]
 
         try:
-            if self.operation == '+':
-                result = self.left.parse() + self.right.parse()
-            elif self.operation == '-':
-                result = self.left.parse() - self.right.parse()
-            elif self.operation == '*':
-                result = self.left.parse() * self.right.parse()
-            elif self.operation in ['/', 'div', 'mod']:
-                if self.right.parse() == 0:
-                    print_semantic_err()
-                    exit(1)
-                else:
-                    if self.operation == '/':
-                        result = self.left.parse() / self.right.parse()
-                    elif self.operation == 'div':
-                        result = self.left.parse() // self.right.parse()
-                    elif self.operation == 'mod':
-                        result = self.left.parse() % self.right.parse()
-            elif self.operation == '**':
-                result = self.left.parse() ** self.right.parse()
-        except TypeError:
-            print_semantic_err()
-            exit(1)
-            
-        return result
+            if site is power:
+                return power(left, right, frame.budget)
+            return site(left, right)
+        except errors:
+            raise SbmlSemanticError()
     
     def __str__(self):
         return 'BinaryOperation: {} {} {}'.format(self.left, self.operation, self.right)
 
 class UnaryMinus(Node):
-    def __init__(self, parent = None, children = [], expr = None):
-        super().__init__(parent, children)
+    __slots__ = ['expr']
+
+    def __init__(self, expr = None):
         self.expr = expr
     
-    def parse(self):
-        if type(self.expr).__name__ == 'Number':
-            return -self.expr.parse()
-        return -self.expr
+    def parse(self, frame):
+        try:
+            return -self.expr.parse(frame)
+        except errors:
+            raise SbmlSemanticError()
 
 class String(Node):
-    def __init__(self, parent = None, children = [], value = None):
-        super().__init__(parent, children)
+    __slots__ = ['value']
+
+    def __init__(self, value = None):
         self.value = value
     
-    def parse(self):
-        return eval(self.value)
+    def parse(self, frame = None):
+        # decoded by the lexer
+        return self.value
     
     def __str__(self):
         return 'String: value={}'.format(self.parse())
 
 class ListConstruct(Node):
-    def __init__(self, parent = None, children = [], left = None, right = None):
-        super().__init__(parent, children)
+    __slots__ = ['left', 'right']
+
+    def __init__(self, left = None, right = None):
         self.left = left
         self.right = right
     
-    def parse(self):
-        if type(self.right.parse()).__name__ != 'list':
-            print_semantic_err()
-            exit(1)
-    
-        return [self.left.parse()] + self.right.parse()
+    def parse(self, frame):
+        try:
+            return cons(self.left.parse(frame), self.right.parse(frame))
+        except errors:
+            raise SbmlSemanticError()
 
 class Membership(Node):
-    def __init__(self, parent = None, children = [], element = None, collection = None):
-        super().__init__(parent, children)
+    __slots__ = ['element', 'collection']
+
+    def __init__(self, element = None, collection = None):
         self.element = element
         self.collection = collection
 
-    def parse(self):
+    def parse(self, frame):
+        element = self.element.parse(frame)
+        collection = self.collection.parse(frame)
+        if type(collection) is list and len(collection) >= min_size:
+            return frame.indexes.contains(element, collection)
         try:
-            return self.element.parse() in self.collection.parse()
-        except:
-            print_semantic_err()
-            exit(1)
+            return element in collection
+        except errors:
+            raise SbmlSemanticError()
         
     def __str__(self):
-        return '{} in {}'.format(self.element.parse(), self.collection.parse())
+        return '{} in {}'.format(self.element, self.collection)
 
 
 class TupleIndexing(Node):
-    def __init__(self, parent = None, children = [], index = None, expr = None):
-        super().__init__(parent, children)
+    # checked is set by the checker when expr is sure to be a tuple long enough to have the element
+    __slots__ = ['index', 'expr', 'checked']
+
+    def __init__(self, index = None, expr = None):
         self.index = index
         self.expr = expr
+        self.checked = False
 
-    def parse(self):
-        if type(self.expr.parse()).__name__ != 'tuple':
-            print_semantic_err()
-            exit(1)
+    def parse(self, frame):
+        sequence = self.expr.parse(frame)
+        i = self.index.parse(frame)
+        if self.checked:
+            return sequence[i - 1]
 
-        if self.index.parse() - 1 < 0 or self.index.parse() - 1 >= len(self.expr.parse()):
-            print_semantic_err()
-            exit(1)
+        if type(sequence).__name__ != 'tuple':
+            raise SbmlSemanticError()
+
+        if i - 1 < 0 or i - 1 >= len(sequence):
+            raise SbmlSemanticError()
     
-        return self.expr.parse()[self.index.parse() - 1]
+        return sequence[i - 1]
 
 class ListStringIndexing(Node):
-    def __init__(self, parent = None, children = [], index = None, expr = None):
-        super().__init__(parent, children)
+    # checked is set by the checker when index is sure to be an int, and expr a list, string or
+    # tuple, only the bounds are left to check then
+    __slots__ = ['index', 'expr', 'checked']
+
+    def __init__(self, index = None, expr = None):
         self.index = index
         self.expr = expr
+        self.checked = False
     
-    def parse(self):
-        index_type = type(self.index.parse()).__name__
+    def parse(self, frame):
+        sequence = self.expr.parse(frame)
+        i = self.index.parse(frame)
 
-        if index_type != 'int': # make sure expression is not a string, can't index with that.
-            print_semantic_err()
-            exit(1)
+        if not self.checked and type(i).__name__ != 'int': # make sure expression is not a string, can't index with that.
+            raise SbmlSemanticError()
 
-        if self.index.parse() < 0 or self.index.parse() >= len(self.expr.parse()):
-            print_semantic_err()
-            exit(1)
+        try:
+            if i < 0 or i >= len(sequence):
+                raise SbmlSemanticError()
+        except TypeError:
+            raise SbmlSemanticError()
 
-        return self.expr.parse()[self.index.parse()]
+        return sequence[i]
     
     def __str__(self):
-        return '{}[{}]'.format(self.expr.parse(), self.index.parse())
+        return '{}[{}]'.format(self.expr, self.index)
 
 class Number(Node):
-    def __init__(self, parent = None, children = [], value = None):
-        super().__init__(parent, children)
+    __slots__ = ['value']
+
+    def __init__(self, value = None):
         self.value = value
     
-    def parse(self):
+    def parse(self, frame = None):
         return self.value
     
     def __str__(self):
         return 'Number: value={}'.format(self.value)
 
 class List(Node):
-    def __init__(self, parent = None, children = [], lst=[]):
-        super().__init__(parent, children)
+    __slots__ = ['lst']
+
+    def __init__(self, lst = []):
         self.lst = lst
     
-    def parse(self):
+    def parse(self, frame):
         if len(self.lst) > 0:
-            parsed = [element.parse() for element in self.lst]
-            return parsed
+            parsed = [element.parse(frame) for element in self.lst]
+            return pack(parsed)
         return self.lst
     
     def __str__(self):
-        return '[{}]'.format(self.parse())
+        return '[{}]'.format(', '.join(str(element) for element in self.lst))
 
 class Tuple(Node):
-    def __init__(self, parent = None, children = [], tup=()):
-        super().__init__(parent, children)
+    __slots__ = ['tup']
+
+    def __init__(self, tup = ()):
         self.tup = tup
     
-    def parse(self):
-        return (element.parse() for element in self.tup)
\ No newline at end of file
+    def parse(self, frame):
+        return tuple(element.parse(frame) for element in self.tup)
+
+class Constant(Node):
+    # a literal value computed ahead of time by the optimizer
+    __slots__ = ['value']
+
+    def __init__(self, value = None):
+        self.value = value
+
+    def parse(self, frame = None):
+        return self.value
+
+    def __str__(self):
+        return 'Constant: value={}'.format(self.value)
+
+class ConstantList(Node):
+    # a list literal whose elements are all constants, kept as a tuple of the values rather than
+    # a node per element. every evaluation makes a new list, as the literal would
+    __slots__ = ['values']
+
+    def __init__(self, values = ()):
+        self.values = values
+
+    def parse(self, frame = None):
+        return pack(list(self.values))
+
+    def __str__(self):
+        return 'ConstantList: values={}'.format(list(self.values))
@@ -0,0 +1,112 @@
+# runs many sbml programs over a pool of worker processes, each of which imports the
+# interpreter and builds its parser once, and writes one JSON line per program:
+#   {"path": ..., "status": "OK" | "SYNTAX ERROR" | "SEMANTIC ERROR" | "RESOURCE LIMIT" | "ERROR", "stdout": ..., "time": seconds}
+#
+# the input is a directory, whose files all run, or a manifest listing one path per line,
+# relative to the manifest. lines starting with # are skipped.
+
+# system imports
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+# internal imports
+from utils import ERROR_RESOURCE, ResourceLimit, SbmlError, print_error, print_resource_err
+from limits import Limits
+from sinks import CaptureSink
+import sbml
+
+usage = "Invalid arguments. Proper usage: python3 batch.py [--engine=closure|tree|vm|python] [--workers=N] [--no-cache] [--report=<file>] [--max-iterations=N] [--timeout=seconds] [--max-power-bits=N] <directory|manifest>"
+
+def programs(target):
+    if os.path.isdir(target):
+        return [os.path.join(target, name) for name in sorted(os.listdir(target)) if os.path.isfile(os.path.join(target, name))]
+
+    folder = os.path.dirname(os.path.abspath(target))
+    with open(target) as fd:
+        lines = [line.strip() for line in fd]
+    return [os.path.join(folder, line) for line in lines if line and not line.startswith('#')]
+
+def warm_up():
+    # runs once in every worker, so no program pays for building the lexer and parser
+    sbml.lexer.build()
+    sbml.build()
+
+def run(path, engine, use_cache, limits = None):
+    captured = io.StringIO()
+    status = 'OK'
+    error = None
+    start = time.perf_counter()
+
+    # prints are captured straight into the report, the redirection catches error messages
+    with contextlib.redirect_stdout(captured):
+        try:
+            sbml.load(path, use_cache).execute(engine=engine, limits=limits, output=CaptureSink(captured))
+        except SbmlError as e:
+            # errors are reported the way the command line reports them, as the last line of output
+            print_error(e)
+            status = e.message
+        except ResourceLimit:
+            print_resource_err()
+            status = ERROR_RESOURCE
+        except Exception as e:
+            status = 'ERROR'
+            error = '{}: {}'.format(type(e).__name__, e)
+
+    result = {'path': path, 'status': status, 'stdout': captured.getvalue(), 'time': time.perf_counter() - start}
+    if error:
+        result['error'] = error
+    return result
+
+def run_all(paths, engine = sbml.default_engine, workers = None, use_cache = True, limits = None):
+    # yields the results in the order of paths
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 8))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=warm_up) as executor:
+        for result in executor.map(run, paths, [engine] * len(paths), [use_cache] * len(paths), [limits] * len(paths), chunksize=chunksize):
+            yield result
+
+def main(args):
+    engine = sbml.default_engine
+    workers = None
+    use_cache = True
+    report = None
+    limits = Limits()
+    targets = []
+
+    for arg in args[1:]:
+        if sbml.limit_flag(arg, limits):
+            pass
+        elif arg.startswith('--engine='):
+            engine = arg[len('--engine='):]
+        elif arg.startswith('--workers='):
+            workers = int(arg[len('--workers='):])
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg.startswith('--report='):
+            report = arg[len('--report='):]
+        else:
+            targets.append(arg)
+
+    if len(targets) != 1 or engine not in sbml.engines:
+        print(usage)
+        exit(1)
+
+    if all(value is None for value in vars(limits).values()):
+        limits = None
+
+    out = open(report, 'w') if report else sys.stdout
+    try:
+        for result in run_all(programs(targets[0]), engine, workers, use_cache, limits):
+            out.write(json.dumps(result) + '\n')
+    finally:
+        if report:
+            out.close()
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,155 @@
+# system imports
+import hashlib
+import marshal
+import mmap
+import os
+import sys
+import tempfile
+
+# internal imports
+from ast import *
+from program import Program
+
+# bump whenever the AST classes or the encoding below change, older files are then ignored
+VERSION = 9
+
+MAGIC = b'SBMLC\0\0\0'
+EXTENSION = '.sbmlc'
+
+# compiled files are only valid for the python that wrote them, marshal's format is version specific
+interpreter = '{}:{}.{}:{}'.format(VERSION, sys.version_info[0], sys.version_info[1], marshal.version)
+
+directory = os.environ.get('SBML_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'sbml'))
+max_size = int(os.environ.get('SBML_CACHE_SIZE', 32 * 1024 * 1024))
+
+node_types = {cls.__name__: cls for cls in [Node] + Node.__subclasses__()}
+
+### Encoding ###
+
+def encode(value):
+    # nodes become dicts tagged with their class under the '' key, the rest maps onto marshal types
+    if isinstance(value, Node):
+        encoded = {name: encode(getattr(value, name)) for name in fields(value)}
+        encoded[''] = type(value).__name__
+        return encoded
+    if type(value) is list:
+        return [encode(element) for element in value]
+    if type(value) is tuple:
+        return tuple(encode(element) for element in value)
+    return value
+
+def decode(value):
+    if type(value) is dict:
+        # built through __init__, which sets up the slots a node only uses while running
+        node = node_types[value['']]()
+        for name, field in value.items():
+            if name:
+                setattr(node, name, decode(field))
+        return node
+    if type(value) is list:
+        return [decode(element) for element in value]
+    if type(value) is tuple:
+        return tuple(decode(element) for element in value)
+    return value
+
+def source_hash(source):
+    return hashlib.sha256(source.encode()).hexdigest()
+
+def dumps(program, digest):
+    payload = (interpreter, digest, encode(program.block), program.slots, sorted(program.unbound))
+    return MAGIC + marshal.dumps(payload)
+
+def loads(data, digest = None):
+    # returns None for files written by another interpreter version or for another source
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        return None
+
+    try:
+        version, stored_digest, block, slots, unbound = marshal.loads(data[len(MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    if version != interpreter or (digest is not None and stored_digest != digest):
+        return None
+
+    return Program(decode(block), slots=slots, unbound=set(unbound))
+
+### Files ###
+
+def load(path, digest = None):
+    with open(path, 'rb') as fd:
+        if os.fstat(fd.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return loads(data, digest)
+
+def save(path, program, digest):
+    # written to a temporary file first so readers never see a partial file
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(dumps(program, digest))
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+### Cache directory ###
+
+def entry(digest):
+    return os.path.join(directory, digest + EXTENSION)
+
+def lookup(source):
+    digest = source_hash(source)
+    path = entry(digest)
+
+    try:
+        program = load(path, digest)
+    except OSError:
+        return None
+
+    if program is None:
+        # stale, written by another interpreter version
+        remove(path)
+        return None
+
+    # the modification time doubles as the last use for eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return program
+
+def store(source, program):
+    try:
+        os.makedirs(directory, exist_ok=True)
+        save(entry(source_hash(source)), program, source_hash(source))
+        evict()
+    except OSError:
+        # the cache is an optimization, never fail a run because of it
+        pass
+
+def evict():
+    # drops least recently used entries until the directory fits in max_size
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(EXTENSION):
+            stat = os.stat(os.path.join(directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_size:
+            break
+        remove(os.path.join(directory, name))
+        total -= size
+
+def remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,284 @@
+# internal imports
+from ast import *
+from packed import PackedList
+
+# type inference, run on the resolved program. it follows the type every variable has at every
+# point of the program, through branches and to a fixed point around loops, and uses it to:
+#   - prove indexing can't fail on the types of its operands, ListStringIndexing and
+#     TupleIndexing nodes get checked set then, and the engines skip those checks
+#   - reject programs that certainly go wrong: an operation every run reaches, on operands of
+#     types it always fails on, is a SEMANTIC ERROR before anything runs
+#
+# a type is the name of a Python type: 'int', 'float', 'bool', 'str' or 'list', a tuple of the
+# types of the elements of a tuple whose shape is known, 'tuple' for any other tuple, or None
+# when it is not known. variables start unknown, a run may bind any of them beforehand, and an
+# operation on an unknown operand is never rejected
+#
+# an operation is certain to run when every run that gets as far as the statement holding it
+# reaches it: it isn't in a branch or a loop body, nor on the right of an and / or, and no loop
+# comes before it, which might not end
+
+numeric = ['int', 'float', 'bool']
+
+def is_tuple(kind):
+    return kind == 'tuple' or type(kind) is tuple
+
+def kind_of(value):
+    # the type of a constant
+    if type(value) is tuple:
+        return tuple(kind_of(element) for element in value)
+    if type(value) in [list, PackedList]:
+        return 'list'
+    return type(value).__name__
+
+def join(first, second):
+    # the type of a value that has either type
+    if first == second:
+        return first
+    if type(first) is tuple and type(second) is tuple and len(first) == len(second):
+        return tuple(join(a, b) for a, b in zip(first, second))
+    if is_tuple(first) and is_tuple(second):
+        return 'tuple'
+    return None
+
+def join_states(first, second):
+    # variables missing from a state are unknown
+    if first is second:
+        return first
+    joined = {}
+    for name in first:
+        kind = join(first[name], second.get(name))
+        if kind is not None:
+            joined[name] = kind
+    return joined
+
+def arithmetic(left, right):
+    return 'float' if 'float' in [left, right] else 'int'
+
+class Checker():
+    def __init__(self):
+        # whether each indexing node was proven safe every time it was reached
+        self.proven = {}
+
+        # the states loops have been entered with, and the state they left with
+        self.loops = {}
+
+        self.rejected = False
+
+    ### Statements, each returns the state after it and whether it certainly ends ###
+
+    def statement(self, node, state, certain):
+        return getattr(self, 'statement_' + type(node).__name__)(node, state, certain)
+
+    def statement_Block(self, node, state, certain):
+        ends = True
+        for statement in node.statements or []:
+            state, ended = self.statement(statement, state, certain and ends)
+            ends = ends and ended
+        return state, ends
+
+    def statement_AssignStatement(self, node, state, certain):
+        if type(node.lvalue).__name__ == 'ListStringIndexing':
+            sequence = self.expression(node.lvalue.expr, state, certain)
+            self.expression(node.lvalue.index, state, certain)
+            self.expression(node.rvalue, state, certain)
+            # only the elements of lists can be assigned
+            self.fails(sequence is not None and sequence != 'list', certain)
+            node.lvalue.checked = False
+            return state, True
+
+        kind = self.expression(node.rvalue, state, certain)
+        state = dict(state)
+        if kind is None:
+            state.pop(node.lvalue.name, None)
+        else:
+            state[node.lvalue.name] = kind
+        return state, True
+
+    def statement_PrintStatement(self, node, state, certain):
+        self.expression(node.expr, state, certain)
+        return state, True
+
+    def statement_IfStatement(self, node, state, certain):
+        self.expression(node.condition, state, certain)
+        after, ends = self.statement(node.block, state, False)
+        return join_states(state, after), ends
+
+    def statement_IfElseStatement(self, node, state, certain):
+        self.expression(node.condition, state, certain)
+        if_after, if_ends = self.statement(node.if_block, state, False)
+        else_after, else_ends = self.statement(node.else_block, state, False)
+        return join_states(if_after, else_after), if_ends and else_ends
+
+    def statement_WhileStatement(self, node, state, certain):
+        # only the first test of the condition is certain, and with the state before the loop
+        self.expression(node.condition, state, certain)
+
+        # the state at the top of the loop, widened by every run of the body until it stays
+        # the same. a loop entered again as it was before ends as it did then
+        key = (id(node), frozenset(state.items()))
+        if key in self.loops:
+            return self.loops[key], False
+
+        top = state
+        while True:
+            self.expression(node.condition, top, False)
+            after, _ = self.statement(node.block, top, False)
+            widened = join_states(top, after)
+            if widened == top:
+                break
+            top = widened
+
+        self.loops[key] = top
+        return top, False
+
+    ### Expressions, each returns the type of its value ###
+
+    def fails(self, failing, certain):
+        if failing and certain:
+            self.rejected = True
+
+    def prove(self, node, proven):
+        node.checked = self.proven[id(node)] = self.proven.get(id(node), True) and proven
+
+    def expression(self, node, state, certain):
+        return getattr(self, 'expression_' + type(node).__name__)(node, state, certain)
+
+    def expression_Variable(self, node, state, certain):
+        return state.get(node.name)
+
+    def expression_Invariant(self, node, state, certain):
+        return self.expression(node.expr, state, certain)
+
+    def expression_Number(self, node, state, certain):
+        return kind_of(node.value)
+
+    def expression_String(self, node, state, certain):
+        return 'str'
+
+    def expression_Boolean(self, node, state, certain):
+        return 'bool'
+
+    def expression_Constant(self, node, state, certain):
+        return kind_of(node.value)
+
+    def expression_ConstantList(self, node, state, certain):
+        return 'list'
+
+    def expression_List(self, node, state, certain):
+        for element in node.lst:
+            self.expression(element, state, certain)
+        return 'list'
+
+    def expression_Tuple(self, node, state, certain):
+        return tuple(self.expression(element, state, certain) for element in node.tup)
+
+    def expression_BooleanExpression(self, node, state, certain):
+        return self.expression(node.expr, state, certain)
+
+    def expression_Negation(self, node, state, certain):
+        self.expression(node.expr, state, certain)
+        return 'bool'
+
+    def expression_Conjunction(self, node, state, certain):
+        # and / or give back one of their operands, the right one only runs some of the time
+        return join(self.expression(node.left, state, certain), self.expression(node.right, state, False))
+
+    expression_Disjunction = expression_Conjunction
+
+    def expression_Comparison(self, node, state, certain):
+        left = self.expression(node.left, state, certain)
+        right = self.expression(node.right, state, certain)
+        if node.operation not in ['==', '<>'] and left is not None and right is not None:
+            ordered = (left in numeric and right in numeric) or left == right == 'str' or left == right == 'list' \
+                or (is_tuple(left) and is_tuple(right))
+            self.fails(not ordered, certain)
+        return 'bool'
+
+    def expression_BinaryOperation(self, node, state, certain):
+        left = self.expression(node.left, state, certain)
+        right = self.expression(node.right, state, certain)
+        if left is None or right is None:
+            return None
+
+        operation = node.operation
+        if left in numeric and right in numeric:
+            if operation == '/':
+                return 'float'
+            if operation == '**':
+                # a negative exponent makes a float, a fractional one of a negative float a complex
+                return None
+            return arithmetic(left, right)
+
+        if operation == '+' and left == right and left in ['str', 'list']:
+            return left
+        if operation == '+' and type(left) is tuple and type(right) is tuple:
+            return left + right
+        if operation == '+' and is_tuple(left) and is_tuple(right):
+            return 'tuple'
+        if operation == '*' and right in ['int', 'bool'] and (left in ['str', 'list'] or is_tuple(left)):
+            return 'tuple' if is_tuple(left) else left
+        if operation == '*' and left in ['int', 'bool'] and (right in ['str', 'list'] or is_tuple(right)):
+            return 'tuple' if is_tuple(right) else right
+        if operation == 'mod' and left == 'str':
+            # formats the string, which may or may not fail
+            return None
+
+        self.fails(True, certain)
+        return None
+
+    def expression_UnaryMinus(self, node, state, certain):
+        kind = self.expression(node.expr, state, certain)
+        if kind in numeric:
+            return 'float' if kind == 'float' else 'int'
+        self.fails(kind is not None, certain)
+        return None
+
+    def expression_ListConstruct(self, node, state, certain):
+        self.expression(node.left, state, certain)
+        right = self.expression(node.right, state, certain)
+        self.fails(right is not None and right != 'list', certain)
+        return 'list'
+
+    def expression_Membership(self, node, state, certain):
+        element = self.expression(node.element, state, certain)
+        collection = self.expression(node.collection, state, certain)
+        if collection == 'str':
+            self.fails(element is not None and element != 'str', certain)
+        else:
+            self.fails(collection in numeric, certain)
+        return 'bool'
+
+    def expression_TupleIndexing(self, node, state, certain):
+        kind = self.expression(node.expr, state, certain)
+        i = node.index.value
+
+        proven = type(kind) is tuple and 1 <= i <= len(kind)
+        self.prove(node, proven)
+        self.fails(kind is not None and not proven and (not is_tuple(kind) or type(kind) is tuple), certain)
+        return kind[i - 1] if proven else None
+
+    def expression_ListStringIndexing(self, node, state, certain):
+        sequence = self.expression(node.expr, state, certain)
+        index = self.expression(node.index, state, certain)
+
+        # only the bounds are left to check
+        self.prove(node, index == 'int' and (sequence in ['list', 'str'] or is_tuple(sequence)))
+        self.fails((index is not None and index != 'int') or sequence in numeric, certain)
+
+        if sequence == 'str':
+            return 'str'
+        if type(sequence) is tuple and sequence:
+            kind = sequence[0]
+            for element in sequence[1:]:
+                kind = join(kind, element)
+            return kind
+        return None
+
+def check(block):
+    # annotates the indexing nodes of block, raises SbmlSemanticError when it can't run
+    checker = Checker()
+    checker.statement(block, {}, True)
+    if checker.rejected:
+        raise SbmlSemanticError()
+    return block
@@ -0,0 +1,309 @@
+# internal imports
+from utils import *
+from ast import undefined, immutable, errors
+from limits import power
+from packed import pack, cons
+from indexes import min_size
+
+# every closure takes the values list of the frame it runs in, so one compiled program can
+# serve any number of runs at once. the last entry of values is the frame itself.
+#
+# each table maps an operator to a factory that builds the closure for it, so the
+# operator is resolved once when the node is compiled instead of on every evaluation
+binary_operations = {
+    '+': lambda left, right: lambda values: left(values) + right(values),
+    '-': lambda left, right: lambda values: left(values) - right(values),
+    '*': lambda left, right: lambda values: left(values) * right(values),
+    '/': lambda left, right: lambda values: left(values) / right(values),
+    'div': lambda left, right: lambda values: left(values) // right(values),
+    'mod': lambda left, right: lambda values: left(values) % right(values),
+    '**': lambda left, right: lambda values: power(left(values), right(values), values[-1].budget)
+}
+
+# the right operand is a literal
+binary_constant_operations = {
+    '+': lambda left, value: lambda values: left(values) + value,
+    '-': lambda left, value: lambda values: left(values) - value,
+    '*': lambda left, value: lambda values: left(values) * value,
+    '/': lambda left, value: lambda values: left(values) / value,
+    'div': lambda left, value: lambda values: left(values) // value,
+    'mod': lambda left, value: lambda values: left(values) % value,
+    '**': lambda left, value: lambda values: power(left(values), value, values[-1].budget)
+}
+
+comparisons = {
+    '<': lambda left, right: lambda values: left(values) < right(values),
+    '<=': lambda left, right: lambda values: left(values) <= right(values),
+    '>': lambda left, right: lambda values: left(values) > right(values),
+    '>=': lambda left, right: lambda values: left(values) >= right(values),
+    '==': lambda left, right: lambda values: left(values) == right(values),
+    '<>': lambda left, right: lambda values: left(values) != right(values)
+}
+
+# the right operand is a literal
+constant_comparisons = {
+    '<': lambda left, value: lambda values: left(values) < value,
+    '<=': lambda left, value: lambda values: left(values) <= value,
+    '>': lambda left, value: lambda values: left(values) > value,
+    '>=': lambda left, value: lambda values: left(values) >= value,
+    '==': lambda left, value: lambda values: left(values) == value,
+    '<>': lambda left, value: lambda values: left(values) != value
+}
+
+def constant(node):
+    # the value of a literal node, or None when the node isn't one
+    if type(node).__name__ in ['Number', 'String', 'Boolean', 'Constant']:
+        return node.parse()
+    return None
+
+def compile_node(node):
+    return compilers[type(node).__name__](node)
+
+### Statements ###
+
+def compile_Block(node):
+    statements = [compile_node(statement) for statement in node.statements or []]
+
+    if len(statements) == 1:
+        return statements[0]
+
+    def block(values):
+        for statement in statements:
+            statement(values)
+    return block
+
+def compile_WhileStatement(node):
+    condition = compile_node(node.condition)
+    body = compile_node(node.block)
+    invariants = node.invariant_slots
+
+    def loop(values):
+        for slot in invariants:
+            values[slot] = undefined
+
+        budget = values[-1].budget
+        if budget is None:
+            while condition(values):
+                body(values)
+        else:
+            tick = budget.tick
+            while condition(values):
+                body(values)
+                tick()
+    return loop
+
+def compile_IfStatement(node):
+    condition = compile_node(node.condition)
+    body = compile_node(node.block)
+
+    def branch(values):
+        if condition(values):
+            body(values)
+    return branch
+
+def compile_IfElseStatement(node):
+    condition = compile_node(node.condition)
+    if_body = compile_node(node.if_block)
+    else_body = compile_node(node.else_block)
+
+    def branch(values):
+        if condition(values):
+            if_body(values)
+        else:
+            else_body(values)
+    return branch
+
+def compile_AssignStatement(node):
+    rvalue = compile_node(node.rvalue)
+
+    if type(node.lvalue).__name__ == 'ListStringIndexing':
+        sequence = compile_node(node.lvalue.expr)
+        index = compile_node(node.lvalue.index)
+
+        def assign_index(values):
+            # the sequence and the index run before the value, as on the other engines
+            target = sequence(values)
+            i = index(values)
+            value = rvalue(values)
+            indexes = values[-1].indexes
+            if indexes.lists:
+                indexes.store(target, i, value)
+            else:
+                target[i] = value
+        return assign_index
+
+    slot = node.lvalue.slot
+
+    def assign(values):
+        values[slot] = rvalue(values)
+    return assign
+
+def compile_PrintStatement(node):
+    expr = compile_node(node.expr)
+    return lambda values: values[-1].output.line(str(expr(values)))
+
+### Expressions ###
+
+def compile_Variable(node):
+    slot = node.slot
+    if node.bound:
+        return lambda values: values[slot]
+
+    def load(values):
+        value = values[slot]
+        if value is undefined:
+            raise KeyError(node.name)
+        return value
+    return load
+
+def compile_Invariant(node):
+    expr = compile_node(node.expr)
+    slot = node.slot
+
+    def invariant(values):
+        value = values[slot]
+        if value is undefined:
+            value = expr(values)
+            if immutable(value):
+                values[slot] = value
+        return value
+    return invariant
+
+def compile_Number(node):
+    value = node.value
+    return lambda values: value
+
+def compile_Boolean(node):
+    value = node.parse()
+    return lambda values: value
+
+def compile_String(node):
+    value = node.parse()
+    return lambda values: value
+
+def compile_Constant(node):
+    value = node.value
+    return lambda values: value
+
+def compile_ConstantList(node):
+    elements = node.values
+    return lambda values: pack(list(elements))
+
+def compile_BooleanExpression(node):
+    return compile_node(node.expr)
+
+def compile_Negation(node):
+    expr = compile_node(node.expr)
+    return lambda values: not expr(values)
+
+def compile_Conjunction(node):
+    left = compile_node(node.left)
+    right = compile_node(node.right)
+    return lambda values: left(values) and right(values)
+
+def compile_Disjunction(node):
+    left = compile_node(node.left)
+    right = compile_node(node.right)
+    return lambda values: left(values) or right(values)
+
+def compile_Comparison(node):
+    left = compile_node(node.left)
+    value = constant(node.right)
+
+    if value is not None:
+        return constant_comparisons[node.operation](left, value)
+
+    return comparisons[node.operation](left, compile_node(node.right))
+
+def compile_BinaryOperation(node):
+    left = compile_node(node.left)
+    value = constant(node.right)
+
+    if value is not None:
+        return binary_constant_operations[node.operation](left, value)
+
+    return binary_operations[node.operation](left, compile_node(node.right))
+
+def compile_UnaryMinus(node):
+    if type(node.expr).__name__ == 'Number':
+        value = -node.expr.value
+        return lambda values: value
+
+    expr = compile_node(node.expr)
+    return lambda values: -expr(values)
+
+def compile_ListConstruct(node):
+    left = compile_node(node.left)
+    right = compile_node(node.right)
+
+    def construct(values):
+        sequence = right(values)
+        return cons(left(values), sequence)
+    return construct
+
+def compile_Membership(node):
+    element = compile_node(node.element)
+    collection = compile_node(node.collection)
+
+    def member(values):
+        value = element(values)
+        sequence = collection(values)
+        if type(sequence) is list and len(sequence) >= min_size:
+            return values[-1].indexes.contains(value, sequence)
+        return value in sequence
+    return member
+
+def compile_TupleIndexing(node):
+    expr = compile_node(node.expr)
+    i = node.index.value
+
+    if node.checked:
+        return lambda values: expr(values)[i - 1]
+
+    def index(values):
+        sequence = expr(values)
+        if type(sequence) is not tuple or i < 1 or i > len(sequence):
+            raise IndexError
+        return sequence[i - 1]
+    return index
+
+def compile_ListStringIndexing(node):
+    expr = compile_node(node.expr)
+    index = compile_node(node.index)
+
+    if node.checked:
+        def checked(values):
+            sequence = expr(values)
+            i = index(values)
+            if i < 0 or i >= len(sequence):
+                raise IndexError
+            return sequence[i]
+        return checked
+
+    def indexing(values):
+        sequence = expr(values)
+        i = index(values)
+        if type(i) is not int or i < 0 or i >= len(sequence):
+            raise IndexError
+        return sequence[i]
+    return indexing
+
+def compile_List(node):
+    elements = [compile_node(element) for element in node.lst]
+    return lambda values: pack([element(values) for element in elements])
+
+def compile_Tuple(node):
+    elements = [compile_node(element) for element in node.tup]
+    return lambda values: tuple([element(values) for element in elements])
+
+compilers = {name[len('compile_'):]: function for name, function in list(globals().items()) if name.startswith('compile_') and name != 'compile_node'}
+
+class ClosureProgram():
+    def __init__(self, block):
+        self.run = compile_node(block)
+
+    def parse(self, frame):
+        try:
+            self.run(frame.values)
+        except errors:
+            raise SbmlSemanticError()
@@ -0,0 +1,429 @@
+# system imports
+import operator
+
+# internal imports
+from ast import *
+
+### Opcodes ###
+
+# every instruction is an opcode followed by a fixed number of integer operands. name
+# operands are frame slots, and every instruction reading one other than LOAD_NAME_CHECKED
+# relies on the resolver having proven the slot bound
+LOAD_CONST = 0
+LOAD_NAME = 1
+STORE_NAME = 2
+BINARY_ADD = 3
+BINARY_SUBTRACT = 4
+BINARY_MULTIPLY = 5
+BINARY_DIVIDE = 6
+BINARY_FLOOR_DIVIDE = 7
+BINARY_MODULO = 8
+BINARY_POWER = 9
+COMPARE_OP = 10
+UNARY_NOT = 11
+UNARY_NEGATIVE = 12
+CONTAINS = 13
+CONS = 14
+INDEX = 15
+TUPLE_INDEX = 16
+STORE_INDEX = 17
+BUILD_LIST = 18
+BUILD_TUPLE = 19
+PRINT = 20
+JUMP = 21
+POP_JUMP_IF_FALSE = 22
+POP_JUMP_IF_TRUE = 23
+JUMP_IF_FALSE_OR_POP = 24
+JUMP_IF_TRUE_OR_POP = 25
+HALT = 26
+
+# superinstructions for the patterns that dominate loop bodies
+STORE_NAME_ADD_CONST = 27       # var = var + const
+STORE_NAME_SUBTRACT_CONST = 28  # var = var - const
+INDEX_NAME_NAME = 29            # var[var]
+COMPARE_JUMP_IF_FALSE = 30      # if/while (a < b), jump when false
+COMPARE_JUMP_IF_TRUE = 31       # if/while (a < b), jump when true
+COMPARE_NAME_CONST_JUMP_IF_FALSE = 32  # if/while (var < const), jump when false
+COMPARE_NAME_CONST_JUMP_IF_TRUE = 33   # if/while (var < const), jump when true
+ADD_NAME_CONST = 34             # var + const
+SUBTRACT_NAME_CONST = 35        # var - const
+STORE_NAME_CONST = 36           # var = const
+COMPARE_NAME_JUMP_IF_FALSE = 37 # if/while (a < var), jump when false
+COMPARE_NAME_JUMP_IF_TRUE = 38  # if/while (a < var), jump when true
+NAME_JUMP_IF_FALSE = 39         # if/while (var), jump when false
+NAME_JUMP_IF_TRUE = 40          # if/while (var), jump when true
+STORE_INDEX_NAME = 41           # var[a] = b
+
+# a variable that may still be undefined when read
+LOAD_NAME_CHECKED = 42
+
+# a new list holding the values of a constant tuple
+LOAD_LIST_CONST = 43
+
+# charges one loop iteration to the budget of the run, it starts every loop body. runs
+# without a budget jump past it
+TICK = 44
+
+# the value an Invariant keeps: pushed, with a jump past the code computing it, once it is
+# there, and stored, without popping it, once computed
+LOAD_INVARIANT = 45
+STORE_INVARIANT = 46
+
+opnames = [
+    'LOAD_CONST', 'LOAD_NAME', 'STORE_NAME',
+    'BINARY_ADD', 'BINARY_SUBTRACT', 'BINARY_MULTIPLY', 'BINARY_DIVIDE',
+    'BINARY_FLOOR_DIVIDE', 'BINARY_MODULO', 'BINARY_POWER',
+    'COMPARE_OP', 'UNARY_NOT', 'UNARY_NEGATIVE',
+    'CONTAINS', 'CONS', 'INDEX', 'TUPLE_INDEX', 'STORE_INDEX',
+    'BUILD_LIST', 'BUILD_TUPLE', 'PRINT',
+    'JUMP', 'POP_JUMP_IF_FALSE', 'POP_JUMP_IF_TRUE',
+    'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'HALT',
+    'STORE_NAME_ADD_CONST', 'STORE_NAME_SUBTRACT_CONST', 'INDEX_NAME_NAME',
+    'COMPARE_JUMP_IF_FALSE', 'COMPARE_JUMP_IF_TRUE',
+    'COMPARE_NAME_CONST_JUMP_IF_FALSE', 'COMPARE_NAME_CONST_JUMP_IF_TRUE',
+    'ADD_NAME_CONST', 'SUBTRACT_NAME_CONST', 'STORE_NAME_CONST',
+    'COMPARE_NAME_JUMP_IF_FALSE', 'COMPARE_NAME_JUMP_IF_TRUE',
+    'NAME_JUMP_IF_FALSE', 'NAME_JUMP_IF_TRUE', 'STORE_INDEX_NAME',
+    'LOAD_NAME_CHECKED', 'LOAD_LIST_CONST', 'TICK', 'LOAD_INVARIANT', 'STORE_INVARIANT'
+]
+
+# number of operands following each opcode
+arity = [
+    1, 1, 1,
+    0, 0, 0, 0,
+    0, 0, 0,
+    1, 0, 0,
+    0, 0, 0, 1, 0,
+    1, 1, 0,
+    1, 1, 1,
+    1, 1, 0,
+    2, 2, 2,
+    2, 2,
+    4, 4,
+    2, 2, 2,
+    3, 3,
+    2, 2, 1,
+    1, 1, 0, 2, 1
+]
+
+# operands of COMPARE_OP and the fused compare-and-jump instructions
+comparisons = ['<', '<=', '>', '>=', '==', '<>']
+comparators = [operator.lt, operator.le, operator.gt, operator.ge, operator.eq, operator.ne]
+
+binary_opcodes = {
+    '+': BINARY_ADD,
+    '-': BINARY_SUBTRACT,
+    '*': BINARY_MULTIPLY,
+    '/': BINARY_DIVIDE,
+    'div': BINARY_FLOOR_DIVIDE,
+    'mod': BINARY_MODULO,
+    '**': BINARY_POWER
+}
+
+class Code():
+    def __init__(self, instructions = None, constants = None, names = None):
+        self.instructions = instructions if instructions is not None else []
+        self.constants = constants if constants is not None else []
+        self.names = names if names is not None else []
+
+    def __str__(self):
+        lines = []
+        pc = 0
+
+        while pc < len(self.instructions):
+            op = self.instructions[pc]
+            operands = self.instructions[pc + 1:pc + 1 + arity[op]]
+            lines.append('{:>5} {:<26} {}'.format(pc, opnames[op], ' '.join(str(operand) for operand in operands)))
+            pc += 1 + arity[op]
+
+        return '\n'.join(lines)
+
+class Compiler():
+    def __init__(self):
+        self.code = Code()
+        self.constant_index = {}
+
+    def compile(self, node):
+        getattr(self, 'compile_' + type(node).__name__)(node)
+
+    ### Emitting ###
+
+    def emit(self, op, *operands):
+        self.code.instructions.append(op)
+        self.code.instructions.extend(operands)
+
+    def emit_jump(self, op, *operands):
+        # jump targets are patched once the destination is known
+        self.emit(op, *operands, -1)
+        return len(self.code.instructions) - 1
+
+    def patch(self, position, target = None):
+        self.code.instructions[position] = len(self.code.instructions) if target is None else target
+
+    def here(self):
+        return len(self.code.instructions)
+
+    def constant(self, value):
+        # 1, 1.0, True and 0.0, -0.0 compare equal, so the pool is keyed on type and repr
+        key = (type(value), repr(value))
+        if key not in self.constant_index:
+            self.constant_index[key] = len(self.code.constants)
+            self.code.constants.append(value)
+        return self.constant_index[key]
+
+    def slot(self, node):
+        # names are only kept for the disassembly, instructions use the resolved slots
+        names = self.code.names
+        names.extend([None] * (node.slot + 1 - len(names)))
+        names[node.slot] = node.name
+        return node.slot
+
+    def bound(self, node):
+        # a variable the fused instructions may read without checking it is defined
+        return type(node).__name__ == 'Variable' and node.bound
+
+    ### Conditions ###
+
+    def compile_jump(self, condition, when):
+        # emits a jump taken when the truth of condition equals `when`, returns the positions to patch
+        if type(condition).__name__ == 'Comparison' and self.bound(condition.left) \
+                and type(condition.right).__name__ == 'Number':
+            op = COMPARE_NAME_CONST_JUMP_IF_TRUE if when else COMPARE_NAME_CONST_JUMP_IF_FALSE
+            operands = [self.slot(condition.left), self.constant(condition.right.value), comparisons.index(condition.operation)]
+            return [self.emit_jump(op, *operands)]
+
+        if type(condition).__name__ == 'Comparison' and self.bound(condition.right):
+            self.compile(condition.left)
+            op = COMPARE_NAME_JUMP_IF_TRUE if when else COMPARE_NAME_JUMP_IF_FALSE
+            return [self.emit_jump(op, self.slot(condition.right), comparisons.index(condition.operation))]
+
+        if type(condition).__name__ == 'Comparison':
+            self.compile(condition.left)
+            self.compile(condition.right)
+            op = COMPARE_JUMP_IF_TRUE if when else COMPARE_JUMP_IF_FALSE
+            return [self.emit_jump(op, comparisons.index(condition.operation))]
+
+        if self.bound(condition):
+            return [self.emit_jump(NAME_JUMP_IF_TRUE if when else NAME_JUMP_IF_FALSE, self.slot(condition))]
+
+        if type(condition).__name__ == 'Negation':
+            return self.compile_jump(condition.expr, not when)
+
+        if type(condition).__name__ in ['Conjunction', 'Disjunction']:
+            # andalso short-circuits on false, orelse on true
+            short = type(condition).__name__ == 'Disjunction'
+
+            if when == short:
+                return self.compile_jump(condition.left, when) + self.compile_jump(condition.right, when)
+
+            skip = self.compile_jump(condition.left, short)
+            jumps = self.compile_jump(condition.right, when)
+            for position in skip:
+                self.patch(position)
+            return jumps
+
+        self.compile(condition)
+        return [self.emit_jump(POP_JUMP_IF_TRUE if when else POP_JUMP_IF_FALSE)]
+
+    ### Statements ###
+
+    def compile_Block(self, node):
+        if node.statements:
+            for statement in node.statements:
+                self.compile(statement)
+
+    def compile_WhileStatement(self, node):
+        for slot in node.invariant_slots:
+            self.emit(STORE_NAME_CONST, slot, self.constant(undefined))
+
+        # the condition sits after the body so every iteration costs a single jump
+        entry = self.emit_jump(JUMP)
+        body = self.here()
+        self.emit(TICK)
+        self.compile(node.block)
+        self.patch(entry)
+
+        for position in self.compile_jump(node.condition, True):
+            self.patch(position, body)
+
+    def compile_IfStatement(self, node):
+        skip = self.compile_jump(node.condition, False)
+        self.compile(node.block)
+
+        for position in skip:
+            self.patch(position)
+
+    def compile_IfElseStatement(self, node):
+        otherwise = self.compile_jump(node.condition, False)
+        self.compile(node.if_block)
+        end = self.emit_jump(JUMP)
+
+        for position in otherwise:
+            self.patch(position)
+
+        self.compile(node.else_block)
+        self.patch(end)
+
+    def compile_AssignStatement(self, node):
+        lvalue, rvalue = node.lvalue, node.rvalue
+
+        if type(lvalue).__name__ == 'ListStringIndexing' and self.bound(lvalue.expr):
+            self.compile(lvalue.index)
+            self.compile(rvalue)
+            self.emit(STORE_INDEX_NAME, self.slot(lvalue.expr))
+            return
+
+        if type(lvalue).__name__ == 'ListStringIndexing':
+            self.compile(lvalue.expr)
+            self.compile(lvalue.index)
+            self.compile(rvalue)
+            self.emit(STORE_INDEX)
+            return
+
+        if type(rvalue).__name__ == 'BinaryOperation' and rvalue.operation in ['+', '-'] \
+                and self.bound(rvalue.left) and rvalue.left.name == lvalue.name \
+                and type(rvalue.right).__name__ == 'Number':
+            op = STORE_NAME_ADD_CONST if rvalue.operation == '+' else STORE_NAME_SUBTRACT_CONST
+            self.emit(op, self.slot(lvalue), self.constant(rvalue.right.value))
+            return
+
+        if type(rvalue).__name__ in ['Number', 'String', 'Boolean', 'Constant']:
+            self.emit(STORE_NAME_CONST, self.slot(lvalue), self.constant(rvalue.parse()))
+            return
+
+        self.compile(rvalue)
+        self.emit(STORE_NAME, self.slot(lvalue))
+
+    def compile_PrintStatement(self, node):
+        self.compile(node.expr)
+        self.emit(PRINT)
+
+    ### Expressions ###
+
+    def compile_Variable(self, node):
+        self.emit(LOAD_NAME if node.bound else LOAD_NAME_CHECKED, self.slot(node))
+
+    def compile_Invariant(self, node):
+        kept = self.emit_jump(LOAD_INVARIANT, self.slot(node))
+        self.compile(node.expr)
+        self.emit(STORE_INVARIANT, node.slot)
+        self.patch(kept)
+
+    def compile_Number(self, node):
+        self.emit(LOAD_CONST, self.constant(node.value))
+
+    def compile_Boolean(self, node):
+        self.emit(LOAD_CONST, self.constant(node.parse()))
+
+    def compile_String(self, node):
+        self.emit(LOAD_CONST, self.constant(node.parse()))
+
+    def compile_Constant(self, node):
+        self.emit(LOAD_CONST, self.constant(node.value))
+
+    def compile_BooleanExpression(self, node):
+        self.compile(node.expr)
+
+    def compile_Negation(self, node):
+        self.compile(node.expr)
+        self.emit(UNARY_NOT)
+
+    def compile_Conjunction(self, node):
+        self.compile(node.left)
+        end = self.emit_jump(JUMP_IF_FALSE_OR_POP)
+        self.compile(node.right)
+        self.patch(end)
+
+    def compile_Disjunction(self, node):
+        self.compile(node.left)
+        end = self.emit_jump(JUMP_IF_TRUE_OR_POP)
+        self.compile(node.right)
+        self.patch(end)
+
+    def compile_Comparison(self, node):
+        self.compile(node.left)
+        self.compile(node.right)
+        self.emit(COMPARE_OP, comparisons.index(node.operation))
+
+    def compile_BinaryOperation(self, node):
+        if node.operation in ['+', '-'] and self.bound(node.left) and type(node.right).__name__ == 'Number':
+            op = ADD_NAME_CONST if node.operation == '+' else SUBTRACT_NAME_CONST
+            self.emit(op, self.slot(node.left), self.constant(node.right.value))
+            return
+
+        self.compile(node.left)
+        self.compile(node.right)
+        self.emit(binary_opcodes[node.operation])
+
+    def compile_UnaryMinus(self, node):
+        if type(node.expr).__name__ == 'Number':
+            self.emit(LOAD_CONST, self.constant(-node.expr.value))
+            return
+
+        self.compile(node.expr)
+        self.emit(UNARY_NEGATIVE)
+
+    def compile_ListConstruct(self, node):
+        self.compile(node.left)
+        self.compile(node.right)
+        self.emit(CONS)
+
+    def compile_Membership(self, node):
+        self.compile(node.element)
+        self.compile(node.collection)
+        self.emit(CONTAINS)
+
+    def compile_TupleIndexing(self, node):
+        self.compile(node.expr)
+        self.emit(TUPLE_INDEX, node.index.value)
+
+    def compile_ListStringIndexing(self, node):
+        if self.bound(node.expr) and self.bound(node.index):
+            self.emit(INDEX_NAME_NAME, self.slot(node.expr), self.slot(node.index))
+            return
+
+        self.compile(node.expr)
+        self.compile(node.index)
+        self.emit(INDEX)
+
+    def compile_List(self, node):
+        for element in node.lst:
+            self.compile(element)
+        self.emit(BUILD_LIST, len(node.lst))
+
+    def compile_ConstantList(self, node):
+        self.emit(LOAD_LIST_CONST, self.constant(node.values))
+
+    def compile_Tuple(self, node):
+        for element in node.tup:
+            self.compile(element)
+        self.emit(BUILD_TUPLE, len(node.tup))
+
+jumps = [
+    JUMP, POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+    COMPARE_JUMP_IF_FALSE, COMPARE_JUMP_IF_TRUE,
+    COMPARE_NAME_CONST_JUMP_IF_FALSE, COMPARE_NAME_CONST_JUMP_IF_TRUE,
+    COMPARE_NAME_JUMP_IF_FALSE, COMPARE_NAME_JUMP_IF_TRUE, NAME_JUMP_IF_FALSE, NAME_JUMP_IF_TRUE,
+    LOAD_INVARIANT
+]
+
+def thread_jumps(instructions):
+    # nested if/else blocks end in jumps to jumps, send them straight to the final destination
+    pc = 0
+
+    while pc < len(instructions):
+        op = instructions[pc]
+        if op in jumps:
+            target = pc + arity[op]
+            seen = set()
+            while instructions[instructions[target]] == JUMP and instructions[target] not in seen:
+                seen.add(instructions[target])
+                instructions[target] = instructions[instructions[target] + 1]
+        pc += 1 + arity[op]
+
+def compile_program(block):
+    compiler = Compiler()
+    compiler.compile(block)
+    compiler.emit(HALT)
+    thread_jumps(compiler.code.instructions)
+    return compiler.code
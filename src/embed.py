@@ -0,0 +1,83 @@
+# runs sbml programs inside the calling process, for hosts running many of them. nothing is
+# printed and the process never ends: the output comes back with the bindings, and errors raise
+#
+#   result = run('{ x = n * 2; print(x); }', {'n': 21})
+#   result.output     '42\n'
+#   result.bindings   {'n': 21, 'x': 42}
+#
+# a source that doesn't parse raises SbmlSyntaxError, a program going wrong while it runs raises
+# SbmlSemanticError, whose output is what it printed before. both are SbmlErrors, with the
+# message the command line prints. going over a limit raises ResourceLimit, as it does anywhere
+#
+# in an asyncio program, run_async runs scripts as coroutines that let the other tasks of the
+# event loop run every so often, so any number of them share one thread:
+#
+#   result = await run_async('{ i = 0; while (i < 1000000) { i = i + 1; } }')
+#   result = await asyncio.wait_for(run_async(source), 2.0)
+
+# system imports
+import collections
+import threading
+
+# internal imports
+from utils import SbmlError, SbmlSyntaxError, SbmlSemanticError, ResourceLimit
+from program import Program, default_engine, default_every
+from sinks import CaptureSink
+from sbml import parser
+
+# the programs parsed last, by source, so a source run again is not parsed again
+cache_size = 256
+programs = collections.OrderedDict()
+programs_lock = threading.Lock()
+
+class Result():
+    def __init__(self, output, bindings):
+        self.output = output
+        self.bindings = bindings
+
+    def __repr__(self):
+        return 'Result(output={!r}, bindings={!r})'.format(self.output, self.bindings)
+
+def compile(source):
+    # the program of source, parsed once for as long as it is among the last cache_size run
+    with programs_lock:
+        program = programs.get(source)
+        if program is not None:
+            programs.move_to_end(source)
+            return program
+
+    program = parser.parse(source)
+
+    with programs_lock:
+        programs[source] = program
+        if len(programs) > cache_size:
+            programs.popitem(last=False)
+    return program
+
+def run(source, env = None, engine = default_engine, limits = None):
+    # source is the text of a program, or a Program already parsed. env holds the bindings it
+    # starts from and is left as it is, the bindings of the result include them
+    program = source if isinstance(source, Program) else compile(source)
+
+    lines = []
+    try:
+        bindings = program.execute(env, engine, limits, CaptureSink(lines))
+    except SbmlError as error:
+        error.output = ''.join(line + '\n' for line in lines)
+        raise
+
+    return Result(''.join(line + '\n' for line in lines), bindings)
+
+async def run_async(source, env = None, limits = None, every = default_every):
+    # run for asyncio, on the tree walker: after every `every` statements or loop iterations the
+    # event loop gets to run its other tasks. cancelling the task stops the script there
+    program = source if isinstance(source, Program) else compile(source)
+
+    lines = []
+    try:
+        bindings = await program.execute_async(env, limits, CaptureSink(lines), every)
+    except SbmlError as error:
+        error.output = ''.join(line + '\n' for line in lines)
+        raise
+
+    return Result(''.join(line + '\n' for line in lines), bindings)
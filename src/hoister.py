@@ -0,0 +1,155 @@
+# internal imports
+from ast import *
+from resolver import operands
+
+# loop-invariant code motion, run on the optimized program before the resolver. an expression
+# of a while loop is invariant when no variable it reads is assigned anywhere in the loop,
+# nested loops included, and, when the loop assigns list elements, it reads no element either.
+# the largest invariant expressions that do any work become Invariant nodes: each is computed
+# where it first runs after the loop starts and kept for the rest of the loop, in a slot of
+# its own. nothing is computed earlier than it was, so an expression that fails still fails
+# at the same point, after the same output, and one the loop never reaches never runs.
+#
+# loops are rewritten outermost first, an invariant of an outer loop is one of every loop
+# inside it too, and is kept across all their runs
+
+# expressions reading the elements of lists, which element assignments change
+element_reads = ['ListStringIndexing', 'Membership', 'Comparison']
+
+# expressions building a new list every time they run
+list_builds = ['List', 'ConstantList', 'ListConstruct']
+
+# expressions cheaper to evaluate than to look up
+leaves = ['Variable', 'Number', 'String', 'Boolean', 'Constant', 'Invariant']
+
+class Loop():
+    def __init__(self, node):
+        self.node = node
+
+        # variables assigned anywhere in the loop, and whether it assigns list elements
+        self.assigned = set()
+        self.elements = False
+        self.find_assignments(node.block)
+
+    def find_assignments(self, block):
+        for node in block.statements or []:
+            kind = type(node).__name__
+
+            if kind == 'AssignStatement' and type(node.lvalue).__name__ == 'ListStringIndexing':
+                self.elements = True
+            elif kind == 'AssignStatement':
+                self.assigned.add(node.lvalue.name)
+            elif kind == 'IfElseStatement':
+                self.find_assignments(node.if_block)
+                self.find_assignments(node.else_block)
+            elif kind in ['IfStatement', 'WhileStatement']:
+                self.find_assignments(node.block)
+            elif kind == 'Block':
+                self.find_assignments(node)
+
+class Hoister():
+    def __init__(self):
+        # invariants made so far, each gets the next name
+        self.count = 0
+
+    def block(self, block):
+        # rewrites every loop in the block
+        for node in block.statements or []:
+            kind = type(node).__name__
+
+            if kind == 'WhileStatement':
+                self.rewrite(node, Loop(node))
+                self.block(node.block)
+            elif kind == 'IfStatement':
+                self.block(node.block)
+            elif kind == 'IfElseStatement':
+                self.block(node.if_block)
+                self.block(node.else_block)
+            elif kind == 'Block':
+                self.block(node)
+
+    def rewrite(self, node, loop):
+        # hoists the invariants of loop out of the condition and body of a loop inside it, or of
+        # the loop itself
+        node.condition = self.root(node.condition, loop)
+        self.rewrite_block(node.block, loop)
+
+    def rewrite_block(self, block, loop):
+        for node in block.statements or []:
+            kind = type(node).__name__
+
+            if kind == 'WhileStatement':
+                self.rewrite(node, loop)
+            elif kind == 'IfStatement':
+                node.condition = self.root(node.condition, loop)
+                self.rewrite_block(node.block, loop)
+            elif kind == 'IfElseStatement':
+                node.condition = self.root(node.condition, loop)
+                self.rewrite_block(node.if_block, loop)
+                self.rewrite_block(node.else_block, loop)
+            elif kind == 'Block':
+                self.rewrite_block(node, loop)
+            elif kind == 'AssignStatement':
+                if type(node.lvalue).__name__ == 'ListStringIndexing':
+                    node.lvalue.expr = self.root(node.lvalue.expr, loop)
+                    node.lvalue.index = self.root(node.lvalue.index, loop)
+                node.rvalue = self.root(node.rvalue, loop)
+            elif kind == 'PrintStatement':
+                node.expr = self.root(node.expr, loop)
+
+    def root(self, node, loop):
+        node, invariant = self.expression(node, loop)
+        return self.hoist(node, loop) if invariant else node
+
+    def expression(self, node, loop):
+        # returns node with the invariants inside it hoisted, and whether it is invariant itself.
+        # an invariant node is left for its parent to hoist, as part of something larger
+        kind = type(node).__name__
+
+        if kind == 'Variable':
+            return node, node.name not in loop.assigned
+        if kind in leaves:
+            return node, True
+
+        if kind == 'List':
+            node.lst = self.children(node.lst, loop, False)[0]
+            return node, False
+        if kind == 'Tuple':
+            elements, invariant = self.children(node.tup, loop, True)
+            node.tup = tuple(elements)
+            return node, invariant
+
+        fields = operands.get(kind, [])
+        invariant = kind not in list_builds and not (loop.elements and kind in element_reads)
+        children, invariant = self.children([getattr(node, field) for field in fields], loop, invariant)
+        for field, child in zip(fields, children):
+            setattr(node, field, child)
+        return node, invariant
+
+    def children(self, nodes, loop, invariant):
+        # the children of an expression, and whether it is invariant, given whether it would be
+        # with invariant children. unless it is, the invariant children are hoisted on their own
+        results = []
+        for node in nodes:
+            results.append(self.expression(node, loop))
+            invariant = invariant and results[-1][1]
+
+        if invariant:
+            return [child for child, _ in results], True
+        return [self.hoist(child, loop) if child_invariant else child for child, child_invariant in results], False
+
+    def hoist(self, node, loop):
+        if type(node).__name__ in leaves:
+            return node
+
+        invariant = Invariant(expr=node, name='${}'.format(self.count))
+        self.count += 1
+        loop.node.invariants.append(invariant.name)
+        if hasattr(node, 'lineno'):
+            invariant.lineno = node.lineno
+            invariant.lexpos = node.lexpos
+        return invariant
+
+def hoist(block):
+    Hoister().block(block)
+    return block
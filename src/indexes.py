@@ -0,0 +1,78 @@
+# hash indexes for `in` on large lists. a list tested for membership a second time gets an
+# index: a Counter of its elements, so later tests are a dict lookup instead of a scan. element
+# assignment keeps the counts up to date, and nothing else can change a list in place. every
+# run has its own Indexes, in its frame, remembering the last few large lists it was asked about.
+# the engines test what is not a list of min_size elements or more themselves, when they can.
+# packed lists have a fast search of their own
+#
+# an index only answers for elements that hash. a list holding one that doesn't is never
+# indexed, and an element that doesn't hash is always looked for with a scan. sbml values hash
+# consistently with ==, so both ways find the same elements
+
+# system imports
+from collections import Counter
+
+# lists shorter than this are always scanned
+min_size = 32
+
+# large lists remembered at once, the oldest is forgotten first
+capacity = 16
+
+class Indexes():
+    __slots__ = ['lists']
+
+    def __init__(self):
+        # id of a list to [the list, its Counter]. the Counter is None until the list is tested a
+        # second time, and False when the list holds an element that doesn't hash. holding the
+        # list keeps its id from being reused while it is remembered
+        self.lists = {}
+
+    def contains(self, element, collection):
+        # element in collection, a TypeError when collection can't contain anything
+        if type(collection) is not list or len(collection) < min_size:
+            return element in collection
+
+        entry = self.lists.get(id(collection))
+        if entry is None:
+            if len(self.lists) >= capacity:
+                del self.lists[next(iter(self.lists))]
+            self.lists[id(collection)] = [collection, None]
+            return element in collection
+
+        counts = entry[1]
+        if counts is None:
+            try:
+                counts = entry[1] = Counter(collection)
+            except TypeError:
+                counts = entry[1] = False
+        if counts is False:
+            return element in collection
+
+        try:
+            return element in counts
+        except TypeError:
+            return element in collection
+
+    def store(self, collection, index, value):
+        # collection[index] = value, for when some list is remembered
+        entry = self.lists.get(id(collection))
+        if entry is None or entry[1] is None:
+            collection[index] = value
+            return
+        if entry[1] is False:
+            # the element that didn't hash may be the one replaced
+            del self.lists[id(collection)]
+            collection[index] = value
+            return
+
+        counts = entry[1]
+        old = collection[index]
+        collection[index] = value
+        try:
+            counts[value] += 1
+        except TypeError:
+            del self.lists[id(collection)]
+            return
+        counts[old] -= 1
+        if not counts[old]:
+            del counts[old]
@@ -1,12 +1,11 @@
 # system imports
+import re
 import sys
+import threading
 
 # internal imports
 from utils import *
 
-# external imports
-import ply.lex as lex
-
 reserved = {
     'mod': 'MODULUS',
     'div': 'INTEGER_DIVISION',
@@ -92,20 +91,33 @@ t_ELSE = r'else'
 # looping
 t_WHILE = r'while'
 
+def decode_string(text):
+    # literals without escapes are taken as they are, the rest are decoded the way python reads
+    # them. python rejects a newline typed inside the quotes and malformed escapes like \x, both
+    # are kept as written
+    if '\\' not in text:
+        return text[1:-1]
+    try:
+        return eval(text.replace('\n', '\\n'))
+    except SyntaxError:
+        return text[1:-1]
+
 def t_STRING(t):
     r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\''
-    t.value = t.value
+    t.value = decode_string(t.value)
     return t
 
 # rule for reals
 def t_REAL(t):
     r'(\d*\.\d+|\d+\.\d*)(e-?\d+)?'
-    t.value = eval(t.value)
+    t.value = float(t.value)
     return t
 
 def t_VARIABLE(t):
     r'[a-zA-Z][a-zA-Z0-9_]*'
     t.type = reserved.get(t.value, 'VARIABLE') # check for reserved words
+    if t.type in ['BOOLEAN_TRUE', 'BOOLEAN_FALSE']:
+        t.value = t.type == 'BOOLEAN_TRUE'
     return t
 
 def t_INTEGER(t):
@@ -135,21 +147,115 @@ def t_error(t):
     # print("Illegal character '%s'" % t.value[0])
     t.lexer.skip(1)
 
-# Build the lexer
-lexer = lex.lex()
+# the lexer is built on first use, from the shipped lextab.py, so importing this module doesn't load PLY.
+# parses use clones of it, it is never fed input itself
+lexer = None
+build_lock = threading.Lock()
+
+def build():
+    global lexer
+
+    with build_lock:
+        if lexer is None:
+            # external imports
+            import ply.lex as lex
+            lexer = lex.lex(module=sys.modules[__name__], optimize=1, lextab='lextab')
+
+    return lexer
+
+### Streaming ###
+
+# a token ending closer than this to the end of the text read so far might still grow, or
+# lex differently, once more text arrives: 12 followed by 3, 1.5 followed by e-3, < followed by =.
+# strings, the only tokens of unbounded length, are checked for their closing quote instead
+lookahead = 16
+
+chunk_size = 1 << 16
+
+string = re.compile(t_STRING.__doc__)
+
+def tokenize(fd, size = chunk_size, scanner = None):
+    # yields the tokens of a file, reading it size characters at a time. only the text from the
+    # start of the current token on is kept, so memory doesn't grow with the file. token
+    # positions count from the start of the file, like they would if it was lexed whole.
+    # scanner is a fresh PLY lexer clone, or anything with the same input/token interface
+    scanner = scanner or build().clone()
+    scanner.lineno = 1
+
+    window = ''
+    base = 0
+    pos = 0
+    eof = False
+    starved = False
+
+    while True:
+        if not eof and (starved or len(window) - pos < lookahead):
+            chunk = fd.read(size)
+            eof = not chunk
+            window = window[pos:] + chunk
+            base += pos
+            pos = 0
+            starved = False
+            scanner.input(window)
+            continue
+
+        # whitespace and newlines are skipped here, so a run of them split across chunks is counted once
+        while pos < len(window) and window[pos] in ' \t\n':
+            if window[pos] == '\n':
+                scanner.lineno += 1
+            pos += 1
+
+        if pos == len(window):
+            if eof:
+                return
+            starved = True
+            continue
+
+        if not eof and window[pos] in '"\'' and not string.match(window, pos):
+            # the closing quote hasn't been read yet
+            starved = True
+            continue
+
+        lineno = scanner.lineno
+        scanner.lexpos = pos
+        tok = scanner.token()
+
+        if tok is not None and tok.lexpos > pos:
+            # pos holds an illegal character. it is skipped, like t_error does, and the text
+            # after it goes through the checks above again
+            scanner.lineno = lineno
+            pos += 1
+            continue
+
+        if not eof and (tok is None or len(window) - scanner.lexpos < lookahead):
+            # lexed again from pos once there is more text
+            scanner.lineno = lineno
+            starved = True
+            continue
+
+        if tok is None:
+            return
+
+        pos = scanner.lexpos
+        tok.lexpos += base
+        yield tok
+
+class TokenStream():
+    # gives the parser tokens from tokenize(), it only ever calls token()
+    def __init__(self, fd, size = chunk_size, scanner = None):
+        self.tokens = tokenize(fd, size, scanner)
+
+    def token(self):
+        return next(self.tokens, None)
 
 def main(args):
     if len(args) == 2:
         with open(sys.argv[1]) as fd:
-            lexer.input(fd.read())
+            for tok in tokenize(fd):
+                print(tok)
 
-        while True:
-            tok = lexer.token()
-            if not tok:
-                break
-            print(tok)
-        
     elif len(sys.argv) == 1:
+        lexer = build().clone()
         while True:
             lexer.input(input())
             tok = lexer.token()
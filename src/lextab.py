@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ADDITION', 'ASSIGNMENT', 'BOOLEAN_FALSE', 'BOOLEAN_TRUE', 'COMMA', 'CONJUNCTION', 'CONS', 'DISJUNCTION', 'DIVISION', 'ELSE', 'EQUAL_TO', 'EXPONENTIATION', 'GREATER_THAN', 'GREATER_THAN_EQUAL', 'HASHTAG', 'IF', 'INTEGER', 'INTEGER_DIVISION', 'LBRACE', 'LBRACKET', 'LESS_THAN', 'LESS_THAN_EQUAL', 'LPAREN', 'MEMBERSHIP', 'MODULUS', 'MULTIPLICATION', 'NEGATION', 'NOT_EQUAL_TO', 'PRINT', 'RBRACE', 'RBRACKET', 'REAL', 'RPAREN', 'SEMICOLON', 'STRING', 'SUBTRACTION', 'VARIABLE', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_STRING>"(?:[^"\\\\]|\\\\.)*"|\\\'(?:[^\\\'\\\\]|\\\\.)*\\\')|(?P<t_REAL>(\\d*\\.\\d+|\\d+\\.\\d*)(e-?\\d+)?)|(?P<t_VARIABLE>[a-zA-Z][a-zA-Z0-9_]*)|(?P<t_INTEGER>\\d+)|(?P<t_BOOLEAN_FALSE>False)|(?P<t_BOOLEAN_TRUE>True)|(?P<t_newline>\\n+)|(?P<t_CONJUNCTION>andalso)|(?P<t_DISJUNCTION>orelse)|(?P<t_PRINT>print)|(?P<t_WHILE>while)|(?P<t_CONS>\\:\\:)|(?P<t_ELSE>else)|(?P<t_EXPONENTIATION>\\*\\*)|(?P<t_INTEGER_DIVISION>div)|(?P<t_MODULUS>mod)|(?P<t_NEGATION>not)|(?P<t_ADDITION>\\+)|(?P<t_EQUAL_TO>==)|(?P<t_GREATER_THAN_EQUAL>>=)|(?P<t_HASHTAG>\\#)|(?P<t_IF>if)|(?P<t_LBRACKET>\\[)|(?P<t_LESS_THAN_EQUAL><=)|(?P<t_LPAREN>\\()|(?P<t_MEMBERSHIP>in)|(?P<t_MULTIPLICATION>\\*)|(?P<t_NOT_EQUAL_TO><>)|(?P<t_RBRACKET>\\])|(?P<t_RPAREN>\\))|(?P<t_ASSIGNMENT>=)|(?P<t_COMMA>,)|(?P<t_DIVISION>/)|(?P<t_GREATER_THAN>>)|(?P<t_LBRACE>{)|(?P<t_LESS_THAN><)|(?P<t_RBRACE>})|(?P<t_SEMICOLON>;)|(?P<t_SUBTRACTION>-)', [None, ('t_STRING', 'STRING'), ('t_REAL', 'REAL'), None, None, ('t_VARIABLE', 'VARIABLE'), ('t_INTEGER', 'INTEGER'), ('t_BOOLEAN_FALSE', 'BOOLEAN_FALSE'), ('t_BOOLEAN_TRUE', 'BOOLEAN_TRUE'), ('t_newline', 'newline'), (None, 'CONJUNCTION'), (None, 'DISJUNCTION'), (None, 'PRINT'), (None, 'WHILE'), (None, 'CONS'), (None, 'ELSE'), (None, 'EXPONENTIATION'), (None, 'INTEGER_DIVISION'), (None, 'MODULUS'), (None, 'NEGATION'), (None, 'ADDITION'), (None, 'EQUAL_TO'), (None, 'GREATER_THAN_EQUAL'), (None, 'HASHTAG'), (None, 'IF'), (None, 'LBRACKET'), (None, 'LESS_THAN_EQUAL'), (None, 'LPAREN'), (None, 'MEMBERSHIP'), (None, 'MULTIPLICATION'), (None, 'NOT_EQUAL_TO'), (None, 'RBRACKET'), (None, 'RPAREN'), (None, 'ASSIGNMENT'), (None, 'COMMA'), (None, 'DIVISION'), (None, 'GREATER_THAN'), (None, 'LBRACE'), (None, 'LESS_THAN'), (None, 'RBRACE'), (None, 'SEMICOLON'), (None, 'SUBTRACTION')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,61 @@
+# execution budgets. a run given Limits gets its own Budget, which every engine charges once
+# per loop iteration and asks before computing an integer power. going over any limit raises
+# ResourceLimit, which the command line reports as RESOURCE LIMIT. runs without limits have no
+# budget and the engines skip the metering entirely
+
+# system imports
+import math
+import time
+
+# internal imports
+from utils import *
+
+# iterations between two looks at the clock
+interval = 1024
+
+class Limits():
+    # None leaves a limit off
+    def __init__(self, iterations = None, seconds = None, power_bits = None):
+        self.iterations = iterations
+        self.seconds = seconds
+        self.power_bits = power_bits
+
+    def budget(self):
+        return Budget(self)
+
+class Budget():
+    def __init__(self, limits):
+        self.limits = limits
+        self.count = 0
+        self.deadline = time.perf_counter() + limits.seconds if limits.seconds is not None else None
+        self.next = 0
+        self.check()
+
+    def tick(self):
+        # one loop iteration, the clock and the iteration limit are only looked at every so often
+        self.count += 1
+        if self.count >= self.next:
+            self.check()
+
+    def check(self):
+        limits = self.limits
+        if limits.iterations is not None and self.count > limits.iterations:
+            raise ResourceLimit('more than {} loop iterations'.format(limits.iterations))
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise ResourceLimit('ran longer than {} seconds'.format(limits.seconds))
+
+        self.next = self.count + interval
+        if limits.iterations is not None:
+            self.next = min(self.next, limits.iterations + 1)
+
+    def power(self, base, exponent):
+        bits = self.limits.power_bits
+        if bits is not None and type(base) is int and type(exponent) is int and exponent > 0 and abs(base) > 1 \
+                and exponent * math.log2(abs(base)) > bits:
+            raise ResourceLimit('{} ** {} has more than {} bits'.format(base, exponent, bits))
+        return base ** exponent
+
+def power(base, exponent, budget):
+    if budget is None:
+        return base ** exponent
+    return budget.power(base, exponent)
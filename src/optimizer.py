@@ -0,0 +1,215 @@
+# system imports
+import operator
+
+# internal imports
+from ast import *
+
+# folds constant subtrees into literals and drops branches that can never run. anything
+# whose evaluation would fail is left in place so the error still happens at runtime,
+# and only if the program actually reaches it.
+
+binary_operations = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    'div': operator.floordiv,
+    'mod': operator.mod,
+    '**': operator.pow
+}
+
+comparisons = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '<>': operator.ne
+}
+
+# folded strings and tuples larger than this are left to the runtime
+max_size = 4096
+
+class NotConstant(Exception):
+    pass
+
+def is_constant(node):
+    return type(node).__name__ in ['Number', 'Constant']
+
+def literal(value):
+    if type(value) in [int, float]:
+        return Number(value=value)
+    return Constant(value=value)
+
+def optimize(node):
+    optimized = optimizers[type(node).__name__](node)
+    if optimized is not None and not hasattr(optimized, 'lineno') and hasattr(node, 'lineno'):
+        # nodes built here stand where the node they replace was
+        optimized.lineno = node.lineno
+        optimized.lexpos = node.lexpos
+    return optimized
+
+def evaluate(function, *operands):
+    # runs a constant operation, raising NotConstant when it would fail at runtime, with one of
+    # the errors of ast.errors
+    try:
+        return function(*operands)
+    except errors:
+        raise NotConstant()
+
+def fold(node, function, *operands):
+    if not all(is_constant(operand) for operand in operands):
+        return node
+    try:
+        return literal(evaluate(function, *[operand.value for operand in operands]))
+    except NotConstant:
+        return node
+
+### Statements ###
+
+def optimize_Block(node):
+    statements = []
+    for statement in node.statements or []:
+        statement = optimize(statement)
+        if statement is not None:
+            statements.append(statement)
+    node.statements = statements
+    return node
+
+def optimize_WhileStatement(node):
+    node.condition = optimize(node.condition)
+    if is_constant(node.condition) and not node.condition.value:
+        return None
+    node.block = optimize(node.block)
+    return node
+
+def optimize_IfStatement(node):
+    node.condition = optimize(node.condition)
+    if is_constant(node.condition):
+        return optimize(node.block) if node.condition.value else None
+    node.block = optimize(node.block)
+    return node
+
+def optimize_IfElseStatement(node):
+    node.condition = optimize(node.condition)
+    if is_constant(node.condition):
+        return optimize(node.if_block if node.condition.value else node.else_block)
+    node.if_block = optimize(node.if_block)
+    node.else_block = optimize(node.else_block)
+    return node
+
+def optimize_AssignStatement(node):
+    if type(node.lvalue).__name__ == 'ListStringIndexing':
+        node.lvalue.expr = optimize(node.lvalue.expr)
+        node.lvalue.index = optimize(node.lvalue.index)
+    node.rvalue = optimize(node.rvalue)
+    return node
+
+def optimize_PrintStatement(node):
+    node.expr = optimize(node.expr)
+    return node
+
+### Expressions ###
+
+def optimize_String(node):
+    # literals become constants like every folded value, so the engines only look for one kind of node
+    return Constant(value=node.parse())
+
+def optimize_Boolean(node):
+    return Constant(value=node.parse())
+
+def optimize_BooleanExpression(node):
+    return optimize(node.expr)
+
+def optimize_Negation(node):
+    node.expr = optimize(node.expr)
+    return fold(node, operator.not_, node.expr)
+
+def optimize_Conjunction(node):
+    node.left = optimize(node.left)
+    node.right = optimize(node.right)
+    if is_constant(node.left):
+        # `a andalso b` is a when a is false and b otherwise
+        return node.right if node.left.value else node.left
+    return node
+
+def optimize_Disjunction(node):
+    node.left = optimize(node.left)
+    node.right = optimize(node.right)
+    if is_constant(node.left):
+        return node.left if node.left.value else node.right
+    return node
+
+def optimize_Comparison(node):
+    node.left = optimize(node.left)
+    node.right = optimize(node.right)
+    return fold(node, comparisons[node.operation], node.left, node.right)
+
+def optimize_BinaryOperation(node):
+    node.left = optimize(node.left)
+    node.right = optimize(node.right)
+    if is_constant(node.left) and is_constant(node.right) and not small(node.operation, node.left.value, node.right.value):
+        return node
+    return fold(node, binary_operations[node.operation], node.left, node.right)
+
+def small(operation, left, right):
+    # whether folding won't build a huge value the program might never even compute
+    if operation == '*' and type(left) in [str, tuple] and type(right) is int:
+        return len(left) * right <= max_size
+    if operation == '*' and type(right) in [str, tuple] and type(left) is int:
+        return len(right) * left <= max_size
+    if operation == '**' and type(left) is int and type(right) is int:
+        # a run with a power_bits limit may refuse any int power that grows, those are left for
+        # its budget to check, as they are when the operands are variables
+        return right <= 0 or abs(left) <= 1
+    return True
+
+def optimize_UnaryMinus(node):
+    node.expr = optimize(node.expr)
+    return fold(node, operator.neg, node.expr)
+
+def optimize_ListConstruct(node):
+    # lists are mutable, so a cons always builds a new one at runtime
+    node.left = optimize(node.left)
+    node.right = optimize(node.right)
+    return node
+
+def optimize_Membership(node):
+    node.element = optimize(node.element)
+    node.collection = optimize(node.collection)
+    return fold(node, lambda element, collection: element in collection, node.element, node.collection)
+
+def tuple_index(sequence, i):
+    if type(sequence) is not tuple or i < 1 or i > len(sequence):
+        raise NotConstant()
+    return sequence[i - 1]
+
+def index(sequence, i):
+    if type(i) is not int or i < 0 or i >= len(sequence):
+        raise NotConstant()
+    return sequence[i]
+
+def optimize_TupleIndexing(node):
+    node.expr = optimize(node.expr)
+    return fold(node, tuple_index, node.expr, node.index)
+
+def optimize_ListStringIndexing(node):
+    node.expr = optimize(node.expr)
+    node.index = optimize(node.index)
+    return fold(node, index, node.expr, node.index)
+
+def optimize_List(node):
+    node.lst = [optimize(element) for element in node.lst]
+    if node.lst and all(is_constant(element) for element in node.lst):
+        # not a Constant, the list is mutable and each evaluation needs its own
+        return ConstantList(values=tuple(element.value for element in node.lst))
+    return node
+
+def optimize_Tuple(node):
+    node.tup = tuple(optimize(element) for element in node.tup)
+    if all(is_constant(element) for element in node.tup):
+        return Constant(value=tuple(element.value for element in node.tup))
+    return node
+
+optimizers = {name[len('optimize_'):]: function for name, function in list(globals().items()) if name.startswith('optimize_')}
+optimizers.update({'Variable': lambda node: node, 'Number': lambda node: node, 'Constant': lambda node: node, 'ConstantList': lambda node: node})
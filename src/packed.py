@@ -0,0 +1,158 @@
+# packed lists. with packing on, every list literal or cons whose elements are all ints, or all
+# floats, builds a PackedList, which keeps them unboxed in an array.array: 8 bytes an element
+# instead of a pointer to an int or float object of its own. a PackedList behaves like the list
+# it stands for under every operator, prints the same, and unpacks itself into a plain list the
+# first time it is given an element that does not fit, so aliases of it see the change.
+#
+# packing is off unless asked for, with --packed-lists or SBML_PACKED_LISTS=1
+
+# system imports
+import array
+import os
+
+enabled = os.environ.get('SBML_PACKED_LISTS', '') not in ['', '0']
+
+# array type codes, and the type of the elements each one stores
+kinds = {'q': int, 'd': float}
+codes = {int: 'q', float: 'd'}
+
+def fits(value, kind):
+    # whether an array of kind stores value and gives back an equal one. nan is left out, a list
+    # finds it by identity and an array would box a new object every time
+    return type(value) is kind and (kind is int or value == value)
+
+class PackedList():
+    __slots__ = ['items']
+
+    # lists are mutable, so they don't hash
+    __hash__ = None
+
+    def __init__(self, items):
+        # an array.array, or a list once an element that does not fit was stored
+        self.items = items
+
+    def unpack(self):
+        if type(self.items) is not list:
+            self.items = self.items.tolist()
+        return self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __setitem__(self, index, value):
+        items = self.items
+        if type(items) is not list and fits(value, kinds[items.typecode]):
+            try:
+                items[index] = value
+                return
+            except OverflowError:
+                pass
+        self.unpack()[index] = value
+
+    def __contains__(self, value):
+        items = self.items
+        if type(items) is not list and fits(value, kinds[items.typecode]) and (type(value) is int or value != 0):
+            # look for the bytes of value, at an element boundary, rather than box every element.
+            # 0.0 and -0.0 are equal with different bytes, they take the slow way
+            try:
+                needle = array.array(items.typecode, [value]).tobytes()
+            except OverflowError:
+                return False
+            buffer = items.tobytes()
+            start = buffer.find(needle)
+            while start != -1 and start % items.itemsize:
+                start = buffer.find(needle, start + 1)
+            return start != -1
+        return value in items
+
+    def cons(self, element):
+        items = self.items
+        if type(items) is not list and fits(element, kinds[items.typecode]):
+            try:
+                return PackedList(array.array(items.typecode, [element]) + items)
+            except OverflowError:
+                pass
+        return pack([element] + list(items))
+
+    def __add__(self, other):
+        if type(other) is PackedList:
+            if type(self.items) is not list and type(other.items) is not list and self.items.typecode == other.items.typecode:
+                return PackedList(self.items + other.items)
+            other = other.items
+        elif type(other) is not list:
+            return NotImplemented
+        return pack(list(self.items) + list(other))
+
+    def __radd__(self, other):
+        if type(other) is not list:
+            return NotImplemented
+        return pack(other + list(self.items))
+
+    def __mul__(self, count):
+        try:
+            return PackedList(self.items * count)
+        except TypeError:
+            return NotImplemented
+
+    __rmul__ = __mul__
+
+    def compared(self, other, comparison):
+        if type(other) is PackedList:
+            other = other.items
+        elif type(other) is not list:
+            return NotImplemented
+        return comparison(list(self.items), list(other))
+
+    def __eq__(self, other):
+        return self.compared(other, lambda left, right: left == right)
+
+    def __ne__(self, other):
+        return self.compared(other, lambda left, right: left != right)
+
+    def __lt__(self, other):
+        return self.compared(other, lambda left, right: left < right)
+
+    def __le__(self, other):
+        return self.compared(other, lambda left, right: left <= right)
+
+    def __gt__(self, other):
+        return self.compared(other, lambda left, right: left > right)
+
+    def __ge__(self, other):
+        return self.compared(other, lambda left, right: left >= right)
+
+    def __repr__(self):
+        return repr(list(self.items))
+
+    __str__ = __repr__
+
+def pack(elements):
+    # elements, a list only the caller holds, packed when packing is on and they all fit one kind
+    if not enabled or not elements or type(elements[0]) not in codes:
+        return elements
+
+    kind = type(elements[0])
+    for element in elements:
+        if not fits(element, kind):
+            return elements
+
+    try:
+        return PackedList(array.array(codes[kind], elements))
+    except OverflowError:
+        return elements
+
+def cons(element, sequence):
+    # element :: sequence, a TypeError when sequence isn't a list
+    if type(sequence) is list:
+        if not sequence:
+            return pack([element])
+        return [element] + sequence
+    if type(sequence) is PackedList:
+        return sequence.cons(element)
+    raise TypeError
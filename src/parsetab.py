@@ -0,0 +1,114 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftSTRINGINTEGERREALleftDISJUNCTIONleftCONJUNCTIONleftNEGATIONleftLESS_THANLESS_THAN_EQUALGREATER_THANGREATER_THAN_EQUALEQUAL_TONOT_EQUAL_TOrightCONSleftMEMBERSHIPleftADDITIONSUBTRACTIONleftMULTIPLICATIONDIVISIONMODULUSINTEGER_DIVISIONrightEXPONENTIATIONrightUMINUSleftLBRACKETRBRACKETleftHASHTAGleftLPARENRPARENADDITION ASSIGNMENT BOOLEAN_FALSE BOOLEAN_TRUE COMMA CONJUNCTION CONS DISJUNCTION DIVISION ELSE EQUAL_TO EXPONENTIATION GREATER_THAN GREATER_THAN_EQUAL HASHTAG IF INTEGER INTEGER_DIVISION LBRACE LBRACKET LESS_THAN LESS_THAN_EQUAL LPAREN MEMBERSHIP MODULUS MULTIPLICATION NEGATION NOT_EQUAL_TO PRINT RBRACE RBRACKET REAL RPAREN SEMICOLON STRING SUBTRACTION VARIABLE WHILEstart : block\n    block : LBRACE RBRACE\n          | LBRACE statement RBRACE\n          | LBRACE statement block_tail RBRACE\n    \n    block_tail : statement block_tail\n               | empty\n    \n    statement : single_statement SEMICOLON\n              | conditional_statement\n              | loop_statement\n              | block\n    \n    single_statement : statement_assignable\n                     | statement_print\n    \n    conditional_statement : statement_if\n                          | statement_if_else\n    loop_statement : loop_statement_whilestatement_if : IF LPAREN boolean_argument RPAREN blockstatement_if_else : IF LPAREN boolean_argument RPAREN block ELSE blockloop_statement_while : WHILE LPAREN boolean_argument RPAREN blockstatement_assignable : lvalue ASSIGNMENT rvaluestatement_print : PRINT LPAREN rvalue RPAREN\n    lvalue : variable\n           | indexing_other\n    \n    rvalue : expression\n           | boolean_expression\n           | boolean_comparison\n    \n    boolean_expression : boolean_conjunction\n                       | boolean_disjunction\n                       | boolean_negation\n                       | boolean_membership\n                       | LPAREN boolean_expression RPAREN\n    boolean_conjunction : boolean_argument CONJUNCTION boolean_argumentboolean_disjunction : boolean_argument DISJUNCTION boolean_argumentboolean_negation : NEGATION boolean_argument\n    boolean_argument : boolean_comparison\n                     | boolean_membership\n                     | boolean_conjunction\n                     | boolean_disjunction\n                     | boolean_negation\n                     | expression\n    boolean_argument : LPAREN boolean_argument RPAREN\n    boolean_comparison : boolean\n                       | expression LESS_THAN expression\n                       | expression LESS_THAN_EQUAL expression\n                       | expression GREATER_THAN expression\n                       | expression GREATER_THAN_EQUAL expression\n                       | expression EQUAL_TO expression\n                       | expression NOT_EQUAL_TO expression\n                       | LPAREN boolean_comparison RPAREN\n    \n    boolean : BOOLEAN_TRUE\n            | BOOLEAN_FALSE\n    \n    expression : expression ADDITION expression\n               | expression SUBTRACTION expression\n               | expression MULTIPLICATION expression\n               | expression DIVISION expression\n               | expression INTEGER_DIVISION expression\n               | expression MODULUS expression\n               | expression EXPONENTIATION expression\n    expression : SUBTRACTION expression %prec UMINUSexpression : indexingexpression : tupleexpression : listexpression : STRINGexpression : LPAREN expression RPARENexpression : numberexpression : variableexpression : list_conslist_cons : expression CONS expressionboolean_membership : expression MEMBERSHIP expression\n    indexing : indexing_other\n             | indexing_tuple\n    indexing_tuple : HASHTAG INTEGER expression\n    indexing_other : expression LBRACKET expression RBRACKET\n                   | list LBRACKET expression RBRACKET\n    \n    list : LBRACKET expression list_tail RBRACKET\n         | LBRACKET RBRACKET\n    \n    list_tail : COMMA expression list_tail\n              | empty\n    tuple : LPAREN expression COMMA expression tuple_tail RPAREN\n    tuple_tail : COMMA expression tuple_tail\n               | empty\n    variable : VARIABLE\n    number : INTEGER\n           | REAL\n    empty :'
+    
+_lr_action_items = {'LBRACE':([0,3,4,5,7,8,9,12,13,14,36,37,40,64,123,124,144,145,149,151,],[3,3,-2,3,-8,-9,-10,-13,-14,-15,3,-3,-7,-4,3,3,-16,-18,3,-17,]),'$end':([1,2,4,37,64,],[0,-1,-2,-3,-4,]),'RBRACE':([3,4,5,7,8,9,12,13,14,36,37,38,39,40,63,64,144,145,151,],[4,-2,37,-8,-9,-10,-13,-14,-15,-84,-3,64,-6,-7,-5,-4,-16,-18,-17,]),'PRINT':([3,4,5,7,8,9,12,13,14,36,37,40,64,144,145,151,],[16,-2,16,-8,-9,-10,-13,-14,-15,16,-3,-7,-4,-16,-18,-17,]),'IF':([3,4,5,7,8,9,12,13,14,36,37,40,64,144,145,151,],[18,-2,18,-8,-9,-10,-13,-14,-15,18,-3,-7,-4,-16,-18,-17,]),'WHILE':([3,4,5,7,8,9,12,13,14,36,37,40,64,144,145,151,],[19,-2,19,-8,-9,-10,-13,-14,-15,19,-3,-7,-4,-16,-18,-17,]),'VARIABLE':([3,4,5,7,8,9,12,13,14,17,24,26,36,37,40,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,64,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,144,145,151,],[22,-2,22,-8,-9,-10,-13,-14,-15,22,22,22,22,-3,-7,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-4,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-16,-18,-17,]),'SUBTRACTION':([3,4,5,7,8,9,12,13,14,17,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,64,66,69,76,80,81,82,89,91,92,93,94,95,96,97,98,99,101,103,104,105,106,107,108,109,110,111,112,113,117,118,121,122,125,126,127,128,129,130,131,132,133,134,135,141,144,145,147,148,151,],[26,-2,26,-8,-9,-10,-13,-14,-15,26,-65,-69,-81,51,26,-61,26,-59,-60,-62,-64,-66,-70,-82,-83,26,-3,-7,26,26,51,-61,-65,-69,26,26,26,26,26,26,26,26,26,26,26,51,-75,26,-58,26,-4,51,26,26,-63,26,26,51,51,-51,-52,-53,-54,-55,-56,-57,51,26,51,51,26,26,26,26,26,26,26,26,51,26,26,51,51,-72,-74,51,-73,51,51,51,51,51,51,51,26,-16,-18,51,-78,-17,]),'STRING':([3,4,5,7,8,9,12,13,14,17,24,26,36,37,40,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,64,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,144,145,151,],[29,-2,29,-8,-9,-10,-13,-14,-15,29,29,29,29,-3,-7,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-4,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-16,-18,-17,]),'LPAREN':([3,4,5,7,8,9,12,13,14,16,17,18,19,24,26,36,37,40,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,64,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,144,145,151,],[17,-2,17,-8,-9,-10,-13,-14,-15,42,17,47,48,17,17,17,-3,-7,69,69,82,82,17,17,17,17,17,17,17,17,17,17,17,-4,112,82,17,82,17,17,17,17,17,17,17,17,112,82,82,17,-16,-18,-17,]),'LBRACKET':([3,4,5,7,8,9,12,13,14,17,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,64,66,69,76,80,81,82,89,91,92,93,94,95,96,97,98,99,101,103,104,105,106,107,108,109,110,111,112,113,117,118,121,122,125,126,127,128,129,130,131,132,133,134,135,141,144,145,147,148,151,],[24,-2,24,-8,-9,-10,-13,-14,-15,24,-65,-69,-81,49,24,60,24,-59,-60,-62,-64,-66,-70,-82,-83,24,-3,-7,24,24,49,60,-65,-69,24,24,24,24,24,24,24,24,24,24,24,49,-75,24,49,24,-4,49,24,24,-63,24,24,49,49,49,49,49,49,49,49,49,49,24,49,49,24,24,24,24,24,24,24,24,49,24,24,49,49,-72,-74,49,-73,49,49,49,49,49,49,49,24,-16,-18,49,-78,-17,]),'INTEGER':([3,4,5,7,8,9,12,13,14,17,24,26,35,36,37,40,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,64,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,144,145,151,],[33,-2,33,-8,-9,-10,-13,-14,-15,33,33,33,62,33,-3,-7,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-4,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-16,-18,-17,]),'REAL':([3,4,5,7,8,9,12,13,14,17,24,26,36,37,40,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,64,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,144,145,151,],[34,-2,34,-8,-9,-10,-13,-14,-15,34,34,34,34,-3,-7,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,-4,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,-16,-18,-17,]),'HASHTAG':([3,4,5,7,8,9,12,13,14,17,24,26,36,37,40,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,64,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,144,145,151,],[35,-2,35,-8,-9,-10,-13,-14,-15,35,35,35,35,-3,-7,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,-4,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,-16,-18,-17,]),'ELSE':([4,37,64,144,],[-2,-3,-4,149,]),'SEMICOLON':([6,10,11,22,27,28,29,30,31,32,33,34,44,45,46,59,61,65,66,67,68,70,71,72,73,74,77,78,80,84,85,86,87,88,89,92,93,94,95,96,97,98,99,104,119,120,125,126,128,129,130,131,132,133,134,135,136,137,138,139,140,148,],[40,-11,-12,-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,-19,-23,-24,-25,-26,-27,-28,-29,-41,-49,-50,-63,-34,-35,-36,-37,-38,-39,-51,-52,-53,-54,-55,-56,-57,-67,-71,-33,-20,-72,-74,-73,-42,-43,-44,-45,-46,-47,-68,-30,-48,-40,-31,-32,-78,]),'ASSIGNMENT':([15,20,21,22,125,128,],[41,-21,-22,-81,-72,-73,]),'ADDITION':([20,21,22,23,25,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,66,80,89,91,92,93,94,95,96,97,98,99,103,104,113,121,122,125,126,127,128,129,130,131,132,133,134,135,147,148,],[-65,-69,-81,50,-61,-59,-60,-62,-64,-66,-70,-82,-83,50,-61,-65,-69,50,-75,-58,50,-63,50,50,-51,-52,-53,-54,-55,-56,-57,50,50,50,50,50,50,-72,-74,50,-73,50,50,50,50,50,50,50,50,-78,]),'MULTIPLICATION':([20,21,22,23,25,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,66,80,89,91,92,93,94,95,96,97,98,99,103,104,113,121,122,125,126,127,128,129,130,131,132,133,134,135,147,148,],[-65,-69,-81,52,-61,-59,-60,-62,-64,-66,-70,-82,-83,52,-61,-65,-69,52,-75,-58,52,-63,52,52,52,52,-53,-54,-55,-56,-57,52,52,52,52,52,52,-72,-74,52,-73,52,52,52,52,52,52,52,52,-78,]),'DIVISION':([20,21,22,23,25,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,66,80,89,91,92,93,94,95,96,97,98,99,103,104,113,121,122,125,126,127,128,129,130,131,132,133,134,135,147,148,],[-65,-69,-81,53,-61,-59,-60,-62,-64,-66,-70,-82,-83,53,-61,-65,-69,53,-75,-58,53,-63,53,53,53,53,-53,-54,-55,-56,-57,53,53,53,53,53,53,-72,-74,53,-73,53,53,53,53,53,53,53,53,-78,]),'INTEGER_DIVISION':([20,21,22,23,25,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,66,80,89,91,92,93,94,95,96,97,98,99,103,104,113,121,122,125,126,127,128,129,130,131,132,133,134,135,147,148,],[-65,-69,-81,54,-61,-59,-60,-62,-64,-66,-70,-82,-83,54,-61,-65,-69,54,-75,-58,54,-63,54,54,54,54,-53,-54,-55,-56,-57,54,54,54,54,54,54,-72,-74,54,-73,54,54,54,54,54,54,54,54,-78,]),'MODULUS':([20,21,22,23,25,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,66,80,89,91,92,93,94,95,96,97,98,99,103,104,113,121,122,125,126,127,128,129,130,131,132,133,134,135,147,148,],[-65,-69,-81,55,-61,-59,-60,-62,-64,-66,-70,-82,-83,55,-61,-65,-69,55,-75,-58,55,-63,55,55,55,55,-53,-54,-55,-56,-57,55,55,55,55,55,55,-72,-74,55,-73,55,55,55,55,55,55,55,55,-78,]),'EXPONENTIATION':([20,21,22,23,25,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,66,80,89,91,92,93,94,95,96,97,98,99,103,104,113,121,122,125,126,127,128,129,130,131,132,133,134,135,147,148,],[-65,-69,-81,56,-61,-59,-60,-62,-64,-66,-70,-82,-83,56,-61,-65,-69,56,-75,-58,56,-63,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,-72,-74,56,-73,56,56,56,56,56,56,56,56,-78,]),'CONS':([20,21,22,23,25,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,66,80,89,91,92,93,94,95,96,97,98,99,103,104,113,121,122,125,126,127,128,129,130,131,132,133,134,135,147,148,],[-65,-69,-81,57,-61,-59,-60,-62,-64,-66,-70,-82,-83,57,-61,-65,-69,57,-75,-58,57,-63,57,57,-51,-52,-53,-54,-55,-56,-57,57,57,57,57,57,57,-72,-74,57,-73,57,57,57,57,57,57,57,57,-78,]),'RPAREN':([22,27,28,29,30,31,32,33,34,43,44,45,46,59,61,66,67,68,70,71,72,73,74,77,78,79,80,83,84,85,86,87,88,89,90,92,93,94,95,96,97,98,99,104,113,114,115,116,119,121,122,125,126,128,129,130,131,132,133,134,135,136,137,138,139,140,142,143,147,148,150,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,80,-61,-65,-69,-75,-58,-23,-24,-25,-26,-27,-28,-29,-41,-49,-50,120,-63,123,-34,-35,-36,-37,-38,-39,124,-51,-52,-53,-54,-55,-56,-57,-67,-71,80,136,137,138,-33,-84,80,-72,-74,-73,-42,-43,-44,-45,-46,-47,-68,-30,-48,-40,-31,-32,148,-80,-84,-78,-79,]),'COMMA':([22,27,28,29,30,31,32,33,34,43,44,45,46,58,59,61,80,92,93,94,95,96,97,98,99,104,113,121,122,125,126,127,128,147,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,81,-61,-65,-69,101,-75,-58,-63,-51,-52,-53,-54,-55,-56,-57,-67,-71,81,141,81,-72,-74,101,-73,141,-78,]),'RBRACKET':([22,24,27,28,29,30,31,32,33,34,44,45,46,58,59,61,80,91,92,93,94,95,96,97,98,99,100,102,103,104,125,126,127,128,146,148,],[-81,59,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-84,-75,-58,-63,125,-51,-52,-53,-54,-55,-56,-57,-67,126,-77,128,-71,-72,-74,-84,-73,-76,-78,]),'LESS_THAN':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,80,89,92,93,94,95,96,97,98,99,104,113,122,125,126,128,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,105,-63,105,-51,-52,-53,-54,-55,-56,-57,-67,-71,105,105,-72,-74,-73,-78,]),'LESS_THAN_EQUAL':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,80,89,92,93,94,95,96,97,98,99,104,113,122,125,126,128,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,106,-63,106,-51,-52,-53,-54,-55,-56,-57,-67,-71,106,106,-72,-74,-73,-78,]),'GREATER_THAN':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,80,89,92,93,94,95,96,97,98,99,104,113,122,125,126,128,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,107,-63,107,-51,-52,-53,-54,-55,-56,-57,-67,-71,107,107,-72,-74,-73,-78,]),'GREATER_THAN_EQUAL':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,80,89,92,93,94,95,96,97,98,99,104,113,122,125,126,128,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,108,-63,108,-51,-52,-53,-54,-55,-56,-57,-67,-71,108,108,-72,-74,-73,-78,]),'EQUAL_TO':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,80,89,92,93,94,95,96,97,98,99,104,113,122,125,126,128,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,109,-63,109,-51,-52,-53,-54,-55,-56,-57,-67,-71,109,109,-72,-74,-73,-78,]),'NOT_EQUAL_TO':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,80,89,92,93,94,95,96,97,98,99,104,113,122,125,126,128,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,110,-63,110,-51,-52,-53,-54,-55,-56,-57,-67,-71,110,110,-72,-74,-73,-78,]),'MEMBERSHIP':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,80,89,92,93,94,95,96,97,98,99,104,113,122,125,126,128,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,111,-63,111,-51,-52,-53,-54,-55,-56,-57,-67,-71,111,111,-72,-74,-73,-78,]),'CONJUNCTION':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,68,70,71,72,73,74,75,77,78,80,83,84,85,86,87,88,89,90,92,93,94,95,96,97,98,99,104,113,115,116,119,122,125,126,128,129,130,131,132,133,134,135,137,138,139,140,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,-39,-34,-36,-37,-38,-35,-41,117,-49,-50,-63,117,-34,-35,-36,-37,-38,-39,117,-51,-52,-53,-54,-55,-56,-57,-67,-71,-39,-34,117,-33,-39,-72,-74,-73,-42,-43,-44,-45,-46,-47,-68,-48,-40,-31,117,-78,]),'DISJUNCTION':([22,27,28,29,30,31,32,33,34,44,45,46,59,61,66,68,70,71,72,73,74,75,77,78,80,83,84,85,86,87,88,89,90,92,93,94,95,96,97,98,99,104,113,115,116,119,122,125,126,128,129,130,131,132,133,134,135,137,138,139,140,148,],[-81,-59,-60,-62,-64,-66,-70,-82,-83,-61,-65,-69,-75,-58,-39,-34,-36,-37,-38,-35,-41,118,-49,-50,-63,118,-34,-35,-36,-37,-38,-39,118,-51,-52,-53,-54,-55,-56,-57,-67,-71,-39,-34,118,-33,-39,-72,-74,-73,-42,-43,-44,-45,-46,-47,-68,-48,-40,-31,-32,-78,]),'NEGATION':([41,42,47,48,69,76,82,112,117,118,],[76,76,76,76,76,76,76,76,76,76,]),'BOOLEAN_TRUE':([41,42,47,48,69,76,82,112,117,118,],[77,77,77,77,77,77,77,77,77,77,]),'BOOLEAN_FALSE':([41,42,47,48,69,76,82,112,117,118,],[78,78,78,78,78,78,78,78,78,78,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'start':([0,],[1,]),'block':([0,3,5,36,123,124,149,],[2,9,9,9,144,145,151,]),'statement':([3,5,36,],[5,36,36,]),'single_statement':([3,5,36,],[6,6,6,]),'conditional_statement':([3,5,36,],[7,7,7,]),'loop_statement':([3,5,36,],[8,8,8,]),'statement_assignable':([3,5,36,],[10,10,10,]),'statement_print':([3,5,36,],[11,11,11,]),'statement_if':([3,5,36,],[12,12,12,]),'statement_if_else':([3,5,36,],[13,13,13,]),'loop_statement_while':([3,5,36,],[14,14,14,]),'lvalue':([3,5,36,],[15,15,15,]),'variable':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[20,20,45,45,45,20,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'indexing_other':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[21,21,46,46,46,21,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,]),'expression':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[23,23,43,58,61,23,66,66,89,89,91,92,93,94,95,96,97,98,99,103,104,113,89,121,122,127,129,130,131,132,133,134,135,113,89,89,147,]),'list':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[25,25,44,44,44,25,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'indexing':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,]),'tuple':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,]),'number':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,]),'list_cons':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,]),'indexing_tuple':([3,5,17,24,26,36,41,42,47,48,49,50,51,52,53,54,55,56,57,60,62,69,76,81,82,101,105,106,107,108,109,110,111,112,117,118,141,],[32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,]),'block_tail':([5,36,],[38,63,]),'empty':([5,36,58,121,127,147,],[39,39,102,143,102,143,]),'rvalue':([41,42,],[65,79,]),'boolean_expression':([41,42,69,112,],[67,67,114,114,]),'boolean_comparison':([41,42,47,48,69,76,82,112,117,118,],[68,68,84,84,115,84,115,115,84,84,]),'boolean_conjunction':([41,42,47,48,69,76,82,112,117,118,],[70,70,86,86,70,86,86,70,86,86,]),'boolean_disjunction':([41,42,47,48,69,76,82,112,117,118,],[71,71,87,87,71,87,87,71,87,87,]),'boolean_negation':([41,42,47,48,69,76,82,112,117,118,],[72,72,88,88,72,88,88,72,88,88,]),'boolean_membership':([41,42,47,48,69,76,82,112,117,118,],[73,73,85,85,73,85,85,73,85,85,]),'boolean':([41,42,47,48,69,76,82,112,117,118,],[74,74,74,74,74,74,74,74,74,74,]),'boolean_argument':([41,42,47,48,69,76,82,112,117,118,],[75,75,83,90,116,119,116,116,139,140,]),'list_tail':([58,127,],[100,146,]),'tuple_tail':([121,147,],[142,150,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> start","S'",1,None,None,None),
+  ('start -> block','start',1,'p_start','sbml.py',50),
+  ('block -> LBRACE RBRACE','block',2,'p_block','sbml.py',58),
+  ('block -> LBRACE statement RBRACE','block',3,'p_block','sbml.py',59),
+  ('block -> LBRACE statement block_tail RBRACE','block',4,'p_block','sbml.py',60),
+  ('block_tail -> statement block_tail','block_tail',2,'p_block_tail','sbml.py',80),
+  ('block_tail -> empty','block_tail',1,'p_block_tail','sbml.py',81),
+  ('statement -> single_statement SEMICOLON','statement',2,'p_statement','sbml.py',97),
+  ('statement -> conditional_statement','statement',1,'p_statement','sbml.py',98),
+  ('statement -> loop_statement','statement',1,'p_statement','sbml.py',99),
+  ('statement -> block','statement',1,'p_statement','sbml.py',100),
+  ('single_statement -> statement_assignable','single_statement',1,'p_single_statement','sbml.py',106),
+  ('single_statement -> statement_print','single_statement',1,'p_single_statement','sbml.py',107),
+  ('conditional_statement -> statement_if','conditional_statement',1,'p_conditional_statement','sbml.py',113),
+  ('conditional_statement -> statement_if_else','conditional_statement',1,'p_conditional_statement','sbml.py',114),
+  ('loop_statement -> loop_statement_while','loop_statement',1,'p_loop_statement','sbml.py',119),
+  ('statement_if -> IF LPAREN boolean_argument RPAREN block','statement_if',5,'p_conditional_statement_if','sbml.py',123),
+  ('statement_if_else -> IF LPAREN boolean_argument RPAREN block ELSE block','statement_if_else',7,'p_conditional_statement_if_else','sbml.py',127),
+  ('loop_statement_while -> WHILE LPAREN boolean_argument RPAREN block','loop_statement_while',5,'p_loop_statement_while','sbml.py',131),
+  ('statement_assignable -> lvalue ASSIGNMENT rvalue','statement_assignable',3,'p_statement_assignable','sbml.py',135),
+  ('statement_print -> PRINT LPAREN rvalue RPAREN','statement_print',4,'p_statement_print','sbml.py',142),
+  ('lvalue -> variable','lvalue',1,'p_lvalue','sbml.py',147),
+  ('lvalue -> indexing_other','lvalue',1,'p_lvalue','sbml.py',148),
+  ('rvalue -> expression','rvalue',1,'p_rvalue','sbml.py',154),
+  ('rvalue -> boolean_expression','rvalue',1,'p_rvalue','sbml.py',155),
+  ('rvalue -> boolean_comparison','rvalue',1,'p_rvalue','sbml.py',156),
+  ('boolean_expression -> boolean_conjunction','boolean_expression',1,'p_boolean_expression','sbml.py',162),
+  ('boolean_expression -> boolean_disjunction','boolean_expression',1,'p_boolean_expression','sbml.py',163),
+  ('boolean_expression -> boolean_negation','boolean_expression',1,'p_boolean_expression','sbml.py',164),
+  ('boolean_expression -> boolean_membership','boolean_expression',1,'p_boolean_expression','sbml.py',165),
+  ('boolean_expression -> LPAREN boolean_expression RPAREN','boolean_expression',3,'p_boolean_expression','sbml.py',166),
+  ('boolean_conjunction -> boolean_argument CONJUNCTION boolean_argument','boolean_conjunction',3,'p_boolean_conjunction','sbml.py',174),
+  ('boolean_disjunction -> boolean_argument DISJUNCTION boolean_argument','boolean_disjunction',3,'p_boolean_disjunction','sbml.py',178),
+  ('boolean_negation -> NEGATION boolean_argument','boolean_negation',2,'p_boolean_negation','sbml.py',182),
+  ('boolean_argument -> boolean_comparison','boolean_argument',1,'p_boolean_argument','sbml.py',187),
+  ('boolean_argument -> boolean_membership','boolean_argument',1,'p_boolean_argument','sbml.py',188),
+  ('boolean_argument -> boolean_conjunction','boolean_argument',1,'p_boolean_argument','sbml.py',189),
+  ('boolean_argument -> boolean_disjunction','boolean_argument',1,'p_boolean_argument','sbml.py',190),
+  ('boolean_argument -> boolean_negation','boolean_argument',1,'p_boolean_argument','sbml.py',191),
+  ('boolean_argument -> expression','boolean_argument',1,'p_boolean_argument','sbml.py',192),
+  ('boolean_argument -> LPAREN boolean_argument RPAREN','boolean_argument',3,'p_grouped_boolean_argument','sbml.py',202),
+  ('boolean_comparison -> boolean','boolean_comparison',1,'p_boolean_comparison','sbml.py',207),
+  ('boolean_comparison -> expression LESS_THAN expression','boolean_comparison',3,'p_boolean_comparison','sbml.py',208),
+  ('boolean_comparison -> expression LESS_THAN_EQUAL expression','boolean_comparison',3,'p_boolean_comparison','sbml.py',209),
+  ('boolean_comparison -> expression GREATER_THAN expression','boolean_comparison',3,'p_boolean_comparison','sbml.py',210),
+  ('boolean_comparison -> expression GREATER_THAN_EQUAL expression','boolean_comparison',3,'p_boolean_comparison','sbml.py',211),
+  ('boolean_comparison -> expression EQUAL_TO expression','boolean_comparison',3,'p_boolean_comparison','sbml.py',212),
+  ('boolean_comparison -> expression NOT_EQUAL_TO expression','boolean_comparison',3,'p_boolean_comparison','sbml.py',213),
+  ('boolean_comparison -> LPAREN boolean_comparison RPAREN','boolean_comparison',3,'p_boolean_comparison','sbml.py',214),
+  ('boolean -> BOOLEAN_TRUE','boolean',1,'p_boolean','sbml.py',228),
+  ('boolean -> BOOLEAN_FALSE','boolean',1,'p_boolean','sbml.py',229),
+  ('expression -> expression ADDITION expression','expression',3,'p_expression_binop','sbml.py',235),
+  ('expression -> expression SUBTRACTION expression','expression',3,'p_expression_binop','sbml.py',236),
+  ('expression -> expression MULTIPLICATION expression','expression',3,'p_expression_binop','sbml.py',237),
+  ('expression -> expression DIVISION expression','expression',3,'p_expression_binop','sbml.py',238),
+  ('expression -> expression INTEGER_DIVISION expression','expression',3,'p_expression_binop','sbml.py',239),
+  ('expression -> expression MODULUS expression','expression',3,'p_expression_binop','sbml.py',240),
+  ('expression -> expression EXPONENTIATION expression','expression',3,'p_expression_binop','sbml.py',241),
+  ('expression -> SUBTRACTION expression','expression',2,'p_expression_uminus','sbml.py',247),
+  ('expression -> indexing','expression',1,'p_expression_indexing','sbml.py',251),
+  ('expression -> tuple','expression',1,'p_expression_tuple','sbml.py',255),
+  ('expression -> list','expression',1,'p_expression_list','sbml.py',259),
+  ('expression -> STRING','expression',1,'p_expression_string','sbml.py',263),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','sbml.py',267),
+  ('expression -> number','expression',1,'p_expression_number','sbml.py',271),
+  ('expression -> variable','expression',1,'p_expression_name','sbml.py',275),
+  ('expression -> list_cons','expression',1,'p_expression_cons','sbml.py',281),
+  ('list_cons -> expression CONS expression','list_cons',3,'p_list_cons','sbml.py',285),
+  ('boolean_membership -> expression MEMBERSHIP expression','boolean_membership',3,'p_boolean_membership','sbml.py',289),
+  ('indexing -> indexing_other','indexing',1,'p_indexing','sbml.py',294),
+  ('indexing -> indexing_tuple','indexing',1,'p_indexing','sbml.py',295),
+  ('indexing_tuple -> HASHTAG INTEGER expression','indexing_tuple',3,'p_indexing_tuple','sbml.py',300),
+  ('indexing_other -> expression LBRACKET expression RBRACKET','indexing_other',4,'p_indexing_other','sbml.py',306),
+  ('indexing_other -> list LBRACKET expression RBRACKET','indexing_other',4,'p_indexing_other','sbml.py',307),
+  ('list -> LBRACKET expression list_tail RBRACKET','list',4,'p_list','sbml.py',313),
+  ('list -> LBRACKET RBRACKET','list',2,'p_list','sbml.py',314),
+  ('list_tail -> COMMA expression list_tail','list_tail',3,'p_list_tail','sbml.py',332),
+  ('list_tail -> empty','list_tail',1,'p_list_tail','sbml.py',333),
+  ('tuple -> LPAREN expression COMMA expression tuple_tail RPAREN','tuple',6,'p_tuple','sbml.py',347),
+  ('tuple_tail -> COMMA expression tuple_tail','tuple_tail',3,'p_tuple_tail','sbml.py',359),
+  ('tuple_tail -> empty','tuple_tail',1,'p_tuple_tail','sbml.py',360),
+  ('variable -> VARIABLE','variable',1,'p_variable','sbml.py',374),
+  ('number -> INTEGER','number',1,'p_number','sbml.py',379),
+  ('number -> REAL','number',1,'p_number','sbml.py',380),
+  ('empty -> <empty>','empty',0,'p_empty','sbml.py',385),
+]
@@ -0,0 +1,138 @@
+# the profile engine runs the tree walker over a copy of the program in which every node is
+# wrapped in a Profiled node counting its executions and timing them. the other engines never
+# see the wrappers, so profiling costs nothing unless it is asked for.
+#
+# sbml has no functions, so the only way to reach a node is through its ancestors and the
+# stack a node runs under is always the same: its path from the root of the program
+
+# system imports
+import bisect
+import re
+import time
+
+# internal imports
+from ast import *
+
+statements = ['AssignStatement', 'PrintStatement', 'IfStatement', 'IfElseStatement', 'WhileStatement']
+
+class Profiled():
+    __slots__ = ['node', 'profile', 'parent', 'count', 'total', 'own']
+
+    def __init__(self, node, profile, parent):
+        self.node = node
+        self.profile = profile
+        self.parent = parent
+        self.count = 0
+        self.total = 0.0
+        self.own = 0.0
+
+    def parse(self, frame = None):
+        profile = self.profile
+        outer = profile.inner
+        profile.inner = 0.0
+        start = time.perf_counter()
+        try:
+            return self.node.parse(frame)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.total += elapsed
+            self.own += elapsed - profile.inner
+            profile.inner = outer + elapsed
+
+class Profile():
+    def __init__(self, block):
+        # time spent in the children of the node running now
+        self.inner = 0.0
+        self.nodes = []
+        self.block = self.wrap(block, None)
+
+    def wrap(self, node, parent):
+        profiled = Profiled(None, self, parent)
+        self.nodes.append(profiled)
+        profiled.node = self.copy(node, profiled)
+        return profiled
+
+    def copy(self, node, parent):
+        copied = type(node)()
+        for name in fields(node):
+            setattr(copied, name, self.field(node, name, getattr(node, name), parent))
+        return copied
+
+    def field(self, node, name, value, parent):
+        kind = type(node).__name__
+        if isinstance(value, Node):
+            # the tree walker checks the type of assignment targets and of a Boolean's value,
+            # those stay unwrapped and only what they contain is timed
+            if (kind == 'AssignStatement' and name == 'lvalue') or kind == 'Boolean':
+                return self.copy(value, parent)
+            return self.wrap(value, parent)
+        if type(value) is list:
+            return [self.field(node, name, element, parent) for element in value]
+        if type(value) is tuple and kind == 'Tuple':
+            return tuple(self.field(node, name, element, parent) for element in value)
+        return value
+
+    def parse(self, frame):
+        self.block.parse(frame)
+
+### Reports ###
+
+class Positions():
+    # turns node offsets into lines and columns, using the source when there is one
+    def __init__(self, source = None):
+        self.source = source
+        self.starts = [0] + [match.end() for match in re.finditer('\n', source)] if source is not None else None
+
+    def position(self, node):
+        if not hasattr(node, 'lexpos'):
+            return 0, 0
+        if self.source is None:
+            return node.lineno, 0
+        line = bisect.bisect_right(self.starts, node.lexpos)
+        return line, node.lexpos - self.starts[line - 1] + 1
+
+    def label(self, node):
+        line, column = self.position(node)
+        return '{}@{}:{}'.format(type(node).__name__, line, column) if column else '{}@{}'.format(type(node).__name__, line)
+
+    def text(self, node):
+        # the source line the node starts on
+        if self.source is None or not hasattr(node, 'lexpos'):
+            return ''
+        line, _ = self.position(node)
+        end = self.starts[line] - 1 if line < len(self.starts) else len(self.source)
+        return self.source[self.starts[line - 1]:end].strip()
+
+def hot_statements(profile, source = None, limit = 20):
+    # the statements taking the most time, not counting the statements nested in them
+    positions = Positions(source)
+    blocks = {}
+    for profiled in profile.nodes:
+        if type(profiled.node).__name__ == 'Block' and profiled.parent is not None:
+            blocks[profiled.parent] = blocks.get(profiled.parent, 0.0) + profiled.total
+
+    rows = []
+    for profiled in profile.nodes:
+        if type(profiled.node).__name__ in statements and profiled.count:
+            line, column = positions.position(profiled.node)
+            rows.append((profiled.total - blocks.get(profiled, 0.0), profiled.total, profiled.count, line, column, positions.text(profiled.node)))
+
+    lines = ['{:>10} {:>12} {:>12}  {:>9}  {}'.format('count', 'cumulative', 'self', 'line:col', 'statement')]
+    for own, total, count, line, column, text in sorted(rows, key=lambda row: -row[0])[:limit]:
+        lines.append('{:>10} {:>11.6f}s {:>11.6f}s  {:>9}  {}'.format(count, total, own, '{}:{}'.format(line, column), text[:60]))
+    return '\n'.join(lines)
+
+def collapsed(profile, source = None):
+    # one line per node that took time: its path from the root, then its own time in microseconds,
+    # the input flamegraph.pl and speedscope take
+    positions = Positions(source)
+    labels = {}
+    lines = []
+    for profiled in profile.nodes:
+        parent = labels.get(profiled.parent)
+        labels[profiled] = positions.label(profiled.node) if parent is None else parent + ';' + positions.label(profiled.node)
+        microseconds = int(round(profiled.own * 1000000))
+        if microseconds > 0:
+            lines.append('{} {}'.format(labels[profiled], microseconds))
+    return '\n'.join(lines) + '\n' if lines else ''
@@ -0,0 +1,114 @@
+# internal imports
+from utils import *
+from ast import Frame, Turn, looping, errors
+from sinks import BufferedSink
+import sinks
+import checker
+import closures
+import compiler
+import hoister
+import optimizer
+import profiler
+import resolver
+import transpiler
+import vm
+
+# each engine is a pair of functions: one that compiles the program block,
+# and one that executes whatever the first returned against the frame of a run
+engines = {
+    'closure': (closures.ClosureProgram, lambda compiled, frame: compiled.parse(frame)),
+    'tree': (lambda block: block, lambda compiled, frame: compiled.parse(frame)),
+    'vm': (compiler.compile_program, vm.run),
+    'python': (transpiler.transpile, transpiler.run),
+    'profile': (profiler.Profile, lambda compiled, frame: compiled.parse(frame))
+}
+
+default_engine = 'closure'
+
+# statements and loop iterations an asynchronous run makes before letting other tasks run
+default_every = 1000
+
+class Program():
+    def __init__(self, block, slots = None, unbound = None, check = True):
+        # blocks loaded back from the cache come with their slots, they were optimized, resolved and checked before being stored
+        if slots is None:
+            block = hoister.hoist(optimizer.optimize(block))
+            slots, unbound = resolver.resolve(block)
+            if check:
+                checker.check(block)
+
+        self.block = block
+        self.slots = slots
+        self.unbound = unbound or set()
+
+        # compiled forms, built the first time the program runs on each engine. two threads
+        # may race to build one, they build the same thing and either result is kept
+        self.compiled = {}
+
+        # the statements with loops in them, for execute_async, found on its first run
+        self.looping = None
+
+    def compile(self, engine = default_engine):
+        if engine not in self.compiled:
+            self.compiled[engine] = engines[engine][0](self.block)
+        return self.compiled[engine]
+
+    def run(self, env = None, engine = default_engine, limits = None, output = None):
+        # runs the way the command line does: an error prints its message and ends the process.
+        # execute raises it instead
+        try:
+            return self.execute(env, engine, limits, output)
+        except SbmlError as error:
+            print_error(error)
+            exit(1)
+
+    def execute(self, env = None, engine = default_engine, limits = None, output = None):
+        # limits, a limits.Limits, bound the run. going over one raises ResourceLimit, an error of
+        # the program raises SbmlSemanticError. output is the sink print statements write to, see
+        # sinks.py, a BufferedSink on stdout by default. returns the bindings the run ends with
+        if any(name not in (env or {}) for name in self.unbound):
+            raise SbmlSemanticError()
+
+        compiled = self.compile(engine)
+
+        # every run gets its own frame, starting from the given bindings only, and its own budget
+        frame = Frame(self.slots, env, limits.budget() if limits is not None else None, output or BufferedSink())
+
+        previous = sinks.start(frame.output)
+        try:
+            engines[engine][1](compiled, frame)
+        except errors:
+            # the engines raise SbmlSemanticError for these themselves, an operation one of them
+            # misses is still an error of the program
+            raise SbmlSemanticError()
+        finally:
+            sinks.stop(frame.output, previous)
+
+        bindings = dict(env or {})
+        bindings.update(frame.bindings())
+        return bindings
+
+    async def execute_async(self, env = None, limits = None, output = None, every = default_every):
+        # execute as a coroutine, on the tree walker, which hands the event loop back to its other
+        # tasks after every `every` statements or loop iterations. runs in many tasks interleave
+        # on one thread, each can be cancelled, or given a deadline with limits or asyncio.wait_for
+        if any(name not in (env or {}) for name in self.unbound):
+            raise SbmlSemanticError()
+
+        if self.looping is None:
+            self.looping = looping(self.block)
+
+        frame = Frame(self.slots, env, limits.budget() if limits is not None else None, output or BufferedSink())
+
+        # the sink isn't registered as the one of the run in progress, other runs go on in this
+        # thread before this one ends
+        try:
+            await self.block.run_async(frame, Turn(every, self.looping))
+        except errors:
+            raise SbmlSemanticError()
+        finally:
+            frame.output.flush()
+
+        bindings = dict(env or {})
+        bindings.update(frame.bindings())
+        return bindings
@@ -0,0 +1,229 @@
+# an interactive session. statements are typed a few lines at a time, every entry is parsed on
+# its own by the parser built once for the session, and its statements run one after the other
+# against the bindings left by everything run before, so nothing is ever run twice:
+#   python3 repl.py [--engine=closure|tree|vm|python] [--time] [--packed-lists] [--max-iterations=N] [--timeout=seconds] [--max-power-bits=N]
+#
+# an entry ends with the line that closes its last statement. an if statement may still be
+# followed by an else on the next line, a blank line runs it as it is. lines starting with : are
+# commands, listed by :help
+
+# system imports
+import sys
+import time
+
+# internal imports
+from utils import print_error, print_resource_err, ResourceLimit, SbmlError
+from ast import Block
+from program import Program, engines, default_engine
+from limits import Limits
+from scanner import Scanner
+from sbml import Parser, limit_flag, build
+import checker
+import packed
+import resolver
+
+usage = "Invalid arguments. Proper usage: python3 repl.py [--engine=closure|tree|vm|python] [--time] [--packed-lists] [--max-iterations=N] [--timeout=seconds] [--max-power-bits=N]"
+
+commands = """:env     print every variable bound so far
+:time    print how long each statement takes, or stop
+:reset   forget every variable
+:quit    end the session, like the end of input does"""
+
+# entries are checked a statement at a time, as they run
+parser = Parser(check=False)
+
+opening = {'LBRACE', 'LPAREN', 'LBRACKET'}
+closing = {'RBRACE', 'RPAREN', 'RBRACKET'}
+
+# what is left to type of an entry
+COMPLETE = 'complete'
+OPEN = 'open'
+ELSE = 'else'
+
+def state(source):
+    # COMPLETE when source is a whole number of statements, OPEN when the last one goes on, and
+    # ELSE when it ends with an if statement that an else may still follow
+    scanner = Scanner()
+    scanner.input(source)
+    depth = 0
+    first = None
+    awaiting_else = False
+
+    for tok in scanner:
+        if depth == 0:
+            if awaiting_else and tok.type != 'ELSE':
+                first = None
+            awaiting_else = False
+            if first is None:
+                first = tok.type
+
+        if tok.type in opening:
+            depth += 1
+        elif tok.type in closing:
+            depth -= 1
+
+        if depth <= 0:
+            if tok.type == 'SEMICOLON':
+                first = None
+            elif tok.type == 'RBRACE':
+                awaiting_else = first == 'IF'
+                first = None
+
+    if depth < 0:
+        # closes more than it opened, the parser reports it
+        return COMPLETE
+    if depth > 0 or first is not None:
+        return OPEN
+    return ELSE if awaiting_else else COMPLETE
+
+def excerpt(source, start, end):
+    # the source of a statement on one line, shortened
+    text = ' '.join(source[start:end].split())
+    return text if len(text) <= 40 else text[:37] + '...'
+
+class Session():
+    def __init__(self, engine = default_engine, limits = None, timing = False, err = None):
+        self.engine = engine
+        self.limits = limits
+        self.timing = timing
+
+        # where timings go, stderr unless given
+        self.err = err
+
+        # the bindings left by every statement run so far
+        self.env = {}
+
+        # lines of the entry being typed
+        self.lines = []
+
+    def prompt(self):
+        return '... ' if self.lines else 'sbml> '
+
+    def feed(self, line):
+        # takes one line of input and runs the entries it completes. returns False once the
+        # session is over
+        if self.lines and state('\n'.join(self.lines)) == ELSE and not line.lstrip().startswith('else'):
+            # the if had no else, it runs before the line is looked at
+            self.flush()
+
+        if not self.lines:
+            if line.strip().startswith(':'):
+                return self.command(line.strip())
+            if not line.strip():
+                return True
+
+        self.lines.append(line)
+        source = '\n'.join(self.lines)
+        current = state(source)
+        if current == COMPLETE or (current == ELSE and not line.strip()):
+            self.flush()
+        return True
+
+    def flush(self):
+        source = '\n'.join(self.lines)
+        self.lines = []
+        self.execute(source)
+
+    def execute(self, source):
+        # parses the entry whole, so a syntax error anywhere runs none of it, then checks and runs
+        # its statements one at a time. a statement that the checker rejects or that stops on an
+        # error leaves the bindings as they were before it, lists it changed in place aside, and the
+        # statements after it don't run
+        try:
+            program = parser.parse('{' + source + '\n}')
+        except SbmlError as error:
+            print_error(error)
+            return
+
+        statements = program.block.statements or []
+        for n, statement in enumerate(statements):
+            block = Block([statement])
+            slots, unbound = resolver.resolve(block)
+            start = time.perf_counter()
+            try:
+                checker.check(block)
+                self.env = Program(block, slots, unbound).execute(self.env, self.engine, self.limits)
+            except SbmlError as error:
+                print_error(error)
+                return
+            except ResourceLimit:
+                print_resource_err()
+                return
+            finally:
+                if self.timing:
+                    elapsed = time.perf_counter() - start
+                    sys.stdout.flush()
+                    end = statements[n + 1].lexpos - 1 if n + 1 < len(statements) else len(source)
+                    print('{:.3f} ms  {}'.format(elapsed * 1000, excerpt(source, statement.lexpos - 1, end)), file=self.err or sys.stderr)
+
+    def command(self, line):
+        if line == ':env':
+            for name in sorted(self.env):
+                print('{} = {}'.format(name, self.env[name]))
+        elif line == ':time':
+            self.timing = not self.timing
+        elif line == ':reset':
+            self.env = {}
+        elif line == ':quit':
+            return False
+        else:
+            print(commands)
+        return True
+
+    def end(self):
+        # runs what is left of the last entry when the input ends
+        if self.lines:
+            self.flush()
+
+def main(args):
+    engine = default_engine
+    timing = False
+    limits = Limits()
+
+    for arg in args[1:]:
+        if limit_flag(arg, limits):
+            pass
+        elif arg.startswith('--engine='):
+            engine = arg[len('--engine='):]
+        elif arg == '--time':
+            timing = True
+        elif arg == '--packed-lists':
+            packed.enabled = True
+        else:
+            print(usage)
+            exit(1)
+
+    if engine not in engines:
+        print(usage)
+        exit(1)
+
+    if all(value is None for value in vars(limits).values()):
+        limits = None
+
+    # built before the first prompt, not while the first statement is waited for
+    build()
+    session = Session(engine, limits, timing)
+    interactive = sys.stdin.isatty()
+
+    while True:
+        try:
+            line = input(session.prompt() if interactive else '')
+        except EOFError:
+            line = None
+        except KeyboardInterrupt:
+            # drops the entry being typed
+            print()
+            session.lines = []
+            continue
+
+        try:
+            if line is None:
+                session.end()
+                break
+            if not session.feed(line):
+                break
+        except KeyboardInterrupt:
+            print('interrupted')
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,108 @@
+# internal imports
+from ast import *
+
+# gives every variable a fixed slot in the frame, and works out which reads can find their
+# slot still undefined. a Variable node ends up with:
+#   slot:  its index in Frame.values
+#   bound: whether a value is guaranteed to be there, engines skip the undefined check then
+# Invariant nodes get a slot of their own too, under their $ name, and a WhileStatement the
+# slots of the invariants it owns
+
+# fields holding the subexpressions of each expression node, in evaluation order
+operands = {
+    'Negation': ['expr'],
+    'BooleanExpression': ['expr'],
+    'UnaryMinus': ['expr'],
+    'Conjunction': ['left', 'right'],
+    'Disjunction': ['left', 'right'],
+    'Comparison': ['left', 'right'],
+    'BinaryOperation': ['left', 'right'],
+    'ListConstruct': ['left', 'right'],
+    'Membership': ['element', 'collection'],
+    'TupleIndexing': ['expr', 'index'],
+    'ListStringIndexing': ['expr', 'index']
+}
+
+class Resolver():
+    def __init__(self):
+        self.slots = {}
+
+        # variables assigned so far, in source order
+        self.assigned = set()
+
+        # variables read before any assignment to them, these must be bound when the program runs
+        self.unbound = set()
+
+    def slot(self, name):
+        return self.slots.setdefault(name, len(self.slots))
+
+    ### Statements, each returns the variables certainly assigned once it ran ###
+
+    def statement(self, node, bound):
+        return getattr(self, 'statement_' + type(node).__name__)(node, bound)
+
+    def statement_Block(self, node, bound):
+        for statement in node.statements or []:
+            bound = self.statement(statement, bound)
+        return bound
+
+    def statement_AssignStatement(self, node, bound):
+        if type(node.lvalue).__name__ == 'ListStringIndexing':
+            self.expression(node.lvalue, bound)
+            self.expression(node.rvalue, bound)
+            return bound
+
+        self.expression(node.rvalue, bound)
+        node.lvalue.slot = self.slot(node.lvalue.name)
+        self.assigned.add(node.lvalue.name)
+        return bound | {node.lvalue.name}
+
+    def statement_PrintStatement(self, node, bound):
+        self.expression(node.expr, bound)
+        return bound
+
+    def statement_IfStatement(self, node, bound):
+        self.expression(node.condition, bound)
+        self.statement(node.block, bound)
+        return bound
+
+    def statement_IfElseStatement(self, node, bound):
+        self.expression(node.condition, bound)
+        return self.statement(node.if_block, bound) & self.statement(node.else_block, bound)
+
+    def statement_WhileStatement(self, node, bound):
+        # the body may run zero times, and its first run sees only what was bound before the loop
+        node.invariant_slots = [self.slot(name) for name in node.invariants]
+        self.expression(node.condition, bound)
+        self.statement(node.block, bound)
+        return bound
+
+    ### Expressions ###
+
+    def expression(self, node, bound):
+        kind = type(node).__name__
+
+        if kind == 'Variable':
+            if node.name not in self.assigned:
+                self.unbound.add(node.name)
+            node.slot = self.slot(node.name)
+            node.bound = node.name in bound or node.name in self.unbound
+        elif kind == 'Invariant':
+            node.slot = self.slot(node.name)
+            self.expression(node.expr, bound)
+        elif kind == 'List':
+            for element in node.lst:
+                self.expression(element, bound)
+        elif kind == 'Tuple':
+            for element in node.tup:
+                self.expression(element, bound)
+        else:
+            for field in operands.get(kind, []):
+                self.expression(getattr(node, field), bound)
+
+def resolve(block):
+    # returns the slot names in order and the variables that must come from the environment
+    resolver = Resolver()
+    resolver.statement(block, frozenset())
+    slots = sorted(resolver.slots, key=resolver.slots.get)
+    return slots, resolver.unbound
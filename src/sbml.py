@@ -2,15 +2,23 @@
 # ID: 111161128
 
 # system imports
+import os
 import sys
+import threading
 
 # internal imports
 from lexer import tokens
-from utils import print_semantic_err, print_syntax_err
+import lexer
+import scanner
+from utils import print_error, print_resource_err, ResourceLimit, SbmlError, SbmlSyntaxError, SbmlSemanticError, CompiledFileError
 from ast import *
-
-# external imports
-import ply.yacc as yacc
+from program import Program, engines, default_engine
+from limits import Limits
+from sinks import BufferedSink, FileSink, default_size
+import cache
+import checker
+import packed
+import profiler
 
 # precedence for rules
 precedence = (
@@ -30,18 +38,22 @@ precedence = (
     ('left', 'LPAREN', 'RPAREN')
 )
 
-# to handle list operations
-lst = []
-
-# to handle tuple operations
-tup = tuple()
-
-# to hold the statements contained within a block
-block_statements = []
+def located(node, p, n = 1):
+    # a node starts where symbol n of its production does: tokens know their position, nodes
+    # reduced before it were given theirs
+    start = p[n]
+    if isinstance(start, Node):
+        node.lineno = start.lineno
+        node.lexpos = start.lexpos
+    else:
+        node.lineno = p.lineno(n)
+        node.lexpos = p.lexpos(n)
+    return node
 
 def p_start(p):
     "start : block"
-    p[1].parse()
+    # checked by Parser, unless it was told not to
+    p[0] = Program(p[1], check=False)
 
 def p_block(p):
     """
@@ -50,8 +62,6 @@ def p_block(p):
           | LBRACE statement block_tail RBRACE
     """
 
-    global block_statements
-
     if p[1] == '{' and p[2] == '}':
         # nothing happens
         pass
@@ -59,11 +69,9 @@ def p_block(p):
         p[0] = [p[2]]
 
         if len(p) > 4:
-            p[0] += p[3]
+            p[0] += reversed(p[3])
     
-    p[0] = Block(statements=p[0])
-    
-    block_statements = []
+    p[0] = located(Block(statements=p[0]), p)
 
 def p_block_tail(p):
     """
@@ -71,16 +79,14 @@ def p_block_tail(p):
                | empty
     """
 
-    global block_statements
-
-    if len(p) > 1 and p[1] != None:
-        block_statements = [p[1]] + block_statements
-        
-        if len(p) > 2:
-            for i in range(3, len(p) - 1):
-                block_statements = p[i] + block_statements
-    
-    p[0] = block_statements
+    # the tail is reduced from its last statement back, each reduction appends to the list
+    # it was handed, so the statements end up reversed. the list belongs to this production
+    # only, nested blocks and concurrent parses never share one
+    if len(p) > 2:
+        p[2].append(p[1])
+        p[0] = p[2]
+    else:
+        p[0] = []
 
 def p_statement(p):
     """
@@ -111,23 +117,23 @@ def p_loop_statement(p):
 
 def p_conditional_statement_if(p):
     "statement_if : IF LPAREN boolean_argument RPAREN block"
-    p[0] = IfStatement(condition=p[3], block=p[5])
+    p[0] = located(IfStatement(condition=p[3], block=p[5]), p)
 
 def p_conditional_statement_if_else(p):
     "statement_if_else : IF LPAREN boolean_argument RPAREN block ELSE block"
-    p[0] = IfElseStatement(condition=p[3], if_block=p[5], else_block=p[7])
+    p[0] = located(IfElseStatement(condition=p[3], if_block=p[5], else_block=p[7]), p)
 
 def p_loop_statement_while(p):
     "loop_statement_while : WHILE LPAREN boolean_argument RPAREN block"
-    p[0] = WhileStatement(condition=p[3], block=p[5])
+    p[0] = located(WhileStatement(condition=p[3], block=p[5]), p)
 
 def p_statement_assignable(p):
     "statement_assignable : lvalue ASSIGNMENT rvalue"
-    p[0] = AssignStatement(lvalue=p[1], rvalue=p[3])
+    p[0] = located(AssignStatement(lvalue=p[1], rvalue=p[3]), p)
 
 def p_statement_print(p):
     "statement_print : PRINT LPAREN rvalue RPAREN" 
-    p[0] = PrintStatement(expr=p[3])
+    p[0] = located(PrintStatement(expr=p[3]), p)
 
 def p_lvalue(p):
     """
@@ -159,15 +165,15 @@ def p_boolean_expression(p):
 
 def p_boolean_conjunction(p):
     "boolean_conjunction : boolean_argument CONJUNCTION boolean_argument"
-    p[0] = Conjunction(left=p[1], right=p[3])
+    p[0] = located(Conjunction(left=p[1], right=p[3]), p)
 
 def p_boolean_disjunction(p):
     "boolean_disjunction : boolean_argument DISJUNCTION boolean_argument"
-    p[0] = Disjunction(left=p[1], right=p[3])
+    p[0] = located(Disjunction(left=p[1], right=p[3]), p)
 
 def p_boolean_negation(p):
     "boolean_negation : NEGATION boolean_argument"
-    p[0] = Negation(expr=p[2])
+    p[0] = located(Negation(expr=p[2]), p)
 
 def p_boolean_argument(p):
     """
@@ -180,8 +186,7 @@ def p_boolean_argument(p):
     """
     valid = ['Comparison', 'Membership', 'Conjunction', 'Disjunction', 'Negation', 'Variable']
     if type(p[1]).__name__ not in valid:
-        print_semantic_err()
-        exit(1)
+        raise SbmlSemanticError()
     
     p[0] = p[1]
 
@@ -202,20 +207,20 @@ def p_boolean_comparison(p):
     """
 
     if len(p) == 2:
-        p[0] = Boolean(value=p[1])
+        p[0] = located(Boolean(value=p[1]), p)
     
     elif p[1] == '(' and p[3] == ')':
         p[0] = p[2]
 
     else:
-        p[0] = Comparison(left=p[1], right=p[3], operation=p[2])
+        p[0] = located(Comparison(left=p[1], right=p[3], operation=p[2]), p)
     
 def p_boolean(p):
     """
     boolean : BOOLEAN_TRUE
             | BOOLEAN_FALSE
     """
-    p[0] = Boolean(value=p[1])
+    p[0] = located(Boolean(value=p[1]), p)
 
 def p_expression_binop(p):
     """
@@ -228,11 +233,11 @@ def p_expression_binop(p):
                | expression EXPONENTIATION expression
     """
     
-    p[0] = BinaryOperation(left=p[1], right=p[3], operation=p[2])
+    p[0] = located(BinaryOperation(left=p[1], right=p[3], operation=p[2]), p)
 
 def p_expression_uminus(p):
     "expression : SUBTRACTION expression %prec UMINUS"
-    p[0] = UnaryMinus(expr=p[2])
+    p[0] = located(UnaryMinus(expr=p[2]), p)
 
 def p_expression_indexing(p):
     "expression : indexing"
@@ -248,7 +253,7 @@ def p_expression_list(p):
 
 def p_expression_string(p):
     "expression : STRING"
-    p[0] = String(value=p[1])
+    p[0] = located(String(value=p[1]), p)
 
 def p_expression_group(p):
     "expression : LPAREN expression RPAREN"
@@ -260,9 +265,6 @@ def p_expression_number(p):
 
 def p_expression_name(p):
     "expression : variable" 
-    if p[1].name not in names:
-        print_semantic_err()
-        exit(1)
     p[0] = p[1]
         
 def p_expression_cons(p):
@@ -271,11 +273,11 @@ def p_expression_cons(p):
 
 def p_list_cons(p):
     "list_cons : expression CONS expression"
-    p[0] = ListConstruct(left=p[1], right=p[3])
+    p[0] = located(ListConstruct(left=p[1], right=p[3]), p)
 
 def p_boolean_membership(p):
     "boolean_membership : expression MEMBERSHIP expression"
-    p[0] = Membership(element=p[1], collection=p[3])
+    p[0] = located(Membership(element=p[1], collection=p[3]), p)
 
 def p_indexing(p):
     """
@@ -286,7 +288,7 @@ def p_indexing(p):
 
 def p_indexing_tuple(p):
     "indexing_tuple : HASHTAG INTEGER expression"
-    p[0] = TupleIndexing(index=p[2], expr=p[3])
+    p[0] = located(TupleIndexing(index=located(Number(value=p[2]), p, 2), expr=p[3]), p)
 
 # handles both lists and strings since they have the same signature
 def p_indexing_other(p):
@@ -294,99 +296,263 @@ def p_indexing_other(p):
     indexing_other : expression LBRACKET expression RBRACKET
                    | list LBRACKET expression RBRACKET
     """
-    p[0] = ListStringIndexing(index=p[3], expr=p[1])
+    p[0] = located(ListStringIndexing(index=p[3], expr=p[1]), p)
 
 def p_list(p):
     """
     list : LBRACKET expression list_tail RBRACKET
          | LBRACKET RBRACKET
     """
-    global lst
-
     if len(p) == 3:
         p[0] = []
     elif len(p) > 3:
         p[0] = [p[2]]
 
         if len(p) > 4:
-            p[0] += p[3]
+            p[0] += reversed(p[3])
     
-    p[0] = List(lst=p[0])
-    
-    lst = []
+    p[0] = located(List(lst=p[0]), p)
 
 def p_list_tail(p):
     """
     list_tail : COMMA expression list_tail
               | empty
     """
-    global lst
-
+    # reversed, like block_tail
     if len(p) > 2:
-        lst = [p[2]] + lst
-        
-        if len(p) > 3:
-            for i in range(4, len(p) - 1, 2):
-                lst = p[i] + lst
-    
-    p[0] = lst
+        p[3].append(p[2])
+        p[0] = p[3]
+    else:
+        p[0] = []
 
 def p_tuple(p):
     "tuple : LPAREN expression COMMA expression tuple_tail RPAREN"
-    global tup
-
-    p[0] = Tuple(tup=((p[2], p[4]) + p[5]))
-
-    # clear the global tuple
-    tup = list(tup)
-    tup.clear()
-    tup = tuple(tup)
+    p[0] = located(Tuple(tup=((p[2], p[4]) + tuple(reversed(p[5])))), p)
 
 def p_tuple_tail(p):
     """
     tuple_tail : COMMA expression tuple_tail
                | empty
     """
-    global tup
-
+    # reversed, like block_tail
     if len(p) > 2:
-        tup = ((p[2],) + tup)
-        
-        if len(p) > 3:
-            for i in range(4, len(p) - 1, 2):
-                tup = p[i] + tup
-    
-    p[0] = tup
+        p[3].append(p[2])
+        p[0] = p[3]
+    else:
+        p[0] = []
 
 def p_variable(p):
     "variable : VARIABLE"
-    p[0] = Variable(name=p[1])
+    p[0] = located(Variable(name=p[1]), p)
 
 def p_number(p):
     """
     number : INTEGER
            | REAL
     """
-    p[0] = Number(value=p[1])
+    p[0] = located(Number(value=p[1]), p)
 
 def p_empty(p):
     'empty :'
     pass
 
 def p_error(p):
-    print_syntax_err()
-    exit(1)
-
-debug_output_dir = "../output" 
-parser = yacc.yacc(outputdir=debug_output_dir, errorlog=yacc.NullLogger())
+    raise SbmlSyntaxError()
+
+# the PLY parser is built on first use, from the shipped parsetab.py, so programs
+# loaded from the cache never import PLY at all. a PLY parser keeps its stacks on itself
+# while it runs, so every thread gets its own
+ply_parsers = threading.local()
+
+# building a parser may write parsetab.py, only one thread does that at a time
+build_lock = threading.Lock()
+
+def build():
+    if getattr(ply_parsers, 'parser', None) is None:
+        # external imports
+        import ply.yacc as yacc
+        with build_lock:
+            # yacc compares the grammar signature with the table module and regenerates it when they differ
+            ply_parsers.parser = yacc.yacc(module=sys.modules[__name__], tabmodule='parsetab', debug=False, errorlog=yacc.NullLogger())
+
+    return ply_parsers.parser
+
+# both give the same tokens, the hand-written scanner lexes about twice as fast
+lexers = {
+    'scanner': scanner.Scanner,
+    'ply': lambda: lexer.build().clone()
+}
+
+class Parser():
+    # check=False leaves the program unchecked, for callers checking parts of it on their own
+    def __init__(self, lexer = 'scanner', check = True):
+        self.lexer = lexer
+        self.check = check
+
+    def parse(self, source):
+        # every parse has its own lexer, with its own input position and line count
+        tokenizer = lexers[self.lexer]()
+        tokenizer.lineno = 1
+        return self.checked(build().parse(source, lexer=tokenizer))
+
+    def parse_file(self, fd):
+        # tokens are read from fd as the parser asks for them, the source is never held whole
+        return self.checked(build().parse(lexer=lexer.TokenStream(fd, scanner=lexers[self.lexer]())))
+
+    def checked(self, program):
+        if self.check:
+            checker.check(program.block)
+        return program
+
+parser = Parser()
+
+def build_tables():
+    # regenerates lextab.py and parsetab.py, run after changing the token rules or the grammar
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for table in ['lextab.py', 'parsetab.py']:
+        if os.path.exists(os.path.join(directory, table)):
+            os.remove(os.path.join(directory, table))
+
+    for module in ['lextab', 'parsetab']:
+        sys.modules.pop(module, None)
+
+    lexer.lexer = None
+    ply_parsers.parser = None
+    lexer.build()
+    build()
+
+# sources larger than this skip the cache and are parsed while they are read
+stream_size = 8 * 1024 * 1024
+
+usage = "Invalid arguments. Proper usage: python3 sbml.py [--engine=closure|tree|vm|python] [--no-cache] [--compile] [--packed-lists] [--profile[=<folded_file>]] [--max-iterations=N] [--timeout=seconds] [--max-power-bits=N] [--output=<file>] [--buffer-size=N] <input_file>"
+
+# flags setting a limit of the run, with the Limits field each one sets
+limit_flags = {
+    '--max-iterations=': ('iterations', int),
+    '--timeout=': ('seconds', float),
+    '--max-power-bits=': ('power_bits', int)
+}
+
+def limit_flag(arg, limits):
+    # applies arg to limits when it is one of the limit flags, returns whether it was
+    for flag, (field, kind) in limit_flags.items():
+        if arg.startswith(flag):
+            setattr(limits, field, kind(arg[len(flag):]))
+            return True
+    return False
+
+def load(path, use_cache = True):
+    # compiled files run as they are, sources go through the cache unless it is disabled
+    if path.endswith(cache.EXTENSION):
+        program = cache.load(path)
+        if program is None:
+            raise CompiledFileError("{} was compiled by a different interpreter version, recompile it".format(path))
+        return program
+
+    if not use_cache or os.path.getsize(path) > stream_size:
+        with open(path) as fd:
+            return parser.parse_file(fd)
+
+    with open(path) as fd:
+        source = fd.read()
+
+    program = cache.lookup(source)
+    if program is None:
+        program = parser.parse(source)
+        cache.store(source, program)
+
+    return program
 
 def main(args):
-    if len(args) == 2:
-        with open(sys.argv[1]) as fd:
-            parser.parse(fd.read())
-    else:
-        print("Invalid arguments. Proper usage: python3 sbml.py <input_file>")
+    engine = default_engine
+    use_cache = True
+    precompile = False
+    profile = None
+    limits = Limits()
+    destination = None
+    size = default_size
+    files = []
+
+    for arg in args[1:]:
+        if limit_flag(arg, limits):
+            pass
+        elif arg.startswith('--output='):
+            destination = arg[len('--output='):]
+        elif arg.startswith('--buffer-size='):
+            size = int(arg[len('--buffer-size='):])
+        elif arg.startswith('--engine='):
+            engine = arg[len('--engine='):]
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg == '--compile':
+            precompile = True
+        elif arg == '--packed-lists':
+            packed.enabled = True
+        elif arg == '--profile' or arg.startswith('--profile='):
+            profile = arg[len('--profile='):]
+        elif arg == '--build-tables':
+            build_tables()
+            return
+        else:
+            files.append(arg)
+
+    if len(files) != 1 or engine not in engines:
+        print(usage)
+        exit(1)
+
+    if precompile:
+        # writes prog.sbmlc next to prog.txt, to be run later without parsing
+        with open(files[0]) as fd:
+            source = fd.read()
+        target = os.path.splitext(files[0])[0] + cache.EXTENSION
+        try:
+            cache.save(target, parser.parse(source), cache.source_hash(source))
+        except SbmlError as error:
+            print_error(error)
+            exit(1)
+        return
+
+    if all(value is None for value in vars(limits).values()):
+        limits = None
+
+    # prints go to stdout, or to the file given, a block of size characters at a time
+    output = FileSink(destination, size) if destination is not None else BufferedSink(size=size)
+
+    try:
+        if profile is not None:
+            run_profiled(files[0], profile or os.path.splitext(files[0])[0] + '.folded', use_cache, limits, output)
+        else:
+            load(files[0], use_cache).execute(engine=engine, limits=limits, output=output)
+    except SbmlError as error:
+        print_error(error)
+        exit(1)
+    except ResourceLimit:
+        print_resource_err()
+        exit(1)
+    except CompiledFileError as error:
+        print(error)
         exit(1)
+    finally:
+        if destination is not None:
+            output.close()
+
+def run_profiled(path, folded, use_cache = True, limits = None, output = None):
+    # runs on the profile engine, then reports the hot statements on stderr and writes the
+    # collapsed stacks to folded, also when the program stops on an error
+    program = load(path, use_cache)
+    source = None
+    if not path.endswith(cache.EXTENSION):
+        with open(path) as fd:
+            source = fd.read()
+
+    try:
+        program.execute(engine='profile', limits=limits, output=output)
+    finally:
+        sys.stdout.flush()
+        profile = program.compile('profile')
+        print(profiler.hot_statements(profile, source), file=sys.stderr)
+        with open(folded, 'w') as out:
+            out.write(profiler.collapsed(profile, source))
 
 if __name__ == "__main__":
     main(sys.argv)
\ No newline at end of file
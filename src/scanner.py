@@ -0,0 +1,128 @@
+# a hand-written lexer producing the same tokens as the PLY one in lexer.py, minus the cost of
+# going through PLY: the first character of a token picks the rule, most tokens are recognized
+# without a regular expression, and literals are decoded once, as the token is made
+
+# system imports
+import re
+
+# internal imports
+from lexer import reserved, decode_string, t_STRING, t_REAL, t_VARIABLE, t_INTEGER
+
+class Token():
+    __slots__ = ['type', 'value', 'lineno', 'lexpos', 'lexer']
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __str__(self):
+        return 'LexToken(%s,%r,%d,%d)' % (self.type, self.value, self.lineno, self.lexpos)
+
+    def __repr__(self):
+        return str(self)
+
+# the patterns of the t_ rules, tried in the same order
+string = re.compile(t_STRING.__doc__)
+real = re.compile(t_REAL.__doc__)
+identifier = re.compile(t_VARIABLE.__doc__)
+integer = re.compile(t_INTEGER.__doc__)
+
+# tokens of one character that no longer token starts with either
+single = {
+    ';': 'SEMICOLON', '{': 'LBRACE', '}': 'RBRACE', '[': 'LBRACKET', ']': 'RBRACKET', ',': 'COMMA',
+    '#': 'HASHTAG', '+': 'ADDITION', '-': 'SUBTRACTION', '/': 'DIVISION', '(': 'LPAREN', ')': 'RPAREN'
+}
+
+# tokens of two characters, and the token their first character is on its own (None if it is none)
+double = {
+    '**': 'EXPONENTIATION', '<=': 'LESS_THAN_EQUAL', '<>': 'NOT_EQUAL_TO', '>=': 'GREATER_THAN_EQUAL',
+    '==': 'EQUAL_TO', '::': 'CONS'
+}
+first = {'*': 'MULTIPLICATION', '<': 'LESS_THAN', '>': 'GREATER_THAN', '=': 'ASSIGNMENT', ':': None}
+
+letters = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+class Scanner():
+    # has the parts of a PLY lexer the parser and tokenize() use: input, token, lineno and lexpos
+    def __init__(self):
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lineno = 1
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+
+    def clone(self):
+        copy = Scanner()
+        copy.lexdata = self.lexdata
+        copy.lexpos = self.lexpos
+        copy.lineno = self.lineno
+        return copy
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+    def token(self):
+        data = self.lexdata
+        pos = self.lexpos
+        end = len(data)
+
+        while pos < end:
+            c = data[pos]
+
+            if c == ' ' or c == '\t':
+                pos += 1
+                continue
+
+            if c == '\n':
+                pos += 1
+                self.lineno += 1
+                continue
+
+            if c in single:
+                self.lexpos = pos + 1
+                return Token(single[c], c, self.lineno, pos)
+
+            if c in letters:
+                m = identifier.match(data, pos)
+                value = m.group()
+                self.lexpos = m.end()
+                kind = reserved.get(value, 'VARIABLE')
+                if kind == 'BOOLEAN_TRUE' or kind == 'BOOLEAN_FALSE':
+                    value = kind == 'BOOLEAN_TRUE'
+                return Token(kind, value, self.lineno, pos)
+
+            if c in first:
+                pair = data[pos:pos + 2]
+                if pair in double:
+                    self.lexpos = pos + 2
+                    return Token(double[pair], pair, self.lineno, pos)
+                if first[c] is not None:
+                    self.lexpos = pos + 1
+                    return Token(first[c], c, self.lineno, pos)
+
+            elif c == '"' or c == "'":
+                m = string.match(data, pos)
+                if m:
+                    self.lexpos = m.end()
+                    return Token('STRING', decode_string(m.group()), self.lineno, pos)
+
+            else:
+                # digits go through the regular expressions, which also take the digits of other scripts like PLY does
+                m = real.match(data, pos)
+                if m:
+                    self.lexpos = m.end()
+                    return Token('REAL', float(m.group()), self.lineno, pos)
+                m = integer.match(data, pos)
+                if m:
+                    self.lexpos = m.end()
+                    return Token('INTEGER', int(m.group()), self.lineno, pos)
+
+            # illegal character, skipped like t_error does
+            pos += 1
+
+        self.lexpos = pos
+        return None
@@ -0,0 +1,90 @@
+# where the print statements of a run go. a sink is any object with two methods:
+#   line(text)  takes the text of one print, without its newline
+#   flush()     hands on everything it holds
+# every run has one, in its frame, and flushes it when it ends and before any error message is
+# printed, so output and errors always come out in program order
+#
+# BufferedSink is the default: lines wait in memory until a block of them is ready, then go to
+# stdout in a single write, instead of one call to print() and one flush to a terminal per line
+
+# system imports
+import io
+import sys
+import threading
+
+default_size = io.DEFAULT_BUFFER_SIZE
+
+class BufferedSink():
+    def __init__(self, stream = None, size = default_size):
+        # stream is None for whatever sys.stdout is when the lines are written, so redirections
+        # made after the sink was built still apply. size 0 writes every line as it comes
+        self.stream = stream
+        self.size = size
+        self.lines = []
+        self.waiting = 0
+
+    def line(self, text):
+        self.lines.append(text)
+        self.waiting += len(text) + 1
+        if self.waiting > self.size:
+            self.write()
+
+    def write(self):
+        self.lines.append('')
+        (self.stream or sys.stdout).write('\n'.join(self.lines))
+        self.lines = []
+        self.waiting = 0
+
+    def flush(self):
+        if self.lines:
+            self.write()
+        (self.stream or sys.stdout).flush()
+
+class CaptureSink():
+    # keeps the output in memory, in target: a list that gets every line, or a StringIO or any
+    # other stream written to
+    def __init__(self, target = None):
+        self.target = target if target is not None else []
+
+    def line(self, text):
+        if type(self.target) is list:
+            self.target.append(text)
+        else:
+            self.target.write(text + '\n')
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        # everything printed so far, newlines included
+        if type(self.target) is list:
+            return ''.join(line + '\n' for line in self.target)
+        return self.target.getvalue()
+
+class FileSink(BufferedSink):
+    # writes to the file at path, replacing it, until closed
+    def __init__(self, path, size = default_size):
+        BufferedSink.__init__(self, open(path, 'w'), size)
+
+    def close(self):
+        self.flush()
+        self.stream.close()
+
+# the sinks of the runs in progress, one per thread at most
+running = threading.local()
+
+def start(sink):
+    # sink belongs to the run starting in this thread, returns the one it replaces
+    previous = getattr(running, 'sink', None)
+    running.sink = sink
+    return previous
+
+def stop(sink, previous):
+    running.sink = previous
+    sink.flush()
+
+def flush_running():
+    # before an error message, what the run printed comes first
+    sink = getattr(running, 'sink', None)
+    if sink is not None:
+        sink.flush()
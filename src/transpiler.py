@@ -0,0 +1,379 @@
+# system imports
+import collections
+import math
+import threading
+
+# internal imports
+from utils import *
+from ast import undefined, immutable, errors
+import packed
+from indexes import min_size
+import closures
+
+# python precedence levels used to decide where the generated source needs parentheses
+OR, AND, NOT, COMPARISON, ADDITIVE, MULTIPLICATIVE, UNARY, POWER, ATOM = range(1, 10)
+
+binary_operators = {
+    '+': ('+', ADDITIVE),
+    '-': ('-', ADDITIVE),
+    '*': ('*', MULTIPLICATIVE),
+    '/': ('/', MULTIPLICATIVE),
+    'div': ('//', MULTIPLICATIVE),
+    'mod': ('%', MULTIPLICATIVE),
+    '**': ('**', POWER)
+}
+
+comparison_operators = {'<': '<', '<=': '<=', '>': '>', '>=': '>=', '==': '==', '<>': '!='}
+
+# the errors of the generated code: those of the operations, and the NameError of reading a
+# variable that has no value yet, a local it never set
+run_errors = errors + (NameError,)
+
+# generated code objects keyed by the source they were compiled from, the last cache_size compiled
+cache_size = 256
+code_cache = collections.OrderedDict()
+code_cache_lock = threading.Lock()
+
+### Runtime helpers, called by the generated code when a guard can't be inlined ###
+
+def semantic_error():
+    raise SbmlSemanticError()
+
+def index(sequence, i):
+    if type(i) is not int or i < 0 or i >= len(sequence):
+        semantic_error()
+    return sequence[i]
+
+def tuple_index(sequence, i):
+    if type(sequence) is not tuple or i < 1 or i > len(sequence):
+        semantic_error()
+    return sequence[i - 1]
+
+def keep(cell, value):
+    # the value of an invariant, kept in cell for the rest of its loop when it can be shared
+    if immutable(value):
+        cell.append(value)
+    return value
+
+helpers = {
+    'semantic_error': semantic_error,
+    'index': index,
+    'tuple_index': tuple_index,
+    'cons': packed.cons,
+    'pack': packed.pack,
+    'keep': keep,
+    'undefined': undefined
+}
+
+class PythonProgram():
+    # code is None when python can't compile the source, the program then runs on the closures
+    def __init__(self, source, code, slots, block = None):
+        self.source = source
+        self.code = code
+        self.slots = slots
+        self.block = block
+        self.metered_program = None
+        self.fallback = closures.ClosureProgram(block) if code is None else None
+
+    def metered(self):
+        # the variant charging a budget, built the first time a run with limits needs it
+        if self.metered_program is None:
+            self.metered_program = transpile(self.block, metered=True)
+        return self.metered_program
+
+    def __str__(self):
+        return self.source
+
+class Transpiler():
+    def __init__(self, metered = False):
+        # metered code calls tick() at the start of every loop body and power() for **, both
+        # bound to the budget of the run
+        self.metered = metered
+        self.lines = []
+        self.variables = {}
+        self.depth = 1
+
+    def line(self, text):
+        self.lines.append('    ' * self.depth + text)
+
+    def variable(self, node):
+        # sbml names may collide with python keywords and the helpers above
+        self.variables[node.name] = node.slot
+        return 'v_' + node.name
+
+    ### Statements ###
+
+    def statement(self, node):
+        getattr(self, 'statement_' + type(node).__name__)(node)
+
+    def body(self, block):
+        self.depth += 1
+        start = len(self.lines)
+        self.statement(block)
+        if len(self.lines) == start:
+            self.line('pass')
+        self.depth -= 1
+
+    def statement_Block(self, node):
+        if node.statements:
+            for statement in node.statements:
+                self.statement(statement)
+
+    def invariant(self, name):
+        # an invariant is kept in a list local to the program, empty until its value is known
+        return 'i_' + name[1:]
+
+    def statement_WhileStatement(self, node):
+        for name in node.invariants:
+            self.line('{} = []'.format(self.invariant(name)))
+        self.line('while {}:'.format(self.expression(node.condition)))
+        if self.metered:
+            self.depth += 1
+            self.line('tick()')
+            self.depth -= 1
+        self.body(node.block)
+
+    def statement_IfStatement(self, node):
+        self.line('if {}:'.format(self.expression(node.condition)))
+        self.body(node.block)
+
+    def statement_IfElseStatement(self, node):
+        self.line('if {}:'.format(self.expression(node.condition)))
+        self.body(node.if_block)
+        self.line('else:')
+        self.body(node.else_block)
+
+    def statement_AssignStatement(self, node):
+        rvalue = self.expression(node.rvalue)
+
+        if type(node.lvalue).__name__ == 'ListStringIndexing':
+            # lists that may have an index for membership are assigned through it
+            sequence = self.expression(node.lvalue.expr)
+            index = self.expression(node.lvalue.index)
+            target = self.operand(node.lvalue.expr, ATOM)
+            if not (self.settled(node.lvalue.expr) and self.settled(node.lvalue.index)):
+                # python runs the value of a subscript assignment first, the sequence and the
+                # index run before it in sbml
+                self.line('t_sequence = {}'.format(sequence))
+                self.line('t_index = {}'.format(index))
+                sequence = target = 't_sequence'
+                index = 't_index'
+            self.line('if indexed:')
+            self.depth += 1
+            self.line('store({}, {}, {})'.format(sequence, index, rvalue))
+            self.depth -= 1
+            self.line('else:')
+            self.depth += 1
+            self.line('{}[{}] = {}'.format(target, index, rvalue))
+            self.depth -= 1
+            return
+
+        self.line('{} = {}'.format(self.variable(node.lvalue), rvalue))
+
+    def statement_PrintStatement(self, node):
+        self.line('output(str({}))'.format(self.expression(node.expr)))
+
+    ### Expressions ###
+
+    def expression(self, node):
+        return self.emit(node)[0]
+
+    def emit(self, node):
+        # returns the python source of an expression and its precedence
+        return getattr(self, 'emit_' + type(node).__name__)(node)
+
+    def operand(self, node, precedence):
+        source, own = self.emit(node)
+        return source if own >= precedence else '({})'.format(source)
+
+    def simple(self, node):
+        # operands that are cheap enough to repeat inside an inline guard
+        return type(node).__name__ in ['Variable', 'Number', 'String', 'Boolean', 'Constant']
+
+    def settled(self, node):
+        # operands that can't fail, so it doesn't matter when they run
+        if type(node).__name__ == 'Variable':
+            return node.bound
+        return type(node).__name__ in ['Number', 'String', 'Boolean', 'Constant']
+
+    def emit_Variable(self, node):
+        return self.variable(node), ATOM
+
+    def emit_Invariant(self, node):
+        cell = self.invariant(node.name)
+        return '({}[0] if {} else keep({}, {}))'.format(cell, cell, cell, self.expression(node.expr)), ATOM
+
+    def emit_Number(self, node):
+        if type(node.value) is float and not math.isfinite(node.value):
+            return 'float({!r})'.format(repr(node.value)), ATOM
+        return repr(node.value), ATOM if node.value >= 0 else UNARY
+
+    def emit_Boolean(self, node):
+        return repr(node.parse()), ATOM
+
+    def emit_String(self, node):
+        return repr(node.parse()), ATOM
+
+    def emit_Constant(self, node):
+        return self.literal(node.value), ATOM
+
+    def literal(self, value):
+        if type(value) is tuple:
+            return '({})'.format(''.join(self.literal(element) + ', ' for element in value))
+        if type(value) is float and not math.isfinite(value):
+            return 'float({!r})'.format(repr(value))
+        return '({!r})'.format(value) if type(value) in [int, float] and value < 0 else repr(value)
+
+    def emit_BooleanExpression(self, node):
+        return self.emit(node.expr)
+
+    def emit_Negation(self, node):
+        return 'not {}'.format(self.operand(node.expr, NOT)), NOT
+
+    def emit_Conjunction(self, node):
+        return '{} and {}'.format(self.operand(node.left, AND), self.operand(node.right, NOT)), AND
+
+    def emit_Disjunction(self, node):
+        return '{} or {}'.format(self.operand(node.left, OR), self.operand(node.right, AND)), OR
+
+    def emit_Comparison(self, node):
+        # comparisons chain in python, so neither side may be a comparison itself
+        left = self.operand(node.left, ADDITIVE)
+        right = self.operand(node.right, ADDITIVE)
+        return '{} {} {}'.format(left, comparison_operators[node.operation], right), COMPARISON
+
+    def emit_Membership(self, node):
+        # large lists are looked up in their index, see indexes.py. len() fails on exactly the
+        # values in fails on. the guard runs the collection first, the element must run first
+        # unless it can't fail
+        if self.settled(node.element) and self.simple(node.collection):
+            element = self.operand(node.element, ADDITIVE)
+            collection = self.expression(node.collection)
+            return '({} in {} if len({}) < {} else contains({}, {}))'.format(element, collection, collection, min_size, self.expression(node.element), collection), ATOM
+
+        return 'contains({}, {})'.format(self.expression(node.element), self.expression(node.collection)), ATOM
+
+    def emit_BinaryOperation(self, node):
+        operator, precedence = binary_operators[node.operation]
+
+        if precedence == POWER and self.metered:
+            return 'power({}, {})'.format(self.expression(node.left), self.expression(node.right)), ATOM
+
+        if precedence == POWER:
+            # right associative, and sbml's unary minus binds tighter than **
+            left = self.operand(node.left, ATOM)
+            right = self.operand(node.right, POWER)
+        else:
+            left = self.operand(node.left, precedence)
+            right = self.operand(node.right, precedence + 1)
+
+        return '{} {} {}'.format(left, operator, right), precedence
+
+    def emit_UnaryMinus(self, node):
+        return '-{}'.format(self.operand(node.expr, UNARY)), UNARY
+
+    def emit_ListConstruct(self, node):
+        # a TypeError when the right operand isn't a list
+        return 'cons({}, {})'.format(self.expression(node.left), self.expression(node.right)), ATOM
+
+    def emit_TupleIndexing(self, node):
+        i = node.index.value
+
+        if node.checked:
+            return '{}[{}]'.format(self.operand(node.expr, ATOM), i - 1), ATOM
+
+        if self.simple(node.expr):
+            sequence = self.expression(node.expr)
+            guard = 'type({}) is tuple and 1 <= {} <= len({})'.format(sequence, i, sequence)
+            return '({}[{}] if {} else semantic_error())'.format(sequence, i - 1, guard), ATOM
+
+        return 'tuple_index({}, {})'.format(self.expression(node.expr), i), ATOM
+
+    def emit_ListStringIndexing(self, node):
+        if self.simple(node.expr) and self.simple(node.index):
+            sequence = self.expression(node.expr)
+            i = self.expression(node.index)
+            guard = '0 <= {} < len({})'.format(i, sequence)
+            if not node.checked:
+                guard = 'type({}) is int and {}'.format(i, guard)
+            return '({}[{}] if {} else semantic_error())'.format(sequence, i, guard), ATOM
+
+        return 'index({}, {})'.format(self.expression(node.expr), self.expression(node.index)), ATOM
+
+    def emit_List(self, node):
+        if not node.lst:
+            return '[]', ATOM
+        return 'pack([{}])'.format(', '.join(self.expression(element) for element in node.lst)), ATOM
+
+    def emit_ConstantList(self, node):
+        return 'pack(list({}))'.format(self.literal(node.values)), ATOM
+
+    def emit_Tuple(self, node):
+        return '({},)'.format(', '.join(self.expression(element) for element in node.tup)), ATOM
+
+    ### Program ###
+
+    def program(self, block):
+        self.statement(block)
+        body = self.lines
+        self.lines = []
+
+        # bindings made before the program runs are loaded from the frame into locals, and handed back at the end
+        self.depth = 0
+        self.line('def program(values):')
+        self.depth = 1
+        for name, slot in self.variables.items():
+            self.line('if values[{}] is not undefined: v_{} = values[{}]'.format(slot, name, slot))
+        self.lines += body
+        self.line('return locals()')
+
+        return '\n'.join(self.lines) + '\n'
+
+def transpile(block, metered = False):
+    transpiler = Transpiler(metered)
+    source = transpiler.program(block)
+
+    return PythonProgram(source, compile_source(source), transpiler.variables, block)
+
+def compile_source(source):
+    with code_cache_lock:
+        if source in code_cache:
+            code_cache.move_to_end(source)
+            return code_cache[source]
+
+    try:
+        code = compile(source, '<sbml>', 'exec')
+    except (SyntaxError, RecursionError, MemoryError):
+        # past the limits of the python compiler, such as loops nested more than 20 deep
+        code = None
+
+    with code_cache_lock:
+        code_cache[source] = code
+        if len(code_cache) > cache_size:
+            code_cache.popitem(last=False)
+    return code
+
+def run(program, frame):
+    if program.fallback is not None:
+        program.fallback.parse(frame)
+        return
+
+    namespace = dict(helpers)
+    namespace['indexed'] = frame.indexes.lists
+    namespace['contains'] = frame.indexes.contains
+    namespace['store'] = frame.indexes.store
+    namespace['output'] = frame.output.line
+    if frame.budget is not None:
+        program = program.metered()
+        namespace['tick'] = frame.budget.tick
+        namespace['power'] = frame.budget.power
+    exec(program.code, namespace)
+
+    try:
+        bindings = namespace['program'](frame.values)
+    except run_errors:
+        raise SbmlSemanticError()
+
+    for name, slot in program.slots.items():
+        if 'v_' + name in bindings:
+            frame.values[slot] = bindings['v_' + name]
@@ -1,6 +1,38 @@
+# internal imports
+from sinks import flush_running
+
 ERROR_SYNTAX = "SYNTAX ERROR"
 ERROR_SEMANTIC = "SEMANTIC ERROR"
+ERROR_RESOURCE = "RESOURCE LIMIT"
+
+# raised when a run goes over one of its limits, see limits.py
+class ResourceLimit(Exception):
+    pass
+
+# raised when a compiled file can't be run, it is damaged or was written by another version
+class CompiledFileError(Exception):
+    pass
+
+# raised where a program goes wrong, each with the message the command line prints for it.
+# output is what the program printed before, when it ran through embed.run
+class SbmlError(Exception):
+    message = None
+
+    def __init__(self):
+        Exception.__init__(self, self.message)
+        self.output = None
+
+class SbmlSyntaxError(SbmlError):
+    message = ERROR_SYNTAX
+
+class SbmlSemanticError(SbmlError):
+    message = ERROR_SEMANTIC
 
-def print_semantic_err(): print(ERROR_SEMANTIC)
+# the output of the run in progress comes out before its error message
+def print_error(error):
+    flush_running()
+    print(error.message)
 
-def print_syntax_err(): print(ERROR_SYNTAX)
\ No newline at end of file
+def print_resource_err():
+    flush_running()
+    print(ERROR_RESOURCE)
\ No newline at end of file
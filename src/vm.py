@@ -0,0 +1,305 @@
+# internal imports
+from utils import *
+from ast import undefined, immutable, errors
+from compiler import *
+from limits import power
+import packed
+from indexes import min_size
+
+# operand kinds that are resolved against the pools before execution, name operands are
+# already frame slots
+constant_operands = {
+    LOAD_CONST: [1], LOAD_LIST_CONST: [1], STORE_NAME_ADD_CONST: [2], STORE_NAME_SUBTRACT_CONST: [2],
+    COMPARE_NAME_CONST_JUMP_IF_FALSE: [2], COMPARE_NAME_CONST_JUMP_IF_TRUE: [2],
+    ADD_NAME_CONST: [2], SUBTRACT_NAME_CONST: [2], STORE_NAME_CONST: [2]
+}
+comparison_operands = {
+    COMPARE_OP: [1], COMPARE_JUMP_IF_FALSE: [1], COMPARE_JUMP_IF_TRUE: [1],
+    COMPARE_NAME_CONST_JUMP_IF_FALSE: [3], COMPARE_NAME_CONST_JUMP_IF_TRUE: [3],
+    COMPARE_NAME_JUMP_IF_FALSE: [2], COMPARE_NAME_JUMP_IF_TRUE: [2]
+}
+
+def link(code, budget = None):
+    # replaces pool indices with the constants and comparators they refer to, saving a lookup per
+    # operand. without a budget, jumps to a TICK go to the instruction after it instead
+    instructions = list(code.instructions)
+    pc = 0
+
+    while pc < len(instructions):
+        op = instructions[pc]
+        if budget is None and op in jumps and code.instructions[instructions[pc + arity[op]]] == TICK:
+            instructions[pc + arity[op]] += 1
+        for offset in constant_operands.get(op, []):
+            instructions[pc + offset] = code.constants[instructions[pc + offset]]
+        for offset in comparison_operands.get(op, []):
+            instructions[pc + offset] = comparators[instructions[pc + offset]]
+        pc += 1 + arity[op]
+
+    return instructions
+
+def run(code, frame):
+    budget = frame.budget
+    instructions = link(code, budget)
+
+    # opcodes are bound to locals, global lookups would dominate the dispatch chain
+    (load_const, load_name, store_name, binary_add, binary_subtract, binary_multiply, binary_divide,
+        binary_floor_divide, binary_modulo, binary_power, compare_op, unary_not, unary_negative,
+        contains, cons, index_op, tuple_index, store_index, build_list, build_tuple, print_op,
+        jump, pop_jump_if_false, pop_jump_if_true, jump_if_false_or_pop, jump_if_true_or_pop, halt,
+        store_name_add_const, store_name_subtract_const, index_name_name,
+        compare_jump_if_false, compare_jump_if_true,
+        compare_name_const_jump_if_false, compare_name_const_jump_if_true,
+        add_name_const, subtract_name_const, store_name_const,
+        compare_name_jump_if_false, compare_name_jump_if_true,
+        name_jump_if_false, name_jump_if_true, store_index_name, load_name_checked, load_list_const, tick,
+        load_invariant, store_invariant) = (
+        LOAD_CONST, LOAD_NAME, STORE_NAME, BINARY_ADD, BINARY_SUBTRACT, BINARY_MULTIPLY, BINARY_DIVIDE,
+        BINARY_FLOOR_DIVIDE, BINARY_MODULO, BINARY_POWER, COMPARE_OP, UNARY_NOT, UNARY_NEGATIVE,
+        CONTAINS, CONS, INDEX, TUPLE_INDEX, STORE_INDEX, BUILD_LIST, BUILD_TUPLE, PRINT,
+        JUMP, POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, HALT,
+        STORE_NAME_ADD_CONST, STORE_NAME_SUBTRACT_CONST, INDEX_NAME_NAME,
+        COMPARE_JUMP_IF_FALSE, COMPARE_JUMP_IF_TRUE,
+        COMPARE_NAME_CONST_JUMP_IF_FALSE, COMPARE_NAME_CONST_JUMP_IF_TRUE,
+        ADD_NAME_CONST, SUBTRACT_NAME_CONST, STORE_NAME_CONST,
+        COMPARE_NAME_JUMP_IF_FALSE, COMPARE_NAME_JUMP_IF_TRUE,
+        NAME_JUMP_IF_FALSE, NAME_JUMP_IF_TRUE, STORE_INDEX_NAME, LOAD_NAME_CHECKED, LOAD_LIST_CONST, TICK,
+        LOAD_INVARIANT, STORE_INVARIANT)
+
+    variables = frame.values
+    line = frame.output.line
+    # the lists that may have an index for membership, empty until the program tests one
+    indexes = frame.indexes
+    indexed = indexes.lists
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    pc = 0
+
+    try:
+        while True:
+            op = instructions[pc]
+
+            # ordered roughly by how often each opcode executes in loop-heavy programs
+            if op == index_name_name:
+                sequence = variables[instructions[pc + 1]]
+                index = variables[instructions[pc + 2]]
+                if type(index) is not int or index < 0 or index >= len(sequence):
+                    raise IndexError
+                push(sequence[index])
+                pc += 3
+            elif op == compare_name_const_jump_if_false:
+                if instructions[pc + 3](variables[instructions[pc + 1]], instructions[pc + 2]):
+                    pc += 5
+                else:
+                    pc = instructions[pc + 4]
+            elif op == compare_name_jump_if_false:
+                if instructions[pc + 2](pop(), variables[instructions[pc + 1]]):
+                    pc += 4
+                else:
+                    pc = instructions[pc + 3]
+            elif op == load_name:
+                push(variables[instructions[pc + 1]])
+                pc += 2
+            elif op == add_name_const:
+                push(variables[instructions[pc + 1]] + instructions[pc + 2])
+                pc += 3
+            elif op == store_index_name:
+                value = pop()
+                if indexed:
+                    indexes.store(variables[instructions[pc + 1]], pop(), value)
+                else:
+                    variables[instructions[pc + 1]][pop()] = value
+                pc += 2
+            elif op == jump:
+                pc = instructions[pc + 1]
+            elif op == name_jump_if_true:
+                if variables[instructions[pc + 1]]:
+                    pc = instructions[pc + 2]
+                else:
+                    pc += 3
+            elif op == store_name_const:
+                variables[instructions[pc + 1]] = instructions[pc + 2]
+                pc += 3
+            elif op == store_name_subtract_const:
+                slot = instructions[pc + 1]
+                variables[slot] = variables[slot] - instructions[pc + 2]
+                pc += 3
+            elif op == store_name_add_const:
+                slot = instructions[pc + 1]
+                variables[slot] = variables[slot] + instructions[pc + 2]
+                pc += 3
+            elif op == store_name:
+                variables[instructions[pc + 1]] = pop()
+                pc += 2
+            elif op == load_const:
+                push(instructions[pc + 1])
+                pc += 2
+            elif op == name_jump_if_false:
+                if variables[instructions[pc + 1]]:
+                    pc += 3
+                else:
+                    pc = instructions[pc + 2]
+            elif op == compare_name_jump_if_true:
+                if instructions[pc + 2](pop(), variables[instructions[pc + 1]]):
+                    pc = instructions[pc + 3]
+                else:
+                    pc += 4
+            elif op == compare_name_const_jump_if_true:
+                if instructions[pc + 3](variables[instructions[pc + 1]], instructions[pc + 2]):
+                    pc = instructions[pc + 4]
+                else:
+                    pc += 5
+            elif op == compare_jump_if_false:
+                right = pop()
+                if instructions[pc + 1](pop(), right):
+                    pc += 3
+                else:
+                    pc = instructions[pc + 2]
+            elif op == compare_jump_if_true:
+                right = pop()
+                if instructions[pc + 1](pop(), right):
+                    pc = instructions[pc + 2]
+                else:
+                    pc += 3
+            elif op == load_invariant:
+                value = variables[instructions[pc + 1]]
+                if value is undefined:
+                    pc += 3
+                else:
+                    push(value)
+                    pc = instructions[pc + 2]
+            elif op == subtract_name_const:
+                push(variables[instructions[pc + 1]] - instructions[pc + 2])
+                pc += 3
+            elif op == binary_add:
+                right = pop()
+                stack[-1] = stack[-1] + right
+                pc += 1
+            elif op == binary_subtract:
+                right = pop()
+                stack[-1] = stack[-1] - right
+                pc += 1
+            elif op == index_op:
+                index = pop()
+                sequence = stack[-1]
+                if type(index) is not int or index < 0 or index >= len(sequence):
+                    raise IndexError
+                stack[-1] = sequence[index]
+                pc += 1
+            elif op == store_index:
+                value = pop()
+                index = pop()
+                if indexed:
+                    indexes.store(pop(), index, value)
+                else:
+                    pop()[index] = value
+                pc += 1
+            elif op == pop_jump_if_false:
+                if pop():
+                    pc += 2
+                else:
+                    pc = instructions[pc + 1]
+            elif op == pop_jump_if_true:
+                if pop():
+                    pc = instructions[pc + 1]
+                else:
+                    pc += 2
+            elif op == compare_op:
+                right = pop()
+                stack[-1] = instructions[pc + 1](stack[-1], right)
+                pc += 2
+            elif op == binary_multiply:
+                right = pop()
+                stack[-1] = stack[-1] * right
+                pc += 1
+            elif op == binary_divide:
+                right = pop()
+                stack[-1] = stack[-1] / right
+                pc += 1
+            elif op == binary_floor_divide:
+                right = pop()
+                stack[-1] = stack[-1] // right
+                pc += 1
+            elif op == binary_modulo:
+                right = pop()
+                stack[-1] = stack[-1] % right
+                pc += 1
+            elif op == binary_power:
+                right = pop()
+                stack[-1] = power(stack[-1], right, budget)
+                pc += 1
+            elif op == jump_if_false_or_pop:
+                if stack[-1]:
+                    pop()
+                    pc += 2
+                else:
+                    pc = instructions[pc + 1]
+            elif op == jump_if_true_or_pop:
+                if stack[-1]:
+                    pc = instructions[pc + 1]
+                else:
+                    pop()
+                    pc += 2
+            elif op == unary_not:
+                stack[-1] = not stack[-1]
+                pc += 1
+            elif op == unary_negative:
+                stack[-1] = -stack[-1]
+                pc += 1
+            elif op == contains:
+                collection = pop()
+                if type(collection) is list and len(collection) >= min_size:
+                    stack[-1] = indexes.contains(stack[-1], collection)
+                else:
+                    stack[-1] = stack[-1] in collection
+                pc += 1
+            elif op == cons:
+                right = pop()
+                stack[-1] = packed.cons(stack[-1], right)
+                pc += 1
+            elif op == tuple_index:
+                sequence = stack[-1]
+                index = instructions[pc + 1]
+                if type(sequence) is not tuple or index < 1 or index > len(sequence):
+                    raise IndexError
+                stack[-1] = sequence[index - 1]
+                pc += 2
+            elif op == build_list:
+                count = instructions[pc + 1]
+                if count:
+                    elements = stack[-count:]
+                    del stack[-count:]
+                    push(packed.pack(elements))
+                else:
+                    push([])
+                pc += 2
+            elif op == build_tuple:
+                count = instructions[pc + 1]
+                elements = tuple(stack[-count:])
+                del stack[-count:]
+                push(elements)
+                pc += 2
+            elif op == load_name_checked:
+                value = variables[instructions[pc + 1]]
+                if value is undefined:
+                    raise KeyError(instructions[pc + 1])
+                push(value)
+                pc += 2
+            elif op == store_invariant:
+                if immutable(stack[-1]):
+                    variables[instructions[pc + 1]] = stack[-1]
+                pc += 2
+            elif op == tick:
+                budget.tick()
+                pc += 1
+            elif op == load_list_const:
+                push(packed.pack(list(instructions[pc + 1])))
+                pc += 2
+            elif op == print_op:
+                line(str(pop()))
+                pc += 1
+            elif op == halt:
+                return
+    except errors:
+        # any operation the tree walker would reject surfaces as one of these
+        raise SbmlSemanticError()
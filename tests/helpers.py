@@ -0,0 +1,37 @@
+# what the tests share, imported once they have put src on the path
+
+# system imports
+import contextlib
+import io
+
+# internal imports
+from sbml import parser
+from program import default_engine
+from utils import SbmlError, print_error
+
+def capture(function):
+    # what function prints, and what it returns. a run failing the way the command line does ends
+    # the process, it returns None then
+    captured = io.StringIO()
+    with contextlib.redirect_stdout(captured):
+        try:
+            result = function()
+        except SystemExit:
+            result = None
+    return captured.getvalue(), result
+
+def output(program, engine = default_engine, env = None):
+    # what a run of program prints, with the message of the error it stops on
+    return capture(lambda: program.run(env, engine=engine))[0]
+
+def run(source, engine = default_engine, env = None):
+    # what parsing and running source prints, also when it is rejected while parsing, and the
+    # bindings the run ends with, None when it fails
+    def parse_and_run():
+        try:
+            program = parser.parse(source)
+        except SbmlError as error:
+            print_error(error)
+            return None
+        return program.run(env, engine=engine)
+    return capture(parse_and_run)
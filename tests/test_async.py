@@ -0,0 +1,117 @@
+import asyncio
+import itertools
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from embed import run, run_async, compile, SbmlSemanticError, ResourceLimit
+from limits import Limits
+
+#=== SCRIPTS RUN AS THEY DO ON THE TREE WALKER ===#
+sources = [
+    '{ i = 0; s = 0; while (i < 100) { s = s + i; i = i + 1; } print(s); }',
+    '{ n = 4; j = 0; s = 0; while (j < 3) { i = 0; while (i < n * n) { s = s + j * 2 + n * 3; i = i + 1; } j = j + 1; } print(s); }',
+    '{ l = []; i = 0; while (i < 10) { if (i mod 2 == 0) { l = i :: l; } else { while (#1 (i, 0) > 100) { } print(i); } i = i + 1; } print(l); }',
+    '{ x = 1; { y = x + 1; { print(y); } } if (x > 0) { } else { z = 1; } }',
+    '{ }'
+]
+for source in sources:
+    for every in [1, 3, 1000]:
+        result = asyncio.run(run_async(source, every=every))
+        expected = run(source, engine='tree')
+        assert (result.output, result.bindings) == (expected.output, expected.bindings), source
+
+assert asyncio.run(run_async('{ x = x * 2; print(x); }', {'x': 21})).bindings == {'x': 42}
+
+#=== ERRORS AND LIMITS RAISE AS THEY DO FROM run ===#
+try:
+    asyncio.run(run_async('{ i = 0; while (i < 5) { print(i); i = i + 1; } print(1 / 0); }'))
+    assert False
+except SbmlSemanticError as error:
+    assert error.output == '0\n1\n2\n3\n4\n'
+
+# Python errors of the operations, in or out of loops, are semantic errors too
+for source in [
+    '{ x = [1, 2]; x[5] = 1; }',
+    '{ x = 1; s = "abc"; if (x > 0) { s[0] = "z"; } }',
+    '{ x = 2.0; y = x ** 5000; }',
+    '{ x = 10; y = x ** 400 * 1.5; }',
+    '{ i = 0; l = [1]; while (i < 3) { l[i] = i; i = i + 1; } }'
+]:
+    try:
+        asyncio.run(run_async(source, every=1))
+        assert False
+    except SbmlSemanticError:
+        pass
+
+for limits in [Limits(iterations=500), Limits(seconds=0.05)]:
+    try:
+        asyncio.run(run_async('{ t = True; while (t) { } }', limits=limits))
+        assert False
+    except ResourceLimit:
+        pass
+
+#=== SCRIPTS SHARE THE EVENT LOOP ===#
+async def counting(source, every, log, name):
+    class Sink():
+        def line(self, text):
+            log.append(name)
+        def flush(self):
+            pass
+    return await compile(source).execute_async(output=Sink(), every=every)
+
+log = []
+counter = '{ i = 0; while (i < 50) { print(i); i = i + 1; } }'
+async def both():
+    return await asyncio.gather(counting(counter, 10, log, 'a'), counting(counter, 10, log, 'b'))
+asyncio.run(both())
+assert sorted(log) == ['a'] * 50 + ['b'] * 50
+# each prints a few lines, then lets the other one run
+runs = [len(list(lines)) for _, lines in itertools.groupby(log)]
+assert len(runs) >= 20 and max(runs) <= 4
+
+ticks = []
+async def ticker():
+    while True:
+        ticks.append(1)
+        await asyncio.sleep(0)
+
+async def alongside(coroutine):
+    task = asyncio.ensure_future(ticker())
+    try:
+        return await coroutine
+    finally:
+        task.cancel()
+
+# loops inside ifs and blocks hand the loop back too
+nested = '{ i = 0; if (i == 0) { { while (i < 20000) { i = i + 1; } } } print(i); }'
+assert asyncio.run(alongside(run_async(nested, every=100))).output == '20000\n'
+assert len(ticks) >= 100
+
+#=== A SCRIPT STOPS WHEN ITS TASK IS CANCELLED OR RUNS OUT OF TIME ===#
+forever = '{ t = True; i = 0; while (t) { i = i + 1; } }'
+
+async def cancelled():
+    task = asyncio.ensure_future(run_async(forever, every=50))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    try:
+        await task
+        return False
+    except asyncio.CancelledError:
+        return True
+assert asyncio.run(cancelled())
+
+try:
+    asyncio.run(asyncio.wait_for(run_async(forever), 0.02))
+    assert False
+except asyncio.TimeoutError:
+    pass
+
+# others keep running while some are stopped
+async def mixed():
+    tasks = [asyncio.wait_for(run_async(forever), 0.02) for _ in range(5)] + [run_async(counter) for _ in range(5)]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+results = asyncio.run(mixed())
+assert all(type(result) is asyncio.TimeoutError for result in results[:5])
+assert all(result.output == ''.join('{}\n'.format(i) for i in range(50)) for result in results[5:])
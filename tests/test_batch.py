@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import batch
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+sources = {
+    'ok.txt': '{ x = [1, 2]; print(x); print(#2 (x, "a")); }',
+    'semantic.txt': '{ print(1); print(1 / 0); }',
+    'syntax.txt': '{ print(1) }'
+}
+
+with tempfile.TemporaryDirectory() as directory:
+    for name, source in sources.items():
+        with open(os.path.join(directory, name), 'w') as fd:
+            fd.write(source)
+
+    #=== A DIRECTORY RUNS EVERY FILE, IN ORDER ===#
+    results = list(batch.run_all(batch.programs(directory), workers=2, use_cache=False))
+    assert [os.path.basename(result['path']) for result in results] == sorted(sources)
+    assert [result['status'] for result in results] == ['OK', 'SEMANTIC ERROR', 'SYNTAX ERROR']
+    assert [result['stdout'] for result in results] == ['[1, 2]\na\n', '1\nSEMANTIC ERROR\n', 'SYNTAX ERROR\n']
+    assert all(result['time'] >= 0 for result in results)
+
+    #=== A MANIFEST LISTS PATHS RELATIVE TO ITSELF ===#
+    manifest = os.path.join(directory, 'manifest')
+    with open(manifest, 'w') as fd:
+        fd.write('# only the broken ones\nsyntax.txt\n\nsemantic.txt\n')
+    report = os.path.join(directory, 'report.jsonl')
+
+    subprocess.run([sys.executable, 'batch.py', '--no-cache', '--workers=2', '--engine=vm', '--report=' + report, manifest], cwd=src, check=True)
+    with open(report) as fd:
+        results = [json.loads(line) for line in fd]
+    assert [(os.path.basename(result['path']), result['status']) for result in results] == [('syntax.txt', 'SYNTAX ERROR'), ('semantic.txt', 'SEMANTIC ERROR')]
+
+    #=== A COMPILED FILE THAT CAN'T RUN FAILS ON ITS OWN ===#
+    mixed = os.path.join(directory, 'mixed')
+    os.mkdir(mixed)
+    for name, content in [('a.txt', '{ print(1); }'), ('b.sbmlc', 'garbage'), ('c.txt', '{ print(3); }')]:
+        with open(os.path.join(mixed, name), 'w') as fd:
+            fd.write(content)
+    completed = subprocess.run([sys.executable, 'batch.py', '--no-cache', '--workers=2', '--report=' + report, mixed], cwd=src)
+    assert completed.returncode == 0
+    with open(report) as fd:
+        results = [json.loads(line) for line in fd]
+    assert [(os.path.basename(result['path']), result['status'], result['stdout']) for result in results] == [('a.txt', 'OK', '1\n'), ('b.sbmlc', 'ERROR', ''), ('c.txt', 'OK', '3\n')]
+    assert results[1]['error'].startswith('CompiledFileError: ') and results[1]['error'].endswith('recompile it')
+
+    # the command line still prints the message and ends with status 1
+    completed = subprocess.run([sys.executable, 'sbml.py', os.path.join(mixed, 'b.sbmlc')], cwd=src, stdout=subprocess.PIPE)
+    assert completed.returncode == 1 and completed.stdout.decode().endswith('recompile it\n')
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+import cache
+from helpers import output, capture
+
+source = open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'example4.txt')).read()
+expected = output(parser.parse(source))
+
+with tempfile.TemporaryDirectory() as directory:
+    cache.directory = directory
+
+    #=== MISS, STORE, HIT ===#
+    assert cache.lookup(source) is None
+    cache.store(source, parser.parse(source))
+    assert output(cache.lookup(source)) == expected
+
+    #=== WHAT NODES LEARN WHILE RUNNING IS NOT STORED ===#
+    program = parser.parse(source)
+    capture(lambda: program.run(engine='tree'))
+    assert 'site' not in str(cache.encode(program.block))
+    cache.store(source, program)
+    assert output(cache.lookup(source)) == expected
+
+    #=== COMPILED FILES ===#
+    path = os.path.join(directory, 'example4' + cache.EXTENSION)
+    cache.save(path, parser.parse(source), cache.source_hash(source))
+    assert output(cache.load(path)) == expected
+    os.remove(path)
+
+    # --compile replaces the extension of the source
+    with tempfile.TemporaryDirectory() as folder:
+        program = os.path.join(folder, 'prog.txt')
+        with open(program, 'w') as fd:
+            fd.write(source)
+        src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+        subprocess.run([sys.executable, 'sbml.py', '--compile', program], cwd=src, check=True)
+        assert sorted(os.listdir(folder)) == ['prog.sbmlc', 'prog.txt']
+        completed = subprocess.run([sys.executable, 'sbml.py', os.path.join(folder, 'prog.sbmlc')], cwd=src, stdout=subprocess.PIPE, check=True)
+        assert completed.stdout.decode() == expected
+
+    #=== STALE ENTRIES ARE DROPPED ===#
+    interpreter = cache.interpreter
+    cache.interpreter = 'another version'
+    assert cache.lookup(source) is None
+    assert not os.listdir(directory)
+    cache.interpreter = interpreter
+
+    #=== LEAST RECENTLY USED ENTRIES ARE EVICTED ===#
+    sources = ['{{ x = {}; print(x); }}'.format(i) for i in range(3)]
+    for i, text in enumerate(sources):
+        cache.store(text, parser.parse(text))
+        os.utime(cache.entry(cache.source_hash(text)), (i, i))
+
+    # touching the oldest entry makes the second one the least recently used
+    assert cache.lookup(sources[0]) is not None
+    cache.max_size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) - 1
+    cache.evict()
+    assert cache.lookup(sources[1]) is None
+    assert cache.lookup(sources[0]) is not None
+    assert cache.lookup(sources[2]) is not None
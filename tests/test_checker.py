@@ -0,0 +1,131 @@
+import io
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser, Parser
+from utils import SbmlSemanticError
+from ast import Node
+import cache
+from helpers import output, capture
+
+engines = ['tree', 'closure', 'vm', 'python', 'profile']
+
+def same(source, env = None):
+    # every engine prints the same, also from the program loaded back from the cache
+    program = parser.parse(source)
+    expected = output(program, 'tree', env)
+    for engine in engines[1:]:
+        assert output(program, engine, env) == expected, '{} differs from tree on {}'.format(engine, source)
+    assert output(cache.loads(cache.dumps(program, '')), 'python', env) == expected
+    return expected
+
+def rejected(source):
+    try:
+        parser.parse(source)
+        return False
+    except SbmlSemanticError:
+        return True
+
+def checked(source):
+    # whether each indexing node of the program was proven, in source order
+    found = []
+    def walk(node):
+        if type(node).__name__ in ['TupleIndexing', 'ListStringIndexing']:
+            found.append((node.lexpos, node.checked))
+        for name in getattr(type(node), '__slots__', []):
+            value = getattr(node, name, None)
+            for child in value if type(value) in [list, tuple] else [value]:
+                if hasattr(child, 'parse'):
+                    walk(child)
+    walk(parser.parse(source).block)
+    return [proven for _, proven in sorted(found)]
+
+#=== PROGRAMS THAT CERTAINLY GO WRONG ARE REJECTED BEFORE THEY RUN ===#
+for source in [
+    '{ print(1); print(1 + "a"); }',
+    '{ x = 1; y = "a"; print(x); print(x - y); }',
+    '{ print(-"a"); }',
+    '{ print([1] * [2]); }',
+    '{ print((1, 2) + [3]); }',
+    '{ print(1 :: 2); }',
+    '{ print(1 in "abc"); }',
+    '{ print(1 in 5); }',
+    '{ print(#1 5); }',
+    '{ print(#3 (1, 2)); }',
+    '{ t = (1, "a"); print(#2 t - 1); }',
+    '{ print("ab"[1.5]); }',
+    '{ t = True; print([1, 2][t]); }',
+    '{ print(5[0]); }',
+    '{ print("a" < 1); }',
+    '{ s = "ab"; s[0] = "c"; }',
+    '{ if (c) { x = 1; } else { x = 2; } print(x + "a"); }',
+    '{ if (c) { print(1); } print(#1 ((1, 2), 3) + 1); }',
+    '{ t = True; while (t + "a") { } }'
+]:
+    # nothing runs, so nothing is printed
+    assert capture(lambda: rejected(source)) == ('', True), source
+
+# a parser told not to check leaves it to its caller, with either lexer, from a string or a file
+for lexer in ['scanner', 'ply']:
+    for parse in [lambda parser: parser.parse('{ print(1 + "a"); }'), lambda parser: parser.parse_file(io.StringIO('{ print(1 + "a"); }'))]:
+        assert output(parse(Parser(lexer, check=False))) == 'SEMANTIC ERROR\n'
+        try:
+            parse(Parser(lexer))
+            assert False
+        except SbmlSemanticError:
+            pass
+
+#=== OPERATIONS THAT MAY NOT RUN, OR MAY WORK, STILL FAIL AT RUNTIME ONLY ===#
+assert same('{ x = 0; print(1); if (x > 0) { print(1 + "a"); } print(2); }') == '1\n2\n'
+assert same('{ x = 1; print(1); if (x > 0) { print(1 + "a"); } print(2); }') == '1\nSEMANTIC ERROR\n'
+assert same('{ i = 0; while (i < 2) { i = i + 1; } print(i); print(i + "a"); }') == '2\nSEMANTIC ERROR\n'
+assert same('{ t = False; print(t andalso 1 + "a" > 0); t = True; print(t orelse 1 - "a" > 0); }') == 'False\nTrue\n'
+assert same('{ print(x + 1); }', {'x': 1}) == '2\n'
+assert same('{ print(x + 1); }', {'x': 'a'}) == 'SEMANTIC ERROR\n'
+assert same('{ if (c) { x = 1; } print(x + 1); }', {'c': False, 'x': 5}) == '6\n'
+assert same('{ print("a" mod 1); }') == 'SEMANTIC ERROR\n'
+assert same('{ print([1] < ["a"]); print(1); }') == 'SEMANTIC ERROR\n'
+assert same('{ print([1] < [2, "a"]); }') == 'True\n'
+
+#=== INDEXING PROVEN SAFE SKIPS ITS CHECKS ===#
+assert checked('{ t = (1, (2, "a")); print(#2 #2 t); print(#1 t); }') == [True, True, True]
+assert checked('{ l = [1, 2]; s = "ab"; i = 0; print(l[i]); print(s[i + 1]); print((l, 1)[0]); }') == [True, True, True]
+assert checked('{ print(#1 t); print(l[0]); print([1][i]); }') == [False, False, False]
+assert checked('{ x = (1, 2); if (c) { x = (3, 4); } print(#2 x); if (c) { x = (5, 6, 7); } print(#2 x); }') == [True, False]
+# types widen around loops, so a proof holds for every iteration
+assert checked('{ l = [1, 2, 3]; i = 0; while (i < 3) { print(l[i]); i = i + 1; } }') == [True]
+assert checked('{ l = [1, 2, 3]; i = 0; while (i < 3) { print(l[i]); i = i + 0.5; } }') == [False]
+assert checked('{ x = (1, 2); j = 0; while (j < 2) { i = 0; while (i < 2) { print(#2 x); x = 1; i = i + 1; } j = j + 1; } }') == [False]
+
+assert same('{ l = [1, 2, 3]; i = 0; while (i < 3) { print(l[i]); i = i + 0.5; } }') == '1\nSEMANTIC ERROR\n'
+assert same('{ t = (1, (2, "a")); l = [t, t]; i = 0; s = ""; while (i < 2) { s = s + (#2 #2 t)[0]; print((#1 (l[i])) + #1 #2 t); i = i + 1; } print(s); }') == '3\n3\naa\n'
+assert same('{ l = [1, 2]; i = 0; while (i < 3) { print(l[i]); i = i + 1; } }') == '1\n2\nSEMANTIC ERROR\n'
+assert same('{ t = (1, 2); x = (#2 t, "ab"); print((#2 x)[#1 t]); print(#1 x); }') == 'b\n2\n'
+
+#=== THE TREE WALKER EVALUATES THE OPERANDS OF INDEXING ONCE ===#
+class Counted(Node):
+    # an operand counting its evaluations
+    __slots__ = ['expr', 'count']
+
+    def __init__(self, expr):
+        self.expr = expr
+        self.count = 0
+
+    def parse(self, frame):
+        self.count += 1
+        return self.expr.parse(frame)
+
+for source, env, proven in [
+    ('{ l = [1, 2, 3]; i = 1; print(l[i]); print((1, 2)[i]); }', None, True),
+    ('{ print(l[i]); print(t[i]); }', {'l': [1, 2, 3], 'i': 1, 't': (1, 2)}, False)
+]:
+    program = parser.parse(source)
+    counted = []
+    for statement in program.block.statements[-2:]:
+        indexing = statement.expr
+        assert indexing.checked == proven
+        indexing.expr, indexing.index = Counted(indexing.expr), Counted(indexing.index)
+        counted += [indexing.expr, indexing.index]
+    assert output(program, 'tree', env) == '2\n2\n'
+    assert [operand.count for operand in counted] == [1, 1, 1, 1]
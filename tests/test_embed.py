@@ -0,0 +1,114 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from embed import run, run_async, compile, Result, SbmlError, SbmlSyntaxError, SbmlSemanticError, ResourceLimit
+from program import engines
+from limits import Limits
+import embed
+from helpers import capture
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+def quiet(function):
+    # what function raised, also checking nothing reached stdout
+    def raising():
+        try:
+            function()
+        except Exception as e:
+            return e
+    printed, raised = capture(raising)
+    assert printed == ''
+    return raised
+
+for engine in engines:
+    #=== OUTPUT AND BINDINGS COME BACK, NOTHING IS PRINTED ===#
+    result = None
+    def ok():
+        global result
+        result = run('{ x = n * 2; l = [x, "a"]; print(x); print(l); }', {'n': 21}, engine)
+    assert quiet(ok) is None
+    assert type(result) is Result and result.output == "42\n[42, 'a']\n" and result.bindings == {'n': 21, 'x': 42, 'l': [42, 'a']}, engine
+
+    #=== ERRORS RAISE, WITH WHAT WAS PRINTED BEFORE THEM ===#
+    error = quiet(lambda: run('{ print(1); print(2); print(1 / 0); print(3); }', engine=engine))
+    assert type(error) is SbmlSemanticError and error.output == '1\n2\n', engine
+    assert isinstance(error, SbmlError) and str(error) == 'SEMANTIC ERROR'
+
+    error = quiet(lambda: run('{ print(y); }', engine=engine))
+    assert type(error) is SbmlSemanticError and error.output == ''
+    assert run('{ print(y); }', {'y': (1, 2)}, engine).output == '(1, 2)\n'
+
+    error = quiet(lambda: run('{ t = True; while (t) { } }', engine=engine, limits=Limits(iterations=10)))
+    assert type(error) is ResourceLimit
+
+#=== PYTHON ERRORS OF THE PROGRAM RAISE AS SEMANTIC ERRORS, ON EVERY ENGINE ===#
+failing = [
+    '{ x=[1,2]; x[5]=1; }',
+    '{ x=1; s="abc"; if (x>0) { s[0]="z"; } }',
+    '{ x=2.0; y=x**5000; }',
+    '{ x=10; y=x**400*1.5; }'
+]
+for source in failing:
+    for engine in engines:
+        error = quiet(lambda: run('{ print(1); ' + source + ' }', engine=engine))
+        assert type(error) is SbmlSemanticError and error.output == '1\n', (source, engine)
+    error = quiet(lambda: asyncio.run(run_async('{ print(1); ' + source + ' }')))
+    assert type(error) is SbmlSemanticError and error.output == '1\n', source
+
+error = quiet(lambda: run('{ print(1) }'))
+assert type(error) is SbmlSyntaxError and str(error) == 'SYNTAX ERROR' and error.output is None
+assert type(quiet(lambda: run('{ if (1 + 2) { print(1); } }'))) is SbmlSemanticError
+
+#=== THE HOST KEEPS RUNNING AFTER ANY NUMBER OF ERRORS ===#
+for n in range(200):
+    try:
+        run('{ print(1 / 0); }' if n % 2 else '{ print(1) }')
+    except SbmlError:
+        pass
+assert run('{ print("still here"); }').output == 'still here\n'
+
+#=== SOURCES RUN AGAIN ARE NOT PARSED AGAIN ===#
+source = '{ i = 0; while (i < k) { i = i + 1; } }'
+assert compile(source) is compile(source)
+assert [run(source, {'k': k}).bindings['i'] for k in range(5)] == [0, 1, 2, 3, 4]
+assert run(compile(source), {'k': 7}, 'vm').bindings == {'k': 7, 'i': 7}
+for n in range(embed.cache_size + 1):
+    compile('{{ x = {}; }}'.format(n))
+assert len(embed.programs) == embed.cache_size and source not in embed.programs
+
+#=== RUNS ON MANY THREADS KEEP THEIR OUTPUT APART ===#
+results = {}
+def worker(n):
+    results[n] = [run('{ i = 0; while (i < 50) { print(i * m); i = i + 1; } }', {'m': n}).output for _ in range(20)]
+threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+for n in range(8):
+    assert results[n] == [''.join('{}\n'.format(i * n) for i in range(50))] * 20
+
+#=== THE COMMAND LINE PRINTS WHAT THE ERRORS CARRY ===#
+with tempfile.TemporaryDirectory() as directory:
+    # the source, what running it prints, and whether the error is found while parsing
+    cases = [
+        ('{ print(1); print(1 / 0); }', '1\nSEMANTIC ERROR\n', False),
+        ('{ print(1) }', 'SYNTAX ERROR\n', True),
+        ('{ print(1); if ("a") { print(2); } }', 'SEMANTIC ERROR\n', True),
+        ('{ print(x); }', 'SEMANTIC ERROR\n', False)
+    ] + [('{ print(1); ' + source + ' }', '1\nSEMANTIC ERROR\n', False) for source in failing]
+    for n, (program, expected, parsing) in enumerate(cases):
+        path = os.path.join(directory, '{}.txt'.format(n))
+        with open(path, 'w') as fd:
+            fd.write(program)
+        for flags in [[], ['--engine=vm'], ['--engine=tree'], ['--profile=' + os.path.join(directory, 'folded')], ['--compile']]:
+            completed = subprocess.run([sys.executable, 'sbml.py', '--no-cache'] + flags + [path], cwd=src, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            if flags == ['--compile'] and not parsing:
+                assert completed.returncode == 0
+                continue
+            assert completed.returncode == 1 and completed.stdout.decode() == expected, (program, flags)
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+data = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+engines = ['tree', 'closure', 'vm', 'python']
+
+def run(engine, path, flags = ()):
+    result = subprocess.run([sys.executable, 'sbml.py', '--no-cache', '--engine=' + engine] + list(flags) + [path], cwd=src, stdout=subprocess.PIPE)
+    return result.returncode, result.stdout.decode()
+
+def same(path, flags = ()):
+    # the returncode and stdout every engine ends with
+    expected = run('tree', path, flags)
+    for engine in engines[1:]:
+        assert run(engine, path, flags) == expected, '{} differs from tree on {}'.format(engine, path)
+    return expected
+
+def same_source(source, flags = ()):
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as fd:
+        fd.write(source)
+    try:
+        return same(fd.name, flags)
+    finally:
+        os.remove(fd.name)
+
+#=== EXAMPLE PROGRAMS ===#
+examples = {
+    'example1.txt': '0\n1\n1\n1\n1\n1\n',
+    'example2.txt': '[2, 50, 3, 300]\n',
+    'example3.txt': 'test\nCant find it.\n',
+    'example4.txt': '[-3, 0, 1, 2, 3, 4, 6, 7, 8, 9, 10, 12, 27, 83, 100]\n',
+    'example5.txt': 'True\n'
+}
+assert sorted(os.listdir(data)) == sorted(examples)
+for name, expected in sorted(examples.items()):
+    assert same(os.path.join(data, name)) == (0, expected), name
+
+#=== EXPRESSIONS ===#
+assert same_source('{ print(1 + 2 * 3 - 4 / 8); print(17 div 5); print(17 mod 5); print(2 ** 2 ** 3); }') == (0, '6.5\n3\n2\n256\n')
+assert same_source('{ print(-2 ** 2); print(2 ** -1); print((2 ** 3) ** 2); print(1 - (2 - 3)); print((1 - 2) - 3); print(8 / (4 / 2)); }') == (0, '4\n0.5\n64\n2\n-4\n4.0\n')
+assert same_source('{ x = 5; print(-x); print(- -3.5); print(1.5e-3 + .5); }') == (0, '-5\n3.5\n0.5015\n')
+assert same_source('{ s = "ab"; print(s + \'cd\'); print(s[1]); print("b" in s); print("abc" < "abd"); }') == (0, 'abcd\nb\nTrue\nTrue\n')
+assert same_source('{ l = [1, [2, 3], "x"]; print(l); print(l[1][0]); print(0::l); print([] + l); print([2, 3] in l); }') == (0, "[1, [2, 3], 'x']\n2\n[0, 1, [2, 3], 'x']\n[1, [2, 3], 'x']\nTrue\n")
+assert same_source('{ t = (1, "two", [3]); print(t); print(#2 t); print(#3 t); }') == (0, "(1, 'two', [3])\ntwo\n[3]\n")
+assert same_source('{ a = True; b = False; print(a andalso b); print(a orelse b); print(not b); print(1 <> 1.0); }') == (0, 'False\nTrue\nTrue\nFalse\n')
+assert same_source('{ l = [1, 2.5, "a", [3]]; i = 0; while (i < 4) { x = l[i]; print(x + x); print(x == l[i]); i = i + 1; } }') == (0, '2\nTrue\n5.0\nTrue\naa\nTrue\n[3, 3]\nTrue\n')
+assert same_source('{ i = 0; while (i < 4) { print(7 / (i + 1)); print(7.5 div (i + 1)); print((i + 1) < 2.5); i = i + 1; } }') == (0, '7.0\n7.0\nTrue\n3.5\n3.0\nTrue\n2.3333333333333335\n2.0\nFalse\n1.75\n1.0\nFalse\n')
+
+#=== CONTROL FLOW ===#
+assert same_source('{ i = 0; total = 0; while (i < 100) { if (i mod 3 == 0) { total = total + i; } else { total = total - 1; } i = i + 1; } print(total); }') == (0, '1617\n')
+assert same_source('{ i = 0; while (not (i >= 5) andalso i <> 7) { print(i); i = i + 2; } }') == (0, '0\n2\n4\n')
+assert same_source('{ x = 0; f = False; while (x < 3 orelse f) { x = x + 1; } print(x); }') == (0, '3\n')
+assert same_source('{ l = [3, 1, 2]; i = 0; while (i < 3) { l[i] = l[i] * 10; i = i + 1; } print(l); }') == (0, '[30, 10, 20]\n')
+# deeper than python nests blocks, the python engine runs these on the closures
+depth = 25
+assert same_source('{ i = 0; ' + 'while (i < 3) { ' * depth + 'i = i + 1; print(i); ' + '} ' * depth + '}') == (0, '1\n2\n3\n')
+
+#=== ERRORS ===#
+assert same_source('{ print(1); x = [1, 2]; i = 0; while (i < 3) { print(x[i]); i = i + 1; } }') == (1, '1\n1\n2\nSEMANTIC ERROR\n')
+assert same_source('{ x = 0; print("before"); if (x == 0) { print(1 div x); } }') == (1, 'before\nSEMANTIC ERROR\n')
+assert same_source('{ i = 2; while (i > -1) { print(6 / i); i = i - 1; } }') == (1, '3.0\n6.0\nSEMANTIC ERROR\n')
+assert same_source('{ i = 2; while (i > -1) { print(6.0 mod i); i = i - 1; } }') == (1, '0.0\n0.0\nSEMANTIC ERROR\n')
+assert same_source('{ x = 0; y = 0 - 1; print(x ** y); }') == (1, 'SEMANTIC ERROR\n')
+assert same_source('{ i = 0; l = [1, 2, "a"]; while (i < 3) { print(l[i] < 2); i = i + 1; } }') == (1, 'True\nFalse\nSEMANTIC ERROR\n')
+assert same_source('{ x = "a"; y = 1; if (y > 0) { print(x + y); } }') == (1, 'SEMANTIC ERROR\n')
+assert same_source('{ x = 1; print(x :: 2); }') == (1, 'SEMANTIC ERROR\n')
+assert same_source('{ x = [1]; print(#1 x); }') == (1, 'SEMANTIC ERROR\n')
+assert same_source('{ x = [1, 2] print(x); }') == (1, 'SYNTAX ERROR\n')
+assert same_source('{ print(y); }') == (1, 'SEMANTIC ERROR\n')
+# the element of in runs before the collection, so it goes over the limit before l is found unset
+assert same_source('{ c = 0; b = 2; if (c > 0) { l = [1]; } print(b ** 100 in l); }', ['--max-power-bits=64']) == (1, 'RESOURCE LIMIT\n')
+assert same_source('{ b = 2; l = [1, 2]; i = 0; while (i < 3) { print(b ** (i * 40) in l); i = i + 1; } }', ['--max-power-bits=64']) == (1, 'True\nFalse\nRESOURCE LIMIT\n')
@@ -0,0 +1,75 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from ast import Invariant
+import cache
+from helpers import capture, run
+
+engines = ['tree', 'closure', 'vm', 'python', 'profile']
+
+def same(source):
+    # every engine prints the same, also from the program loaded back from the cache
+    program = parser.parse(source)
+    expected = capture(lambda: program.run(engine='tree'))
+    for engine in engines[1:]:
+        assert capture(lambda: program.run(engine=engine)) == expected, '{} differs from tree on {}'.format(engine, source)
+    loaded = cache.loads(cache.dumps(program, ''))
+    assert capture(lambda: loaded.run(engine='vm')) == expected
+    return expected[0]
+
+def invariants(source):
+    # the source of every hoisted expression, by loop
+    found = []
+    def walk(node):
+        if type(node).__name__ == 'WhileStatement':
+            found.append(node.invariants)
+        if isinstance(node, Invariant):
+            found.append(str(node.expr))
+        for name in getattr(type(node), '__slots__', []):
+            value = getattr(node, name, None)
+            for child in value if type(value) in [list, tuple] else [value]:
+                if hasattr(child, 'parse'):
+                    walk(child)
+    walk(parser.parse(source).block)
+    return found
+
+#=== EXPRESSIONS NOTHING IN THE LOOP ASSIGNS ARE HOISTED ===#
+loop = '{ size = 10; t = (1, 2); i = 0; s = 0; while (i < size * 2 - 1) { s = s + (size * 3 + #1 t) * i; i = i + 1; } print(s); print(i); }'
+found = invariants(loop)
+assert len(found) == 3 and len(found[0]) == 2
+assert same(loop) == '5301\n19\n'
+
+# leaves, lists and expressions reading variables the loop assigns stay where they are
+assert invariants('{ i = 0; n = 5; while (i < n) { l = [n, 1]; m = i :: [n]; i = i + 1; } }') == [[]]
+assert len(invariants('{ i = 0; n = 5; while (i < n) { l = [n * 2, 1]; i = i + 1; } }')) == 2
+
+#=== NOTHING RUNS EARLIER THAN IT DID ===#
+assert same('{ i = 0; z = 0; while (i < 3) { print(i); x = 10 / z; i = i + 1; } }') == '0\nSEMANTIC ERROR\n'
+assert same('{ i = 0; z = 0; while (i < 3) { if (i > 5) { print(1 / z); } i = i + 1; } print(i); }') == '3\n'
+assert same('{ n = 0; z = 0; while (n > 0) { print(1 / z); } print(n); }') == '0\n'
+assert same('{ i = 0; if (i > 0) { y = 1; } while (i < 2) { print(i); print(y * 2); i = i + 1; } }') == '0\nSEMANTIC ERROR\n'
+assert same('{ i = 0; while (i < 2) { if (i == 1) { y = 1; } i = i + 1; } }')  == ''
+
+#=== LISTS ARE NEVER SHARED BETWEEN EVALUATIONS ===#
+assert same('{ x = [1]; y = [2]; i = 0; while (i < 2) { m = #1 (x + y, 0); print(m); m[0] = 9; i = i + 1; } }') == '[1, 2]\n[1, 2]\n'
+assert same('{ x = [1]; i = 0; while (i < 2) { m = x + [2]; print(m); m[1] = 5; i = i + 1; } }') == '[1, 2]\n[1, 2]\n'
+
+#=== ELEMENT ASSIGNMENTS KEEP ELEMENT READS IN THE LOOP ===#
+assert same('{ l = [1, 2]; i = 0; while (i < 3) { print(l[0] * 2); l[0] = l[0] + 1; i = i + 1; } }') == '2\n4\n6\n'
+assert same('{ l = [1, 2]; m = l; i = 0; while (i < 3) { print(2 in l); print(l == [1, 2]); m[1] = 3; i = i + 1; } }') == 'True\nTrue\nFalse\nFalse\nFalse\nFalse\n'
+assert same('{ l = [1, 2]; t = (l, 1); i = 0; while (i < 2) { print((#1 t)[0] + 1); l[0] = 5; i = i + 1; } }') == '2\n6\n'
+
+#=== AN INNER LOOP FORGETS ITS INVARIANTS EVERY TIME IT STARTS ===#
+assert same('{ j = 0; while (j < 3) { k = j * 10; i = 0; while (i < 2) { print(k + 1); i = i + 1; } j = j + 1; } }') == '1\n1\n11\n11\n21\n21\n'
+nested = '{ n = 4; j = 0; s = 0; while (j < 3) { i = 0; while (i < n * n) { s = s + j * 2 + n * 3; i = i + 1; } j = j + 1; } print(s); }'
+assert same(nested) == '672\n'
+# n * n and n * 3 belong to the outer loop, j * 2 to the inner one
+found = invariants(nested)
+assert found[:2] == [['$0', '$1'], ['$2']]
+assert [expression.count('(Variable: n)') for expression in found[2:]] == [2, 0, 1]
+
+#=== INVARIANTS ARE NOT VARIABLES OF THE PROGRAM ===#
+for engine in engines:
+    assert run(loop, engine)[1] == {'size': 10, 't': (1, 2), 'i': 19, 's': 5301}
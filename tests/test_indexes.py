@@ -0,0 +1,52 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from indexes import Indexes, min_size, capacity
+from helpers import run
+
+engines = ['tree', 'closure', 'vm', 'python', 'profile']
+
+def same(source):
+    expected = run(source, 'tree')[0]
+    for engine in engines[1:]:
+        assert run(source, engine)[0] == expected, '{} differs from tree on {}'.format(engine, source)
+    return expected
+
+# a list of 0, 3, 6, ... built in the program, large enough to be indexed
+large = 'l = []; i = 0; while (i < 100) { l = (i * 3) :: l; i = i + 1; }'
+
+#=== REPEATED TESTS FIND WHAT A SCAN FINDS ===#
+assert same('{ ' + large + ' n = 0; j = 0; while (j < 300) { if (j in l) { n = n + 1; } j = j + 1; } print(n); print(3.0 in l); t = True; print(t in l); print("3" in l); }') == '100\nTrue\nFalse\nFalse\n'
+
+#=== ASSIGNING AN ELEMENT UPDATES THE INDEX ===#
+assert same('{ ' + large + ' print(6 in l); print(7 in l); l[0] = 7; print(7 in l); l[1] = 7; l[0] = 1; print(7 in l); l[1] = 2; print(7 in l); print(6 in l); m = l; m[2] = "x"; print("x" in l); print(0 in l); }') == \
+    'True\nFalse\nTrue\nTrue\nFalse\nTrue\nTrue\nTrue\n'
+same('{ ' + large + ' print(0 in l); print(0 in l); l[99] = 5; print(0 in l); print(5 in l); l[0] = [1]; print([1] in l); print(5 in l); l[0] = 1; print(1 in l); print([1] in l); }')
+
+#=== ELEMENTS THAT DON'T HASH ARE SCANNED FOR ===#
+same('{ ' + large + ' k = 0; while (k < 3) { print([3] in l); print((3, [1]) in l); k = k + 1; } }')
+same('{ ' + large + ' l[5] = [1, 2]; k = 0; while (k < 3) { print([1, 2] in l); print(6 in l); print(15 in l); k = k + 1; } l[5] = 9; print(9 in l); print(9 in l); }')
+same('{ ' + large + ' t = (1, 2); l[3] = t; k = 0; while (k < 3) { print((1, 2) in l); print((1.0, 2.0) in l); k = k + 1; } }')
+
+#=== STRINGS STILL TEST FOR SUBSTRINGS ===#
+same('{ s = "abcdefghijklmnopqrstuvwxyz0123456789"; k = 0; while (k < 3) { print("cde" in s); print("ce" in s); k = k + 1; } }')
+same('{ s = "abcdefghijklmnopqrstuvwxyz0123456789"; print(1 in s); }')
+same('{ print(1 in 5); }')
+
+#=== INDEXES ARE KEPT FOR A FEW LISTS, FOR THE RUN ONLY ===#
+indexes = Indexes()
+lists = [list(range(n, n + min_size)) for n in range(capacity + 5)]
+for values in lists:
+    for _ in range(3):
+        assert indexes.contains(values[-1], values) and not indexes.contains(-1, values)
+assert len(indexes.lists) == capacity
+assert all(entry[0] is values for entry, values in zip(indexes.lists.values(), lists[5:]))
+
+small = list(range(min_size - 1))
+assert indexes.contains(3, small) and indexes.contains(3, small) and id(small) not in indexes.lists
+assert indexes.contains('b', 'abc') and id('abc') not in indexes.lists
+
+indexes.store(lists[-1], 0, 'x')
+assert indexes.contains('x', lists[-1]) and not indexes.contains(capacity + 4, lists[-1]) and lists[-1][0] == 'x'
@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from limits import Limits
+from utils import ResourceLimit, SbmlSemanticError
+import batch
+from helpers import capture
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+engines = ['closure', 'tree', 'vm', 'python', 'profile']
+
+forever = '{ i = 0; go = True; while (go) { i = i + 1; } }'
+counted = '{ i = 0; while (i < 100) { j = 0; while (j < 10) { j = j + 1; } i = i + 1; } print(i); print(j); }'
+powers = '{ print(2 ** 10); print((0 - 3) ** 40); print(1 ** 100000000000); print(2 ** 100000000000); }'
+
+def run(source, engine, limits = None):
+    # the output, and the message of the limit the run went over if it did
+    def limited():
+        try:
+            parser.parse(source).run(engine=engine, limits=limits)
+        except ResourceLimit as e:
+            return str(e)
+    return capture(limited)
+
+for engine in engines:
+    #=== RUNS WITHOUT LIMITS ARE UNCHANGED ===#
+    assert run(counted, engine) == ('100\n10\n', None)
+    assert run(counted, engine, Limits()) == ('100\n10\n', None)
+
+    #=== EVERY ITERATION OF EVERY LOOP COUNTS ===#
+    assert run(counted, engine, Limits(iterations=1100)) == ('100\n10\n', None)
+    assert run(counted, engine, Limits(iterations=1099)) == ('', 'more than 1099 loop iterations')
+    assert run(forever, engine, Limits(iterations=5000)) == ('', 'more than 5000 loop iterations')
+
+    #=== LOOPS STOP AT THE DEADLINE ===#
+    start = time.perf_counter()
+    assert run(forever, engine, Limits(seconds=0.2)) == ('', 'ran longer than 0.2 seconds')
+    assert time.perf_counter() - start < 5
+
+    #=== POWERS TOO LARGE ARE REFUSED BEFORE THEY ARE COMPUTED ===#
+    output, error = run(powers, engine, Limits(power_bits=64))
+    assert output == '1024\n12157665459056928801\n1\n'
+    assert error == '2 ** 100000000000 has more than 64 bits'
+    # constant powers are not computed ahead of the run either
+    assert run('{ x = 2 ** 1000; print(x); }', engine, Limits(power_bits=64)) == ('', '2 ** 1000 has more than 64 bits')
+    assert run('{ print(2 ** 10); print(1 ** 1000); print(2 ** -1); }', engine, Limits(power_bits=16)) == ('1024\n1\n0.5\n', None)
+
+    #=== AN INDEXED ASSIGNMENT RUNS ITS SEQUENCE AND INDEX BEFORE ITS VALUE ===#
+    for source in ['{ b = 2; l = [1]; l[l[5]] = b ** 100; }', '{ b = 2; l = [1]; if (l[0] > 1) { k = 0; } l[k] = b ** 100; }',
+                   '{ b = 2; l = [[1]]; (l[1])[0] = b ** 100; }']:
+        try:
+            parser.parse(source).execute(engine=engine, limits=Limits(power_bits=64))
+            assert False
+        except SbmlSemanticError:
+            pass
+
+#=== THE COMMAND LINE REPORTS RESOURCE LIMIT ===#
+with tempfile.TemporaryDirectory() as directory:
+    programs = os.path.join(directory, 'programs')
+    os.mkdir(programs)
+    path = os.path.join(programs, 'forever.txt')
+    with open(path, 'w') as fd:
+        fd.write(forever)
+
+    for engine in ['closure', 'python']:
+        completed = subprocess.run([sys.executable, 'sbml.py', '--no-cache', '--engine=' + engine, '--max-iterations=100', path], cwd=src, stdout=subprocess.PIPE)
+        assert completed.returncode == 1
+        assert completed.stdout.decode() == 'RESOURCE LIMIT\n'
+
+    completed = subprocess.run([sys.executable, 'sbml.py', '--no-cache', '--timeout=0.2', path], cwd=src, stdout=subprocess.PIPE)
+    assert completed.stdout.decode() == 'RESOURCE LIMIT\n'
+
+    #=== A BATCH RUN REPORTS IT AS A STATUS ===#
+    report = os.path.join(directory, 'report.jsonl')
+    subprocess.run([sys.executable, 'batch.py', '--no-cache', '--workers=1', '--max-iterations=100', '--report=' + report, programs], cwd=src, check=True)
+    with open(report) as fd:
+        results = [json.loads(line) for line in fd]
+    assert [(result['status'], result['stdout']) for result in results] == [('RESOURCE LIMIT', 'RESOURCE LIMIT\n')]
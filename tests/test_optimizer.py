@@ -0,0 +1,61 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from program import engines
+import optimizer
+from helpers import output
+
+def unoptimized(source):
+    optimize = optimizer.optimize
+    optimizer.optimize = lambda block: block
+    try:
+        return parser.parse(source)
+    finally:
+        optimizer.optimize = optimize
+
+def statements(source):
+    return [str(statement) for statement in parser.parse(source).block.statements]
+
+def same(source):
+    expected = output(unoptimized(source), 'tree')
+    for engine in engines:
+        assert output(parser.parse(source), engine) == expected, '{} differs on {}'.format(engine, source)
+
+#=== CONSTANT SUBTREES FOLD ===#
+assert statements('{ print(1 + 2 * 3); }') == ['print(Number: value=7)']
+assert statements('{ print("a" + "b"); }') == ['print(Constant: value=ab)']
+assert statements('{ print(not (1 < 2 andalso 3 > 4)); }') == ['print(Constant: value=True)']
+assert statements('{ print(#2 (1, -2, "x")); }') == ['print(Number: value=-2)']
+assert statements('{ print((1, (2, 3))); }') == ['print(Constant: value=(1, (2, 3)))']
+assert statements('{ print(x + (1 + 2)); }')[0].endswith('+ Number: value=3)')
+assert statements('{ print([1, 2 + 3, "a"]); }') == ['print(ConstantList: values=[1, 5, \'a\'])']
+assert statements('{ print([1, x]); }')[0].startswith('print([Number')
+
+#=== DEAD BRANCHES ARE DROPPED ===#
+assert statements('{ while (1 > 2) { print(1); } print(2); }') == ['print(Number: value=2)']
+assert type(parser.parse('{ if (1 < 2) { print(1); } else { print(2); } }').block.statements[0]).__name__ == 'Block'
+assert len(parser.parse('{ if (1 > 2) { print(1); } }').block.statements) == 0
+
+#=== FAILING OPERATIONS STAY FOR THE RUNTIME ===#
+assert statements('{ print(1 / 0); }')[0].startswith('print(BinaryOperation')
+assert type(parser.parse('{ if (x) { print(#3 (1, 2)); } }').block.statements[0].block.statements[0].expr).__name__ == 'TupleIndexing'
+same('{ print(1); print(1 / 0); }')
+same('{ t = True; if (t) { print(1 + "a"); } }')
+same('{ print("ab"[2]); }')
+same('{ if (1 > 2) { print(1 / 0); } print(1 mod 0 <> 0); }')
+
+#=== HUGE VALUES ARE NOT BUILT AHEAD OF TIME ===#
+assert statements('{ x = 2 ** 100000; }')[0].endswith('BinaryOperation: Number: value=2 ** Number: value=100000')
+assert statements('{ x = 2 ** 10; }')[0].endswith('BinaryOperation: Number: value=2 ** Number: value=10')
+assert statements('{ x = 1 ** 10; y = 2 ** -1; }') == ['Assign: (Variable: x)=Number: value=1', 'Assign: (Variable: y)=Number: value=0.5']
+assert statements('{ x = "a" * 100000; }')[0].endswith('BinaryOperation: Constant: value=a * Number: value=100000')
+
+#=== SAME OUTPUT AS THE UNOPTIMIZED TREE ===#
+same('{ print(1 + 2 * 3 - 4 / 8); print(2 ** -1); print(-(2 ** 2)); print(7 div 2 mod 3); }')
+same('{ print("ab" * 3); print("b" in "abc"); print(1 in (1, 2)); print((1, "a") + (2, 3)); }')
+same('{ x = 3; print(1 < 2 andalso x > 2); print(1 > 2 orelse x > 2); print(x > 1 andalso 1 > 2); }')
+same('{ l = [1 + 1, "a" + "b", (1, 2)]; l[0] = 2 * 5; print(l); print(0 :: [1 - 1]); }')
+same('{ i = 0; while (i < 3 andalso 1 < 2) { if (not (1 > 2)) { print(i); } i = i + 1; } }')
+same('{ i = 0; while (i < 3) { l = [1, 2.5, "a", (1, 2)]; l[0] = l[0] + i; print(l); print(0 :: [1, 2]); i = i + 1; } }')
@@ -0,0 +1,63 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from packed import PackedList
+import packed
+from helpers import run
+
+engines = ['tree', 'closure', 'vm', 'python', 'profile']
+
+def output(source, engine, packing):
+    packed.enabled = packing
+    printed, bindings = run(source, engine)
+    packed.enabled = False
+    return printed, bindings or {}
+
+def same(source):
+    # packing changes nothing that a program can print
+    expected, _ = output(source, 'tree', False)
+    for engine in engines:
+        assert output(source, engine, True)[0] == expected, '{} differs when packed on {}'.format(engine, source)
+    return expected
+
+#=== LITERALS AND CONS PACK WHEN ALL ELEMENTS ARE INTS, OR ALL FLOATS ===#
+for engine in engines:
+    _, bindings = output('{ x = 3; a = [1, 2, 3]; b = [x, x * 2]; c = [1.5, -0.0]; d = []; i = 0; while (i < 3) { d = i :: d; i = i + 1; } }', engine, True)
+    assert all(type(bindings[name]) is PackedList for name in 'abcd'), engine
+    _, bindings = output('{ t = True; a = [1, 2.5]; b = [t, t]; c = [1, 100000000000000000000]; d = ["a"]; e = []; }', engine, True)
+    assert all(type(bindings[name]) is list for name in 'abcde'), engine
+    _, bindings = output('{ a = [1, 2, 3]; b = 0 :: []; }', engine, False)
+    assert type(bindings['a']) is list and type(bindings['b']) is list
+
+#=== THEY PRINT, INDEX AND COMPARE LIKE LISTS ===#
+assert same('{ a = [1, 2, 3]; f = [1.0, 2.5, -0.0]; print(a); print(f); print(a[2]); print(f[1]); print([a, f]); print((a, 1)); }') == \
+    '[1, 2, 3]\n[1.0, 2.5, -0.0]\n3\n2.5\n[[1, 2, 3], [1.0, 2.5, -0.0]]\n([1, 2, 3], 1)\n'
+same('{ a = [1, 2, 3]; b = [1, 2, 3]; f = [1.0, 2.0, 3.0]; print(a == b); print(a == f); print(a <> [1, 2]); print(a < [1, 3]); print([0] < a); print(a >= f); print(a == 1); }')
+same('{ a = [1, 2]; f = [0.5]; print(a + a); print(a + f); print(f + a); print(a + ["x"]); print(["x"] + a); print(a + []); print([] + a); print(a * 2); print(2 * f); }')
+same('{ a = [1, 2]; print(a + "x"); }')
+same('{ a = [1, 2]; print(a - a); }')
+same('{ a = [1, 2]; print(a[2]); }')
+same('{ a = [1, 2]; print(#1 a); }')
+
+#=== ASSIGNING AN ELEMENT THAT DOESN'T FIT UNPACKS, FOR EVERY ALIAS ===#
+same('{ a = [1, 2, 3]; b = a; a[0] = 5; print(b); a[1] = 2.5; print(b); b[2] = "x"; print(a); print(a == b); }')
+same('{ f = [1.5, 2.5]; g = f; f[0] = 1; print(g); f[1] = True; print(g); }')
+same('{ a = [1, 2]; a[0] = 100000000000000000000; print(a); a[1] = 3; print(a); }')
+
+#=== CONS ===#
+same('{ l = []; i = 0; while (i < 20) { l = i :: l; i = i + 1; } print(l); print(2.5 :: l); print("x" :: [1]); m = [0.5]; print(1 :: m); print(l[0] :: l); }')
+same('{ x = 1 :: 2; }')
+same('{ l = [1]; print(100000000000000000000 :: l); }')
+
+#=== MEMBERSHIP LOOKS FOR THE BYTES OF AN ELEMENT, AT ELEMENT BOUNDARIES ONLY ===#
+same('{ a = [5, -7, 300, 0]; print(300 in a); print(-7 in a); print(0 in a); print(4 in a); print(300.0 in a); t = True; print(t in a); print("a" in a); print(100000000000000000000 in a); }')
+# 256 has the bytes of 1 << 56 and 0 side by side, one byte off an element boundary
+same('{ a = [72057594037927936, 0]; print(256 in a); print(0 in a); print(72057594037927936 in a); }')
+same('{ f = [0.0, 1.5, -2.25]; print(1.5 in f); print(-0.0 in f); print(0.0 in f); print(1 in f); print(2.5 in f); print([1.5] in [f]); print(f in [[0.0, 1.5, -2.25]]); }')
+
+packed.enabled = True
+assert 10 ** 6 in packed.pack(list(range(10 ** 6 + 1)))
+assert 10 ** 6 + 1 not in packed.pack(list(range(10 ** 6 + 1)))
+packed.enabled = False
@@ -0,0 +1,65 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser, Parser
+import profiler
+from helpers import output, capture
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+source = '''{
+    i = 0;
+    while (i < 10) {
+        if (i mod 2 == 0) { print(i); }
+        i = i + 1;
+    }
+}'''
+
+#=== NODES KNOW WHERE THEY START, WHICHEVER WAY THEY ARE PARSED ===#
+def positions(program):
+    statement = program.block.statements[1]
+    body = statement.block.statements
+    return [(node.lineno, node.lexpos) for node in [statement, statement.condition.right, body[0], body[0].condition.left.left, body[1]]]
+
+expected = positions(parser.parse(source))
+assert [lineno for lineno, _ in expected] == [3, 3, 4, 4, 5]
+assert [source[lexpos:lexpos + 5] for _, lexpos in expected] == ['while', '10) {', 'if (i', 'i mod', 'i = i']
+assert positions(Parser('ply').parse(source)) == expected
+assert positions(parser.parse_file(io.StringIO(source))) == expected
+
+#=== THE PROFILE ENGINE RUNS LIKE THE OTHERS AND COUNTS EVERY NODE ===#
+program = parser.parse(source)
+assert output(program, 'profile') == output(program, 'tree') == '0\n2\n4\n6\n8\n'
+
+program = parser.parse(source)
+capture(lambda: program.run(engine='profile'))
+profile = program.compile('profile')
+counts = {profiler.Positions(source).label(profiled.node): profiled.count for profiled in profile.nodes}
+assert counts['WhileStatement@3:5'] == 1
+assert counts['Comparison@3:12'] == 11
+assert counts['IfStatement@4:9'] == 10
+assert counts['PrintStatement@4:29'] == 5
+assert all(profiled.own <= profiled.total for profiled in profile.nodes)
+
+report = profiler.hot_statements(profile, source).splitlines()
+assert report[0].split() == ['count', 'cumulative', 'self', 'line:col', 'statement']
+assert len(report) == 6 and any(line.split()[:1] == ['10'] and line.endswith('if (i mod 2 == 0) { print(i); }') for line in report)
+
+for line in profiler.collapsed(profile, source).splitlines():
+    stack, microseconds = line.rsplit(' ', 1)
+    assert stack.startswith('Block@1:1') and int(microseconds) > 0
+
+#=== --profile REPORTS EVEN WHEN THE PROGRAM FAILS ===#
+with tempfile.TemporaryDirectory() as directory:
+    script = os.path.join(directory, 'script.txt')
+    with open(script, 'w') as fd:
+        fd.write('{ x = 1; print(x); print(x / 0); }')
+
+    result = subprocess.run([sys.executable, 'sbml.py', '--no-cache', '--profile', script], cwd=src, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert result.stdout.decode() == '1\nSEMANTIC ERROR\n'
+    assert 'print(x / 0);' in result.stderr.decode()
+    assert os.path.exists(os.path.join(directory, 'script.folded'))
@@ -0,0 +1,36 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from program import engines
+import transpiler
+from helpers import output, capture
+
+#=== PARSING DOES NOT EXECUTE ===#
+printed, program = capture(lambda: parser.parse('{ x = 1; print(x); x = x + 1; }'))
+assert printed == ''
+
+#=== PROGRAMS RUN REPEATEDLY ===#
+for engine in engines:
+    assert capture(lambda: program.run(engine=engine)) == ('1\n', {'x': 2})
+    assert capture(lambda: program.run(engine=engine)) == ('1\n', {'x': 2})
+
+#=== INITIAL BINDINGS ===#
+counter = parser.parse('{ x = 0; while (x < n) { x = x + step; } print(x); }')
+for engine in engines:
+    assert output(counter, engine, {'n': 10, 'step': 3}) == '12\n'
+    assert output(counter, engine, {'n': 4, 'step': 1}) == '4\n'
+
+#=== ASSIGNMENTS ONLY HAPPEN WHEN REACHED ===#
+branch = parser.parse('{ y = 0; if (y > 1) { x = 1 / 0; } print(y); }')
+for engine in engines:
+    assert capture(lambda: branch.run(engine=engine)) == ('0\n', {'y': 0})
+
+#=== THE PYTHON ENGINE COMPILES A SOURCE ONCE, FOR AS LONG AS IT IS AMONG THE LAST ONES ===#
+source = '{ x = 0; while (x < 3) { x = x + 1; } }'
+assert parser.parse(source).compile('python').code is parser.parse(source).compile('python').code
+for n in range(transpiler.cache_size + 1):
+    parser.parse('{{ x = {}; print(x); }}'.format(n)).compile('python')
+assert len(transpiler.code_cache) == transpiler.cache_size
+assert capture(lambda: parser.parse(source).run(engine='python')) == ('', {'x': 3})
@@ -0,0 +1,77 @@
+import io
+import os
+import subprocess
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from repl import Session, state, COMPLETE, OPEN, ELSE
+from program import engines
+from helpers import capture
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+def session(lines, engine = 'closure'):
+    # the output of typing lines into a new session, and the session
+    typed = Session(engine)
+    def typing():
+        for line in lines:
+            if not typed.feed(line):
+                break
+        typed.end()
+    return capture(typing)[0], typed
+
+#=== ENTRIES END WITH THEIR LAST STATEMENT ===#
+assert state('x = 1;') == COMPLETE
+assert state('x = 1; print(x);') == COMPLETE
+assert state('x = 1') == OPEN
+assert state('x = [1,\n2];') == COMPLETE
+assert state('while (x < 3) {\nx = x + 1;') == OPEN
+assert state('while (x < 3) {\nx = x + 1;\n}') == COMPLETE
+assert state('print("}");') == COMPLETE
+assert state('if (x) { print(1); }') == ELSE
+assert state('if (x) { print(1); }\nelse') == OPEN
+assert state('if (x) { print(1); }\nelse { print(2); }') == COMPLETE
+assert state('if (x) { print(1); } print(2);') == COMPLETE
+assert state('{ if (x) { print(1); } }') == COMPLETE
+assert state('print(1); }') == COMPLETE
+
+for engine in engines:
+    #=== BINDINGS OUTLIVE THE ENTRY THAT MADE THEM ===#
+    output, typed = session(['x = 1;', 'l = [x,', '  x + 1];', 'while (x < 5) {', '  x = x * 2;', '}', 'print(x);', 'l[0] = x; print(l);'], engine)
+    assert output == '8\n[8, 2]\n', engine
+    assert typed.env == {'x': 8, 'l': [8, 2]}
+
+    #=== AN ELSE MAY FOLLOW ON THE NEXT LINE ===#
+    output, _ = session(['x = 0;', 'if (x > 0) {', '  print(1);', '}', 'else { print(2); }', 'if (x > 0) { print(3); }', 'print(4);', 'if (x == 0) { print(5); }', '', 'if (x == 0) { print(6); }'], engine)
+    assert output == '2\n4\n5\n6\n', engine
+
+    #=== AN ERROR STOPS ITS ENTRY, EARLIER STATEMENTS KEEP THEIR EFFECT ===#
+    output, typed = session(['x = 1; y = x / 0; z = 3;', 'print(x);', 'print(z);', 'print(x) print(x);', 'print(x + 1);'], engine)
+    assert output == 'SEMANTIC ERROR\n1\nSEMANTIC ERROR\nSYNTAX ERROR\n2\n', engine
+    assert typed.env == {'x': 1}
+
+    # statements the checker rejects too, the ones before them still run
+    output, typed = session(['x = 1; print(x); y = x + "a"; z = 3;', 'print(x + 1);', 'l = [1]; print(l[0]); print(l[1.5]);'], engine)
+    assert output == '1\nSEMANTIC ERROR\n2\n1\nSEMANTIC ERROR\n', engine
+    assert typed.env == {'x': 1, 'l': [1]}
+
+#=== COMMANDS ===#
+output, typed = session(['b = "x"; a = (1, [2]);', ':env', ':reset', ':env', 'print(a);', ':quit', 'print(1);'])
+assert output == 'a = (1, [2])\nb = x\nSEMANTIC ERROR\n'
+assert typed.env == {}
+
+timings = io.StringIO()
+typed = Session(err=timings)
+capture(lambda: [typed.feed(line) for line in [':time', 'x = 1; while (x < 100) { x = x + 1; }', ':time', 'print(x);']])
+lines = timings.getvalue().splitlines()
+assert len(lines) == 2
+assert lines[0].endswith(' ms  x = 1;') and lines[1].endswith(' ms  while (x < 100) { x = x + 1; }')
+float(lines[0].split()[0])
+
+#=== THE SESSION READS ON FROM STDIN AFTER AN ERROR ===#
+completed = subprocess.run([sys.executable, 'repl.py', '--engine=vm'], cwd=src, input=b'x = 2;\nprint(x / 0);\nprint(x ** 3);\nif (x > 1) { print(x); }', stdout=subprocess.PIPE)
+assert completed.returncode == 0
+assert completed.stdout.decode() == 'SEMANTIC ERROR\n8\n2\n'
+
+completed = subprocess.run([sys.executable, 'repl.py', '--max-iterations=10'], cwd=src, input=b'x = 0; while (x < 100) { x = x + 1; }\nprint(x);\n', stdout=subprocess.PIPE)
+assert completed.stdout.decode() == 'RESOURCE LIMIT\n0\n'
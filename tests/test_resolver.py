@@ -0,0 +1,47 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from program import engines
+from helpers import output
+
+def variables(program):
+    found = []
+    def walk(node):
+        if type(node).__name__ == 'Variable':
+            found.append((node.name, node.slot, getattr(node, 'bound', None)))
+        for value in [getattr(node, name) for name in type(node).__slots__ if hasattr(node, name)]:
+            for child in (value if type(value) in [list, tuple] else [value]):
+                if hasattr(child, 'parse') and child is not node:
+                    walk(child)
+    walk(program.block)
+    return found
+
+#=== EVERY NAME GETS ONE SLOT ===#
+program = parser.parse('{ x = 1; y = x; x = y + x; }')
+assert program.slots == ['x', 'y']
+assert variables(program) == [('x', 0, None), ('y', 1, None), ('x', 0, True), ('x', 0, None), ('y', 1, True), ('x', 0, True)]
+
+#=== READS BEFORE ANY ASSIGNMENT MUST BE BOUND BY THE ENVIRONMENT ===#
+program = parser.parse('{ print(1); print(n); }')
+assert program.unbound == {'n'}
+for engine in engines:
+    assert output(program, engine=engine) == 'SEMANTIC ERROR\n'
+    assert output(program, engine, {'n': 2}) == '1\n2\n'
+
+#=== READS THAT MAY FIND THE SLOT UNDEFINED ARE CHECKED AT RUNTIME ===#
+program = parser.parse('{ i = 0; if (i > 0) { x = 1; } print(i); print(x); }')
+assert ('x', 1, False) in variables(program)
+for engine in engines:
+    assert output(program, engine=engine) == '0\nSEMANTIC ERROR\n'
+
+program = parser.parse('{ i = 0; if (i > 5) { l = []; } while (i < 2) { if (i > 0) { print(l[0]); } l = [i]; i = i + 1; } print(l); }')
+for engine in engines:
+    assert output(program, engine=engine) == '0\n[1]\n'
+
+#=== BOTH BRANCHES ASSIGNING BINDS THE NAME ===#
+program = parser.parse('{ i = 0; if (i > 0) { x = 1; } else { x = 2; } print(x); }')
+assert ('x', 1, True) in variables(program)
+for engine in engines:
+    assert output(program, engine=engine) == '2\n'
@@ -0,0 +1,45 @@
+import io
+import os
+import random
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import Parser
+import lexer
+import scanner
+from helpers import output
+
+data = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def tokens(tokenizer, source):
+    tokenizer.lineno = 1
+    tokenizer.input(source)
+    return [(tok.type, tok.value, type(tok.value), tok.lineno, tok.lexpos) for tok in iter(tokenizer.token, None)]
+
+def ply(source):
+    return tokens(lexer.build().clone(), source)
+
+def scan(source):
+    return tokens(scanner.Scanner(), source)
+
+#=== LITERALS ARE DECODED AS THEY ARE LEXED ===#
+assert [tok[1] for tok in scan('"a\\tb" \'c\' "q\nr" True False 12 1.5e-3 .5')] == ['a\tb', 'c', 'q\nr', True, False, 12, 1.5e-3, .5]
+assert scan('"\\x" "a\\"b\nc"')[0][1] == '\\x'
+assert scan('"\\x" "a\\"b\nc"')[1][1] == 'a"b\nc'
+
+#=== RANDOM SOURCES GIVE THE SAME TOKENS AS THE PLY LEXER ===#
+pieces = ['x', 'abc_1', '12', '007', '1.5e-3', '.5', '3.', '1.e5', '"a b\\"c"', '"\\n"', "'q\nr'", '::', ':', '<=', '<>',
+    '<', '>', '>=', '==', '=', '**', '*', ' ', '\n', '\r', '\t', 'andalso', 'orelse', 'mod', 'div', 'True', 'False',
+    'Truex', 'in', 'print', '@', '#', '(', ')', '[', ']', '{', '}', ';', ',', '-', '+', '/', 'e', '"unterminated', "'",
+    '.', '٣', 'é', '_x']
+random.seed(0)
+for _ in range(1000):
+    source = ''.join(random.choice(pieces) + random.choice(['', ' ', '\n']) for _ in range(random.randint(0, 40)))
+    assert scan(source) == ply(source), source
+
+#=== PROGRAMS PARSE AND RUN THE SAME WITH EITHER LEXER ===#
+for name in sorted(os.listdir(data)):
+    with open(os.path.join(data, name)) as fd:
+        source = fd.read()
+    assert output(Parser('scanner').parse(source)) == output(Parser('ply').parse(source)), name
+    assert output(Parser('scanner').parse_file(io.StringIO(source))) == output(Parser('ply').parse(source)), name
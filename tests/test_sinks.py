@@ -0,0 +1,109 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from sinks import BufferedSink, CaptureSink, FileSink
+from limits import Limits
+from utils import ResourceLimit
+from helpers import capture
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+engines = ['tree', 'closure', 'vm', 'python', 'profile']
+
+printing = parser.parse('{ i = 0; while (i < 3) { print(i); print([i, "x"]); i = i + 1; } print(i > 2); }')
+printed = "0\n[0, 'x']\n1\n[1, 'x']\n2\n[2, 'x']\nTrue\n"
+failing = parser.parse('{ print(1); print(2); print(1 / 0); print(3); }')
+
+class Writes(io.StringIO):
+    # a stream counting the writes made to it
+    def __init__(self):
+        io.StringIO.__init__(self)
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return io.StringIO.write(self, text)
+
+for engine in engines:
+    #=== CAPTURED OUTPUT NEVER REACHES STDOUT ===#
+    lines = []
+    assert capture(lambda: printing.run(engine=engine, output=CaptureSink(lines)))[0] == ''
+    assert lines == ['0', "[0, 'x']", '1', "[1, 'x']", '2', "[2, 'x']", 'True'], engine
+
+    stream = io.StringIO()
+    sink = CaptureSink(stream)
+    assert capture(lambda: printing.run(engine=engine, output=sink))[0] == ''
+    assert stream.getvalue() == printed and sink.getvalue() == printed
+    assert CaptureSink(list(lines)).getvalue() == printed
+
+    #=== THE DEFAULT SINK WRITES TO STDOUT BY THE BLOCK, AND FLUSHES WHEN THE RUN ENDS ===#
+    assert capture(lambda: printing.run(engine=engine))[0] == printed
+
+    stream = Writes()
+    printing.run(engine=engine, output=BufferedSink(stream))
+    assert stream.getvalue() == printed and stream.writes == 1
+
+    stream = Writes()
+    printing.run(engine=engine, output=BufferedSink(stream, 8))
+    assert stream.getvalue() == printed and stream.writes == 4
+
+    stream = Writes()
+    printing.run(engine=engine, output=BufferedSink(stream, 0))
+    assert stream.getvalue() == printed and stream.writes == 7
+
+    #=== ERROR MESSAGES COME AFTER EVERYTHING PRINTED BEFORE THEM ===#
+    assert capture(lambda: failing.run(engine=engine))[0] == '1\n2\nSEMANTIC ERROR\n', engine
+    lines = []
+    assert capture(lambda: failing.run(engine=engine, output=CaptureSink(lines)))[0] == 'SEMANTIC ERROR\n'
+    assert lines == ['1', '2']
+
+    def limited():
+        try:
+            parser.parse('{ print(5); t = True; while (t) { } }').run(engine=engine, limits=Limits(iterations=10))
+        except ResourceLimit:
+            pass
+    assert capture(limited)[0] == '5\n'
+
+#=== ANY OBJECT WITH line AND flush IS A SINK ===#
+class Upper():
+    def __init__(self):
+        self.text = ''
+        self.flushes = 0
+
+    def line(self, text):
+        self.text += text.upper() + '\n'
+
+    def flush(self):
+        self.flushes += 1
+
+sink = Upper()
+parser.parse('{ print("a"); print(("b", 1)); }').run(output=sink)
+assert sink.text == "A\n('B', 1)\n" and sink.flushes == 1
+
+#=== FILES ===#
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'out.txt')
+    sink = FileSink(path, 16)
+    printing.run(engine='vm', output=sink)
+    printing.run(engine='python', output=sink)
+    sink.close()
+    with open(path) as fd:
+        assert fd.read() == printed * 2
+
+    program = os.path.join(directory, 'failing.txt')
+    with open(program, 'w') as fd:
+        fd.write('{ print(1); print(2); print(1 / 0); }')
+
+    completed = subprocess.run([sys.executable, 'sbml.py', '--no-cache', '--output=' + path, program], cwd=src, stdout=subprocess.PIPE)
+    assert completed.returncode == 1 and completed.stdout.decode() == 'SEMANTIC ERROR\n'
+    with open(path) as fd:
+        assert fd.read() == '1\n2\n'
+
+    for size in ['0', '3', '65536']:
+        completed = subprocess.run([sys.executable, 'sbml.py', '--no-cache', '--buffer-size=' + size, program], cwd=src, stdout=subprocess.PIPE)
+        assert completed.stdout.decode() == '1\n2\nSEMANTIC ERROR\n'
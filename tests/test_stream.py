@@ -0,0 +1,42 @@
+import io
+import os
+import random
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+import lexer
+from helpers import output
+
+data = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def whole(source):
+    scanner = lexer.build().clone()
+    scanner.lineno = 1
+    scanner.input(source)
+    return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in iter(scanner.token, None)]
+
+def streamed(source, size):
+    return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in lexer.tokenize(io.StringIO(source), size)]
+
+#=== TOKENS SPANNING CHUNK BOUNDARIES ===#
+for source in ['{ x = 1.5e-3; }', 'a :: [] <= 12345 <> "a \\" b" \'c\nd\'', 'x\n\n\ny\n"two\nlines"\nz', '@"x" @ 1', '"unterminated']:
+    for size in [1, 2, 3, 4, 7, 100]:
+        assert streamed(source, size) == whole(source), (source, size)
+
+#=== RANDOM SOURCES, EVERY CHUNK SIZE GIVES THE SAME TOKENS AS LEXING THE WHOLE TEXT ===#
+pieces = ['x', 'abc_1', '12', '1.5e-3', '.5', '3.', '"a b\\"c"', "'q\nr'", '::', ':', '<=', '<>', '<', '>=', '==', '=',
+    '**', '*', ' ', '\n', '\n\n', '\t', 'andalso', 'mod', 'True', '@', '#', '(', ')', '[', ']', '{', '}', ';', ',', '-',
+    '"long string ' + 'z' * 40 + '"', '"unterminated']
+random.seed(0)
+for _ in range(200):
+    source = ''.join(random.choice(pieces) + random.choice(['', ' ', '\n']) for _ in range(random.randint(0, 40)))
+    for size in [1, 3, 16, 1000]:
+        assert streamed(source, size) == whole(source), (source, size)
+
+#=== THE PARSER READS FROM THE STREAM ===#
+for name in sorted(os.listdir(data)):
+    with open(os.path.join(data, name)) as fd:
+        source = fd.read()
+        fd.seek(0)
+        assert output(parser.parse_file(fd)) == output(parser.parse(source)), name
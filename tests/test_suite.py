@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+import suite
+
+benchmarks = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks')
+
+#=== EVERY WORKLOAD RUNS, SCALED DOWN ===#
+for name, workload in sorted(suite.workloads.items()):
+    result = suite.measure(workload(0.01), 'closure', 1)
+    assert result['tokens'] > 0 and all(result[phase + '_seconds'] > 0 and result[phase + '_peak_bytes'] > 0 for phase in ['lex', 'parse', 'execute']), name
+
+#=== ONLY MEASUREMENTS ABOVE THE THRESHOLD ARE REGRESSIONS ===#
+baseline = {'workloads': {'a': {'tokens': 10, 'parse_seconds': 1.0, 'execute_peak_bytes': 100}}}
+results = {'workloads': {'a': {'tokens': 50, 'parse_seconds': 1.2, 'execute_peak_bytes': 200}, 'b': {'parse_seconds': 9.0}}}
+assert len(suite.regressions(results, baseline, 0.25)) == 1
+assert suite.regressions(results, baseline, 0.25)[0].startswith('a execute_peak_bytes: 200')
+assert len(suite.regressions(results, baseline, 0.1)) == 2
+assert suite.regressions(results, baseline, 1.0) == []
+
+#=== A BASELINE IS SAVED, AND RUNS FAIL WHEN THEY REGRESS AGAINST IT ===#
+with tempfile.TemporaryDirectory() as directory:
+    saved = os.path.join(directory, 'baseline.json')
+    command = [sys.executable, 'suite.py', '--scale=0.01', '--runs=1', '--only=cons_lists,string_concat']
+
+    subprocess.run(command + ['--save=' + saved], cwd=benchmarks, stdout=subprocess.DEVNULL, check=True)
+    assert subprocess.run(command + ['--baseline=' + saved, '--threshold=1000'], cwd=benchmarks, stdout=subprocess.DEVNULL).returncode == 0
+
+    with open(saved) as fd:
+        stored = json.load(fd)
+    stored['workloads']['cons_lists']['execute_seconds'] /= 1e6
+    with open(saved, 'w') as fd:
+        json.dump(stored, fd)
+    result = subprocess.run(command + ['--baseline=' + saved, '--threshold=1000'], cwd=benchmarks, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    assert result.returncode == 1 and result.stderr.decode().startswith('REGRESSION cons_lists execute_seconds')
+
+    assert subprocess.run(command + ['--scale=0.02', '--baseline=' + saved], cwd=benchmarks, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 1
@@ -0,0 +1,19 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+import lexer
+import lextab
+import parsetab
+import sbml
+
+#=== SHIPPED TABLES MATCH THE RULES (regenerate with: python3 sbml.py --build-tables) ===#
+fresh = lex.lex(module=lexer, optimize=0)
+assert fresh.lexstateretext['INITIAL'] == [text for text, _ in lextab._lexstatere['INITIAL']]
+
+grammar = yacc.ParserReflect(vars(sbml))
+grammar.get_all()
+assert grammar.signature() == parsetab._lr_signature
@@ -0,0 +1,53 @@
+import concurrent.futures
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sbml import parser
+from program import engines
+
+# each program is different and nests blocks, lists and tuples, so any parse or run state
+# leaking between threads shows up in the bindings
+template = '''{{
+    n = {n};
+    l = [n, [n + 1, [n + 2]], (n, "s{n}")];
+    t = (n, (n * 2, [n]), "t{n}");
+    total = 0;
+    i = 0;
+    while (i < n mod 50) {{
+        {{ total = total + i; {{ i = i + 1; }} }}
+    }}
+    if (n mod 2 == 0) {{ parity = "even"; }} else {{ parity = [n, "odd"]; }}
+    last = l[1][1][0] + #1 #2 t;
+}}'''
+
+def expected(n):
+    return {
+        'n': n,
+        'l': [n, [n + 1, [n + 2]], (n, 's{}'.format(n))],
+        't': (n, (n * 2, [n]), 't{}'.format(n)),
+        'total': sum(range(n % 50)),
+        'i': n % 50,
+        'parity': 'even' if n % 2 == 0 else [n, 'odd'],
+        'last': n + 2 + n * 2
+    }
+
+def parse_and_run(n):
+    engine = list(engines)[n % len(engines)]
+    return parser.parse(template.format(n=n)).run(engine=engine)
+
+#=== INDEPENDENT PROGRAMS PARSE AND RUN CONCURRENTLY ===#
+with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+    for n, bindings in zip(range(400), executor.map(parse_and_run, range(400))):
+        assert bindings == expected(n), 'program {} got {}'.format(n, bindings)
+
+#=== ONE PROGRAM RUNS CONCURRENTLY WITH DIFFERENT BINDINGS ===#
+shared = parser.parse('{ x = 0; i = 0; while (i < n) { x = x + step; i = i + 1; } }')
+
+def run_shared(n):
+    engine = list(engines)[n % len(engines)]
+    return shared.run({'n': n, 'step': n % 7}, engine=engine)['x']
+
+with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+    for n, x in zip(range(400), executor.map(run_shared, range(400))):
+        assert x == n * (n % 7), 'run {} got {}'.format(n, x)